@@ -0,0 +1,59 @@
+"""
+Weighs the bytes gzip saves on order list bodies against the CPU it spends compressing them, for a
+range of list sizes and compression levels. A single order is included to show why responses under
+COMPRESSION_MINIMUM_SIZE are left alone.
+
+No database is needed, the bodies are rendered in memory exactly as the list endpoints do:
+
+    python -m benchmarks.compression_benchmark 1 10 100 1000 10000
+"""
+import datetime
+import gzip
+import statistics
+import sys
+import time
+import uuid
+
+from src.adapters.order_json_adapter import order_status_list_to_json
+from src.entities.models.order_status_entity import OrderStatus, Status
+from src.utils.json_response import json_dumps
+
+LEVELS = (1, 5, 6, 9)
+RUNS = 20
+
+
+def list_body(count: int) -> bytes:
+    now = datetime.datetime.utcnow()
+    orders = [
+        OrderStatus(uuid.uuid4(), now - datetime.timedelta(seconds=n), Status(n % len(Status) + 1), 1)
+        for n in range(count)
+    ]
+    return json_dumps({"result": order_status_list_to_json(orders), "nextCursor": None})
+
+
+def compression_cost(body: bytes, level: int) -> float:
+    timings = []
+    for _ in range(RUNS):
+        start = time.process_time()
+        gzip.compress(body, compresslevel=level)
+        timings.append((time.process_time() - start) * 1_000_000)
+    return statistics.median(timings)
+
+
+def main(sizes) -> None:
+    print(f"{'orders':>7} | {'level':>5} | {'raw bytes':>10} | {'gzip bytes':>10} | {'saved':>6} | "
+          f"{'cpu us':>8} | {'kB saved/cpu ms':>15}")
+    for size in sizes:
+        body = list_body(size)
+        for level in LEVELS:
+            compressed = len(gzip.compress(body, compresslevel=level))
+            cpu = compression_cost(body, level)
+            saved = len(body) - compressed
+            print(
+                f"{size:>7} | {level:>5} | {len(body):>10} | {compressed:>10} | {saved / len(body):>6.0%} | "
+                f"{cpu:>8.1f} | {saved / 1024 / (cpu / 1000):>15.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [1, 10, 100, 1000, 10000])
@@ -0,0 +1,134 @@
+"""
+Compares the per-call CPU cost of the gateway read paths for get_by_id, get_order_status and
+list_ongoing_orders:
+
+- orm entity: ORM query hydrating an Orders_Status instance, then to_entity (the original gateway code)
+- orm session: the statements the ORM-mode gateway runs through a Session
+- core: the precompiled statements the Core-mode gateway runs on a bare Connection
+
+For get_order_status the orm entity column is the full record lookup the endpoint used to run, the other
+two read the (order_id, order_status) projection.
+
+CPU time is measured with time.process_time, so the database round trip itself is excluded. Runs
+against the database configured through the usual POSTGRES_* variables, inside a scratch schema
+that is dropped at the end:
+
+    python -m benchmarks.gateway_read_path_benchmark 5000
+"""
+import random
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from src.entities.models.order_status_entity import Status, order_status_factory, OrderStatusProjection
+from src.external.postgresql_database import engine, Base
+from src.gateways.orm.order_status_orm import Orders_Status as OrderStatusORM, \
+    Orders_Status_Archive as OrderStatusArchiveORM
+from src.gateways.postgres_gateways.order_status_gateway import PostgresDBOrderStatusRepository
+from src.gateways.postgres_gateways.order_status_statements import lookup_statement, ongoing_statement, \
+    LOOKUP_BY_ID_STATEMENT, ONGOING_ORDERS_STATEMENT, STATUS_BY_ID_STATEMENT, status_statement
+
+SCHEMA = "benchmark_gateway_read_path"
+ORDERS = 1000
+ONGOING_ORDERS = 60
+
+
+def orm_entity_get_by_id(session_factory, connection_factory, order_id):
+    with session_factory() as db:
+        order_status_db = db.query(OrderStatusORM).filter(OrderStatusORM.order_id == order_id).first()
+    return PostgresDBOrderStatusRepository.to_entity(order_status_db)
+
+
+def orm_session_get_by_id(session_factory, connection_factory, order_id):
+    with session_factory() as db:
+        row = db.execute(lookup_statement(order_id)).first()
+    return order_status_factory(*row)
+
+
+def core_get_by_id(session_factory, connection_factory, order_id):
+    with connection_factory() as connection:
+        row = connection.execute(LOOKUP_BY_ID_STATEMENT, {"order_id": order_id}).first()
+    return order_status_factory(*row)
+
+
+def orm_session_status(session_factory, connection_factory, order_id):
+    with session_factory() as db:
+        row = db.execute(status_statement(order_id)).first()
+    return OrderStatusProjection(*row)
+
+
+def core_status(session_factory, connection_factory, order_id):
+    with connection_factory() as connection:
+        row = connection.execute(STATUS_BY_ID_STATEMENT, {"order_id": order_id}).first()
+    return OrderStatusProjection(*row)
+
+
+def orm_entity_ongoing(session_factory, connection_factory, order_id):
+    with session_factory() as db:
+        orders = db.query(OrderStatusORM)\
+            .filter(OrderStatusORM.order_status.between(Status.CONFIRMED, Status.READY))\
+            .order_by(OrderStatusORM.order_status.desc(), OrderStatusORM.creation_date)\
+            .all()
+    return [PostgresDBOrderStatusRepository.to_entity(order) for order in orders]
+
+
+def orm_session_ongoing(session_factory, connection_factory, order_id):
+    with session_factory() as db:
+        rows = db.execute(ongoing_statement()).all()
+    return [order_status_factory(*row) for row in rows]
+
+
+def core_ongoing(session_factory, connection_factory, order_id):
+    with connection_factory() as connection:
+        rows = connection.execute(ONGOING_ORDERS_STATEMENT).all()
+    return [order_status_factory(*row) for row in rows]
+
+
+def measure(path, session_factory, connection_factory, order_ids) -> float:
+    for order_id in order_ids[:100]:
+        path(session_factory, connection_factory, order_id)
+
+    start = time.process_time()
+    for order_id in order_ids:
+        path(session_factory, connection_factory, order_id)
+    return (time.process_time() - start) / len(order_ids) * 1_000_000
+
+
+def main(calls: int) -> None:
+    schema_engine = engine.execution_options(schema_translate_map={None: SCHEMA})
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=schema_engine)
+
+    with schema_engine.begin() as connection:
+        connection.execute(text(f"drop schema if exists {SCHEMA} cascade"))
+        connection.execute(text(f"create schema {SCHEMA}"))
+        Base.metadata.create_all(connection, tables=[OrderStatusORM.__table__, OrderStatusArchiveORM.__table__])
+        connection.execute(text(
+            f"insert into {SCHEMA}.orders_status (order_id, creation_date, order_status) "
+            "select gen_random_uuid(), now() - (n || ' seconds')::interval, "
+            "case when n <= :ongoing then :in_progress else :finalized end "
+            "from generate_series(1, :orders) as n"
+        ), {"orders": ORDERS, "ongoing": ONGOING_ORDERS, "in_progress": Status.IN_PROGRESS,
+            "finalized": Status.FINALIZED})
+        order_ids = connection.execute(text(f"select order_id from {SCHEMA}.orders_status")).scalars().all()
+
+    try:
+        sample = [random.choice(order_ids) for _ in range(calls)]
+        print(f"{'path':>22} | {'orm entity us':>13} | {'orm session us':>14} | {'core us':>8}")
+        for name, paths, ids in (
+            ("get_by_id", (orm_entity_get_by_id, orm_session_get_by_id, core_get_by_id), sample),
+            ("get_order_status", (orm_entity_get_by_id, orm_session_status, core_status), sample),
+            ("list_ongoing_orders", (orm_entity_ongoing, orm_session_ongoing, core_ongoing), sample[:calls // 10]),
+        ):
+            orm_entity, orm_session, core = (
+                measure(path, session_factory, schema_engine.connect, ids) for path in paths
+            )
+            print(f"{name:>22} | {orm_entity:>13.1f} | {orm_session:>14.1f} | {core:>8.1f}")
+    finally:
+        with schema_engine.begin() as connection:
+            connection.execute(text(f"drop schema if exists {SCHEMA} cascade"))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
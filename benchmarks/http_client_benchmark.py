@@ -0,0 +1,77 @@
+"""
+Compares a fresh connection per call, as the module-level httpx.get/post did, with the pooled
+keep-alive client from src.external.service_clients. Requests go sequentially to a local HTTP server,
+so the gap is connection setup alone. Across the network to the payments, orders and customers
+services a TLS handshake and DNS lookup come on top of it.
+
+    python -m benchmarks.http_client_benchmark 500
+"""
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from src.external.service_clients import ServiceClient
+
+BODY = b'{"result": {"paymentStatus": "Pago"}}'
+
+
+class PaymentsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def per_call(base_url: str, count: int) -> list:
+    timings = []
+    for n in range(count):
+        start = time.perf_counter()
+        httpx.get(f"{base_url}/payments/id/{n}")
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def pooled(base_url: str, count: int) -> list:
+    client = ServiceClient("payments", base_url, 5, 1, 20, 30)
+    timings = []
+    for n in range(count):
+        start = time.perf_counter()
+        await client.get(f"/payments/id/{n}")
+        timings.append((time.perf_counter() - start) * 1000)
+    await client.close()
+    return timings
+
+
+def report(label: str, timings: list) -> None:
+    timings = sorted(timings)
+    print(
+        f"{label:>10}  median {statistics.median(timings):7.3f} ms"
+        f"  p99 {timings[int(len(timings) * 0.99) - 1]:7.3f} ms  total {sum(timings):9.1f} ms"
+    )
+
+
+def main(count: int) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PaymentsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    report("per call", per_call(base_url, count))
+    report("pooled", asyncio.run(pooled(base_url, count)))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,89 @@
+"""
+Measures GET /order-status/ongoing query latency while the finalized history grows.
+
+Runs against the database configured through the usual POSTGRES_* variables, inside a
+scratch schema that is dropped at the end:
+
+    python -m benchmarks.ongoing_orders_benchmark 0 100000 1000000
+"""
+import statistics
+import sys
+import time
+
+from sqlalchemy import case, select, text
+
+from src.entities.models.order_status_entity import Status
+from src.external.postgresql_database import engine, Base
+from src.gateways.orm.order_status_orm import Orders_Status as OrderStatusORM
+from src.gateways.postgres_gateways.order_status_statements import ongoing_statement, ORDER_STATUS_COLUMNS
+
+SCHEMA = "benchmark_ongoing_orders"
+ACTIVE_ORDERS = 200
+RUNS = 50
+
+
+def legacy_ongoing_statement():
+    return select(*ORDER_STATUS_COLUMNS)\
+        .where(OrderStatusORM.order_status.not_in([Status.FINALIZED, Status.PENDING]))\
+        .order_by(case(
+            (OrderStatusORM.order_status == Status.READY, 1),
+            (OrderStatusORM.order_status == Status.IN_PROGRESS, 2),
+            (OrderStatusORM.order_status == Status.CONFIRMED, 3),
+            else_=4))
+
+
+def insert_orders(connection, count: int, order_status: Status) -> None:
+    connection.execute(text(
+        f"insert into {SCHEMA}.orders_status (order_id, creation_date, order_status) "
+        "select gen_random_uuid(), now() - (n || ' seconds')::interval, :order_status "
+        "from generate_series(1, :count) as n"
+    ), {"count": count, "order_status": order_status})
+
+
+def measure(connection, statement) -> float:
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        connection.execute(statement).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def plan(connection, statement) -> str:
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    connection.execute(text(f"set search_path to {SCHEMA}"))
+    rows = connection.execute(text(f"explain {compiled}")).scalars().all()
+    return next(row.strip() for row in rows if "Scan" in row).split("  (")[0]
+
+
+def main(history_sizes) -> None:
+    schema_engine = engine.execution_options(schema_translate_map={None: SCHEMA})
+    with schema_engine.begin() as connection:
+        connection.execute(text(f"drop schema if exists {SCHEMA} cascade"))
+        connection.execute(text(f"create schema {SCHEMA}"))
+        Base.metadata.create_all(connection, tables=[OrderStatusORM.__table__])
+        for order_status in (Status.CONFIRMED, Status.IN_PROGRESS, Status.READY):
+            insert_orders(connection, ACTIVE_ORDERS // 3, order_status)
+
+    print(f"{'finalized rows':>15} | {'legacy ms':>10} | {'ranked ms':>10} | ranked plan")
+    try:
+        inserted = 0
+        for history_size in history_sizes:
+            with schema_engine.begin() as connection:
+                insert_orders(connection, history_size - inserted, Status.FINALIZED)
+                inserted = history_size
+
+            with schema_engine.connect() as connection:
+                # Vacuum sets the visibility map bits an index-only scan relies on
+                connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+                connection.execute(text(f"vacuum analyze {SCHEMA}.orders_status"))
+                legacy = measure(connection, legacy_ongoing_statement())
+                ranked = measure(connection, ongoing_statement())
+                print(f"{history_size:>15} | {legacy:>10.2f} | {ranked:>10.2f} | {plan(connection, ongoing_statement())}")
+    finally:
+        with schema_engine.begin() as connection:
+            connection.execute(text(f"drop schema if exists {SCHEMA} cascade"))
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [0, 100000, 500000, 1000000])
@@ -0,0 +1,148 @@
+"""
+Fires concurrent writes at the same orders and checks that none of them is lost:
+
+- transitions: every thread walks every order through confirm, in progress, ready and finalized. Each
+  transition must succeed exactly once per order, the other threads get a domain error or a conflict
+- versioned updates: read-modify-write through the gateway update, which only applies on the version it read
+- blind updates: the same read-modify-write without the version check, as a baseline that does lose updates
+
+Every successful write bumps the row version by one, so an order whose final version is lower than one
+plus its successful writes lost an update. Runs against the database configured through the usual
+POSTGRES_* variables and removes the orders it created:
+
+    python -m benchmarks.order_status_concurrency_stress 100 8
+"""
+import collections
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from sqlalchemy import delete, select, update
+
+from src.config.errors import ConcurrencyError
+from src.entities.errors.order_status_error import OrderStatusError
+from src.entities.models.order_status_entity import OrderStatus, PaymentStatus
+from src.external.postgresql_database import SessionLocal
+from src.gateways.orm.order_status_orm import Orders_Status as OrderStatusORM
+from src.gateways.postgres_gateways.order_status_gateway import PostgresDBOrderStatusRepository
+from src.usecases.order_status_usecase import OrderStatusUseCase
+
+UPDATES_PER_ORDER = 5
+
+
+class Outcomes:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = collections.Counter()
+        self.writes: Dict[uuid.UUID, int] = collections.Counter()
+
+    def record(self, order_id: uuid.UUID, write: Callable[[], object]) -> None:
+        try:
+            write()
+            outcome = "success"
+        except ConcurrencyError:
+            outcome = "conflict"
+        except OrderStatusError:
+            outcome = "rejected"
+        with self._lock:
+            self.counts[outcome] += 1
+            if outcome == "success":
+                self.writes[order_id] += 1
+
+
+def transitions_worker(usecase: OrderStatusUseCase, order_ids: List[uuid.UUID], outcomes: Outcomes) -> None:
+    for order_id in order_ids:
+        for transition in (
+            lambda: usecase.confirm_order(order_id),
+            lambda: usecase.change_order_status_in_progress(order_id, PaymentStatus.CONFIRMED),
+            lambda: usecase.change_order_status_ready(order_id),
+            lambda: usecase.change_order_status_finalized(order_id),
+        ):
+            outcomes.record(order_id, transition)
+
+
+def versioned_update_worker(
+    repository: PostgresDBOrderStatusRepository, order_ids: List[uuid.UUID], outcomes: Outcomes
+) -> None:
+    for _ in range(UPDATES_PER_ORDER):
+        for order_id in order_ids:
+            outcomes.record(order_id, lambda: repository.update(order_id, repository.get_by_id(order_id)))
+
+
+def blind_update_worker(
+    repository: PostgresDBOrderStatusRepository, order_ids: List[uuid.UUID], outcomes: Outcomes
+) -> None:
+    def blind_update(order_id: uuid.UUID) -> None:
+        order = repository.get_by_id(order_id)
+        with SessionLocal() as db:
+            db.execute(
+                update(OrderStatusORM)
+                .where(OrderStatusORM.order_id == order_id)
+                .values(order_status=order.order_status, version=order.version + 1)
+            )
+            db.commit()
+
+    for _ in range(UPDATES_PER_ORDER):
+        for order_id in order_ids:
+            outcomes.record(order_id, lambda: blind_update(order_id))
+
+
+def final_versions(order_ids: List[uuid.UUID]) -> Dict[uuid.UUID, int]:
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(OrderStatusORM.order_id, OrderStatusORM.version).where(OrderStatusORM.order_id.in_(order_ids))
+        ).all()
+    return dict(rows)
+
+
+def run_scenario(name: str, worker, target, orders: int, threads: int) -> None:
+    repository = PostgresDBOrderStatusRepository()
+    order_ids = [order.order_id for order in repository.create_many(
+        [OrderStatus.create_new_order_status(uuid.uuid4()) for _ in range(orders)]
+    )]
+    outcomes = Outcomes()
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as executor:
+            # Every thread walks the orders in a different rotation so they collide on different rows
+            futures = []
+            for thread in range(threads):
+                offset = thread * orders // threads
+                futures.append(executor.submit(worker, target, order_ids[offset:] + order_ids[:offset], outcomes))
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - start
+
+        versions = final_versions(order_ids)
+        lost_updates = sum(1 + outcomes.writes[order_id] - versions[order_id] for order_id in order_ids)
+        attempts = sum(outcomes.counts.values())
+        print(
+            f"{name:>18} | {attempts:>8} | {outcomes.counts['success']:>8} | {outcomes.counts['rejected']:>8} | "
+            f"{outcomes.counts['conflict']:>8} | {attempts / elapsed:>9.0f} | {lost_updates:>5}"
+        )
+    finally:
+        with SessionLocal() as db:
+            db.execute(delete(OrderStatusORM).where(OrderStatusORM.order_id.in_(order_ids)))
+            db.commit()
+
+
+def main(orders: int, threads: int) -> None:
+    repository = PostgresDBOrderStatusRepository()
+    print(
+        f"{'scenario':>18} | {'attempts':>8} | {'success':>8} | {'rejected':>8} | "
+        f"{'conflict':>8} | {'writes/s':>9} | {'lost':>5}"
+    )
+    run_scenario("transitions", transitions_worker, OrderStatusUseCase(repository), orders, threads)
+    run_scenario("versioned updates", versioned_update_worker, repository, orders, threads)
+    run_scenario("blind updates", blind_update_worker, repository, orders, threads)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+    )
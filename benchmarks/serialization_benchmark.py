@@ -0,0 +1,103 @@
+"""
+Measures the CPU cost of turning a list of orders into a response body:
+
+- legacy: camelize_dict on every row, response_model validation through FastAPI and the stdlib JSONResponse
+- key maps: precomputed keys, response_model validation and FastJSONResponse (RESPONSE_VALIDATION_ENABLED=true)
+- trusted: precomputed keys straight into FastJSONResponse (RESPONSE_VALIDATION_ENABLED=false)
+- trusted stdlib: the trusted path with the json module fallback used when orjson is not installed
+
+No database is needed, the orders are built in memory:
+
+    python -m benchmarks.serialization_benchmark 10000 20
+"""
+import asyncio
+import datetime
+import statistics
+import sys
+import time
+import uuid
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from starlette.responses import JSONResponse
+
+from src.adapters.order_json_adapter import order_status_list_to_json
+from src.entities.models.order_status_entity import OrderStatus, Status, STATUS_LABELS
+from src.entities.schemas.order_status_dto import OrderStatusDTOListResponse
+from src.utils import json_response
+from src.utils.json_response import FastJSONResponse
+from src.utils.utils import camelize_dict
+
+RESPONSE_FIELD = create_response_field(name="response", type_=OrderStatusDTOListResponse)
+
+
+def generate_orders(count: int):
+    now = datetime.datetime.utcnow()
+    return [
+        OrderStatus(uuid.uuid4(), now - datetime.timedelta(seconds=n), Status(n % len(Status) + 1), 1)
+        for n in range(count)
+    ]
+
+
+def legacy_row(order: OrderStatus) -> dict:
+    return camelize_dict({
+        "order_id": order.order_id,
+        "creation_date": order.creation_date,
+        "order_status": STATUS_LABELS[order.order_status],
+    })
+
+
+async def validated(payload: dict) -> dict:
+    return await serialize_response(field=RESPONSE_FIELD, response_content=payload, is_coroutine=True)
+
+
+def legacy_body(orders) -> bytes:
+    payload = {"result": [legacy_row(order) for order in orders]}
+    return JSONResponse(asyncio.run(validated(payload))).body
+
+
+def key_maps_body(orders) -> bytes:
+    payload = {"result": order_status_list_to_json(orders)}
+    return FastJSONResponse(asyncio.run(validated(payload))).body
+
+
+def trusted_body(orders) -> bytes:
+    return FastJSONResponse({"result": order_status_list_to_json(orders)}).body
+
+
+def trusted_stdlib_body(orders) -> bytes:
+    orjson, json_response.orjson = json_response.orjson, None
+    try:
+        return trusted_body(orders)
+    finally:
+        json_response.orjson = orjson
+
+
+def measure(path, orders, runs: int) -> float:
+    path(orders)
+    timings = []
+    for _ in range(runs):
+        start = time.process_time()
+        path(orders)
+        timings.append((time.process_time() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(count: int, runs: int) -> None:
+    orders = generate_orders(count)
+    print(f"orders: {count}, json encoder: {'orjson' if json_response.orjson else 'stdlib'}")
+    print(f"{'path':>15} | {'cpu ms':>8} | {'bytes':>9}")
+    for name, path in (
+        ("legacy", legacy_body),
+        ("key maps", key_maps_body),
+        ("trusted", trusted_body),
+        ("trusted stdlib", trusted_stdlib_body),
+    ):
+        print(f"{name:>15} | {measure(path, orders, runs):>8.1f} | {len(path(orders)):>9}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    )
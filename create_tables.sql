@@ -1,5 +1,96 @@
+-- order_status holds Status codes from order_status_entity.py:
+-- 1 Pendente, 2 Confirmado, 3 Em preparo, 4 Pronto, 5 Finalizado
 create table if not exists orders_status (
 	order_id uuid primary key,
     creation_date timestamp default now(),
-    order_status varchar(30) not null
+    order_status smallint not null,
+    -- Bumped on every write, updates only apply when the version they read is still current
+    version integer not null default 1
 );
+
+create table if not exists orders_status_archive (
+    order_id uuid primary key,
+    creation_date timestamp not null,
+    order_status smallint not null,
+    archived_at timestamp default now(),
+    version integer not null default 1
+);
+
+alter table orders_status add column if not exists version integer not null default 1;
+alter table orders_status_archive add column if not exists version integer not null default 1;
+
+-- Converts tables created when statuses were stored as their display labels. Rewrites both tables,
+-- so run it in a maintenance window on large databases
+do $$
+begin
+    if exists (
+        select 1 from information_schema.columns
+        where table_name = 'orders_status' and column_name = 'order_status' and data_type <> 'smallint'
+    ) then
+        -- Recreated below, the trigger and the indexes would block the type change
+        drop trigger if exists orders_status_notify on orders_status;
+        drop index if exists ix_orders_status_ongoing;
+        drop index if exists ix_orders_status_ongoing_board;
+        drop index if exists ix_orders_status_order_id_status;
+        alter table orders_status drop column if exists status_rank;
+        alter table orders_status alter column order_status type smallint using case order_status
+            when 'Pendente' then 1 when 'Confirmado' then 2 when 'Em preparo' then 3
+            when 'Pronto' then 4 when 'Finalizado' then 5 end;
+    end if;
+    if exists (
+        select 1 from information_schema.columns
+        where table_name = 'orders_status_archive' and column_name = 'order_status' and data_type <> 'smallint'
+    ) then
+        alter table orders_status_archive alter column order_status type smallint using case order_status
+            when 'Pendente' then 1 when 'Confirmado' then 2 when 'Em preparo' then 3
+            when 'Pronto' then 4 when 'Finalizado' then 5 end;
+    end if;
+end;
+$$;
+
+create index if not exists ix_orders_status_creation_date_order_id on orders_status (creation_date, order_id);
+
+create index if not exists ix_orders_status_order_id_status on orders_status (order_id) include (order_status);
+
+-- Only ongoing orders are indexed, so the kitchen board index stays proportional to active orders
+create index if not exists ix_orders_status_ongoing_board on orders_status (order_status desc, creation_date)
+    include (order_id, version) where order_status between 2 and 4;
+
+create index if not exists ix_orders_status_archive_creation_date_order_id
+    on orders_status_archive (creation_date, order_id);
+
+create or replace function notify_order_status() returns trigger as $$
+begin
+    -- Deletes and archive moves only carry a tombstone, listeners drop the order from their boards and caches
+    if tg_op = 'DELETE' then
+        perform pg_notify('order_status', json_build_object(
+            'order_id', old.order_id,
+            'version', old.version,
+            'deleted', true
+        )::text);
+    elsif tg_op = 'INSERT' or new.order_status is distinct from old.order_status then
+        perform pg_notify('order_status', json_build_object(
+            'order_id', new.order_id,
+            'creation_date', to_char(new.creation_date, 'YYYY-MM-DD"T"HH24:MI:SS.US'),
+            'order_status', new.order_status,
+            'version', new.version
+        )::text);
+    end if;
+    return null;
+end;
+$$ language plpgsql;
+
+drop trigger if exists orders_status_notify on orders_status;
+create trigger orders_status_notify after insert or update of order_status or delete on orders_status
+    for each row execute function notify_order_status();
+
+-- Message dedupe keys, only used with MESSAGE_DEDUPE_BACKEND=database. Keys are leased while their message is
+-- handled, for SQS_VISIBILITY_TIMEOUT_SECONDS at a time, and kept MESSAGE_DEDUPE_TTL_SECONDS once it was processed.
+-- Expired rows are reclaimed by new claims and can be deleted at any time
+create table if not exists processed_messages (
+    dedupe_key varchar(200) primary key,
+    processed boolean not null default false,
+    expires_at timestamp not null
+);
+
+create index if not exists ix_processed_messages_expires_at on processed_messages (expires_at);
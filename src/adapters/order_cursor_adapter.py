@@ -0,0 +1,20 @@
+import base64
+import datetime
+import uuid
+from typing import Tuple
+
+from src.config.errors import PaginationError
+from src.entities.models.order_status_entity import OrderStatus
+
+
+def order_status_to_cursor(order_status: OrderStatus) -> str:
+    raw_cursor = f"{order_status.creation_date.isoformat()}|{order_status.order_id}"
+    return base64.urlsafe_b64encode(raw_cursor.encode()).decode()
+
+
+def cursor_to_keyset(cursor: str) -> Tuple[datetime.datetime, uuid.UUID]:
+    try:
+        creation_date, order_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.datetime.fromisoformat(creation_date), uuid.UUID(order_id)
+    except ValueError:
+        raise PaginationError.invalid_cursor()
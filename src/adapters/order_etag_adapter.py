@@ -0,0 +1,48 @@
+import hashlib
+from typing import Iterable, Optional
+
+from src.entities.models.order_status_entity import OrderStatus, OrderStatusProjection
+
+
+def _digest(parts: Iterable[str]) -> str:
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def order_status_etag(order_status: OrderStatus) -> str:
+    digest = _digest((
+        str(order_status.order_id),
+        order_status.creation_date.isoformat(),
+        str(int(order_status.order_status)),
+        str(order_status.version)
+    ))
+    return f'"{digest}"'
+
+
+def order_status_projection_etag(projection: OrderStatusProjection) -> str:
+    return f'"status-{_digest((str(projection.order_id), str(int(projection.order_status))))}"'
+
+
+def order_status_list_etag(orders: Iterable[OrderStatus]) -> str:
+    return f'"{_digest(f"{order.order_id}|{int(order.order_status)}" for order in orders)}"'
+
+
+def kitchen_board_etag(board_id: str, version: int) -> str:
+    # Versions are only comparable within one board, so the tag carries the board identity too
+    return f'"board-{board_id}-{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes added by proxies still match
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == etag:
+            return True
+    return False
@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+from typing import Iterable, Iterator, AsyncIterable, AsyncIterator, List
+
+from src.adapters.order_json_adapter import order_status_to_json
+from src.entities.models.order_status_entity import OrderStatus
+from src.utils.json_response import encode_value
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+EXPORT_CHUNK_SIZE = 500
+
+
+def order_status_to_ndjson(order_status: OrderStatus) -> str:
+    return json.dumps(order_status_to_json(order_status), default=encode_value) + "\n"
+
+
+class OrderStatusCsvWriter:
+    def __init__(self) -> None:
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._header_written = False
+
+    def write(self, order_status: OrderStatus) -> str:
+        order_json = order_status_to_json(order_status)
+        if not self._header_written:
+            self._writer.writerow(order_json.keys())
+            self._header_written = True
+        self._writer.writerow(value if isinstance(value, str) else encode_value(value) for value in order_json.values())
+
+        line = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return line
+
+
+def _formatter(export_format: str):
+    if export_format == "csv":
+        return OrderStatusCsvWriter().write
+    return order_status_to_ndjson
+
+
+def orders_to_export_chunks(orders: Iterable[OrderStatus], export_format: str) -> Iterator[str]:
+    format_order = _formatter(export_format)
+    chunk: List[str] = []
+    for order in orders:
+        chunk.append(format_order(order))
+        if len(chunk) >= EXPORT_CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+async def async_orders_to_export_chunks(orders: AsyncIterable[OrderStatus], export_format: str) -> AsyncIterator[str]:
+    format_order = _formatter(export_format)
+    chunk: List[str] = []
+    async for order in orders:
+        chunk.append(format_order(order))
+        if len(chunk) >= EXPORT_CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def export_media_type(export_format: str) -> str:
+    return CSV_MEDIA_TYPE if export_format == "csv" else NDJSON_MEDIA_TYPE
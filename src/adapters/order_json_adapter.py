@@ -1,11 +1,23 @@
 from typing import List
 
-from src.entities.models.order_status_entity import OrderStatus
-from src.utils.utils import camelize_dict
+from src.entities.models.order_status_entity import OrderStatus, OrderStatusTransitionResult, OrderStatusProjection, \
+    STATUS_LABELS
+from src.utils.utils import camel_string
+
+# Camelized once at import instead of for every row, version stays out of API payloads
+ORDER_ID_KEY, CREATION_DATE_KEY, ORDER_STATUS_KEY = map(camel_string, ("order_id", "creation_date", "order_status"))
 
 
 def order_status_to_json(order_status: OrderStatus):
-    return camelize_dict(order_status.__dict__)
+    return {
+        ORDER_ID_KEY: order_status.order_id,
+        CREATION_DATE_KEY: order_status.creation_date,
+        ORDER_STATUS_KEY: STATUS_LABELS[order_status.order_status],
+    }
+
+
+def order_status_projection_to_json(projection: OrderStatusProjection):
+    return {ORDER_ID_KEY: projection.order_id, ORDER_STATUS_KEY: STATUS_LABELS[projection.order_status]}
 
 
 def order_with_qrcode_to_json(order: OrderStatus, qr_code: str):
@@ -15,3 +27,16 @@ def order_with_qrcode_to_json(order: OrderStatus, qr_code: str):
 
 def order_status_list_to_json(order_list: List[OrderStatus]):
     return [order_status_to_json(order) for order in order_list]
+
+
+def order_transition_result_to_json(transition_result: OrderStatusTransitionResult):
+    return {
+        "orderId": transition_result.order_id,
+        "success": transition_result.error is None,
+        "orderStatus": order_status_to_json(transition_result.order_status) if transition_result.order_status else None,
+        "error": transition_result.error,
+    }
+
+
+def order_transition_results_to_json(transition_results: List[OrderStatusTransitionResult]):
+    return [order_transition_result_to_json(transition_result) for transition_result in transition_results]
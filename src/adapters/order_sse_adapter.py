@@ -0,0 +1,43 @@
+import asyncio
+import json
+from typing import AsyncIterator, Callable, Awaitable
+
+from src.adapters.order_json_adapter import order_status_to_json
+from src.entities.models.order_status_entity import OrderStatus
+from src.utils.json_response import encode_value
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Stops nginx style proxies from buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=encode_value)}\n\n"
+
+
+def sse_heartbeat() -> str:
+    return ": heartbeat\n\n"
+
+
+def order_status_event(order_status: OrderStatus) -> str:
+    return sse_event("order-status", order_status_to_json(order_status))
+
+
+async def order_status_events(
+    initial_event: str,
+    queue: asyncio.Queue,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    heartbeat_seconds: float
+) -> AsyncIterator[str]:
+    yield initial_event
+    while not await is_disconnected():
+        try:
+            order_status = await asyncio.wait_for(queue.get(), heartbeat_seconds)
+        except asyncio.TimeoutError:
+            yield sse_heartbeat()
+            continue
+        yield order_status_event(order_status)
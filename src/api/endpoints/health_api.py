@@ -1,6 +1,12 @@
 from fastapi import APIRouter
 from starlette import status
 
+from src.external.messaging_listeners import message_consumer
+from src.external.order_status_cache import cache_statistics
+from src.external.order_status_push import order_status_hub
+from src.external.postgresql_database import pool_statistics, replica_statistics
+from src.external.service_clients import service_clients
+
 router = APIRouter(tags=["Health Check"])
 
 
@@ -8,3 +14,39 @@ router = APIRouter(tags=["Health Check"])
             status_code=status.HTTP_200_OK)
 def health_check() -> dict:
     return {"result": "Service is online"}
+
+
+@router.get("/health-check/db-pool",
+            status_code=status.HTTP_200_OK)
+def db_pool_statistics() -> dict:
+    return {"result": pool_statistics()}
+
+
+@router.get("/health-check/db-replica",
+            status_code=status.HTTP_200_OK)
+def db_replica_statistics() -> dict:
+    return {"result": replica_statistics()}
+
+
+@router.get("/health-check/cache",
+            status_code=status.HTTP_200_OK)
+def order_status_cache_statistics() -> dict:
+    return {"result": cache_statistics()}
+
+
+@router.get("/health-check/push",
+            status_code=status.HTTP_200_OK)
+def order_status_push_statistics() -> dict:
+    return {"result": order_status_hub.statistics()}
+
+
+@router.get("/health-check/messaging",
+            status_code=status.HTTP_200_OK)
+def messaging_statistics() -> dict:
+    return {"result": message_consumer.statistics()}
+
+
+@router.get("/health-check/http-clients",
+            status_code=status.HTTP_200_OK)
+def http_client_statistics() -> dict:
+    return {"result": service_clients.statistics()}
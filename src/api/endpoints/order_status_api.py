@@ -1,53 +1,129 @@
+import datetime
 import json
 import uuid
+from typing import Optional
 
-import httpx
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Query, Header, status
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
 
+from src.adapters.order_export_adapter import export_media_type, NDJSON_MEDIA_TYPE, CSV_MEDIA_TYPE
+from src.adapters.order_sse_adapter import sse_event, order_status_events, SSE_MEDIA_TYPE, SSE_HEADERS
 from src.api.errors.api_errors import APIErrorMessage
 from src.config.config import Settings, settings
-from src.config.errors import RepositoryError, ResourceNotFound, DomainError
+from src.config.errors import RepositoryError, ResourceNotFound, DomainError, ConcurrencyError, PaginationError, \
+    ServiceUnavailable
+from src.controllers.order_status_async_controller import AsyncOrderStatusController
 from src.controllers.order_status_controller import OrderStatusController
 from src.entities.errors.order_status_error import OrderStatusError
-from src.entities.schemas.order_status_dto import OrderStatusDTOListResponse, OrderStatusDTOResponse, \
-    CreateOrderStatusDTO
+from src.entities.schemas.order_status_dto import OrderStatusDTOResponse, OngoingOrdersDTOResponse, \
+    CreateOrderStatusDTO, OrderStatusDTOPageResponse, ExportFormat, \
+    CreateOrderStatusBatchDTO, OrderStatusBatchDTOResponse, ChangeOrderStatusBatchDTO, \
+    OrderStatusTransitionBatchDTOResponse, OrderStatusProjectionDTOResponse
 from src.external.messaging_client import MessagingClient
+from src.external.order_status_push import order_status_hub, Subscription
+from src.external.service_clients import service_clients
+from src.utils.json_response import FastJSONResponse
 
 router = APIRouter()
 
+controller = AsyncOrderStatusController if settings.db.POSTGRES_ASYNC_ENABLED else OrderStatusController
+
+
+def cache_headers(etag: str) -> dict:
+    max_age = settings.ORDER_STATUS_CACHE_MAX_AGE_SECONDS
+    return {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={max_age}" if max_age else "no-cache",
+    }
+
+
+def trusted_response(result: dict, response: Response, headers: Optional[dict] = None):
+    # Controllers already build these payloads from entities, so with validation switched off
+    # they go straight to the encoder instead of through the response_model again
+    if not settings.RESPONSE_VALIDATION_ENABLED:
+        return FastJSONResponse(result, headers=headers)
+    if headers:
+        response.headers.update(headers)
+    return result
+
+
+def conditional_response(result: Optional[dict], etag: str, response: Response):
+    # A matching If-None-Match skips serialization and the response_model validation altogether
+    if result is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
+    return trusted_response(result, response, cache_headers(etag))
+
 
 @router.get(
     "/order-status", tags=["Order Status"],
-    response_model=OrderStatusDTOListResponse,
+    response_model=OrderStatusDTOPageResponse,
     status_code=status.HTTP_200_OK,
     responses={400: {"model": APIErrorMessage},
                404: {"model": APIErrorMessage},
                500: {"model": APIErrorMessage}}
 )
-async def get_all_orders_status() -> dict:
+async def get_all_orders_status(
+    response: Response,
+    limit: int = Query(settings.ORDER_STATUS_PAGE_SIZE, ge=1, le=settings.ORDER_STATUS_MAX_PAGE_SIZE),
+    after: Optional[str] = None
+):
     try:
-        result = await OrderStatusController.get_all_orders_status()
+        result = await controller.get_all_orders_status(limit, after)
+    except PaginationError:
+        raise
     except Exception:
         raise RepositoryError.get_operation_failed()
 
-    return result
+    return trusted_response(result, response)
+
+
+@router.get(
+    "/order-status/export", tags=["Order Status"],
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}, CSV_MEDIA_TYPE: {}}},
+               400: {"model": APIErrorMessage},
+               500: {"model": APIErrorMessage}}
+)
+async def export_orders_status(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    order_status: Optional[str] = Query(None, alias="status"),
+    start_date: Optional[datetime.datetime] = None,
+    end_date: Optional[datetime.datetime] = None
+) -> StreamingResponse:
+    try:
+        chunks = await controller.export_orders_status(export_format.value, order_status, start_date, end_date)
+    except OrderStatusError:
+        raise
+    except Exception:
+        raise RepositoryError.get_operation_failed()
+
+    return StreamingResponse(
+        chunks,
+        media_type=export_media_type(export_format.value),
+        headers={"Content-Disposition": f"attachment; filename=orders_status.{export_format.value}"}
+    )
 
 
 @router.get(
     "/order-status/ongoing", tags=["Order Status"],
-    response_model=OrderStatusDTOListResponse,
+    response_model=OngoingOrdersDTOResponse,
     status_code=status.HTTP_200_OK,
     responses={400: {"model": APIErrorMessage},
                404: {"model": APIErrorMessage},
                500: {"model": APIErrorMessage}}
 )
-async def list_ongoing_orders() -> dict:
+async def list_ongoing_orders(
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
     try:
-        result = await OrderStatusController.list_ongoing_orders()
+        result, etag = await controller.list_ongoing_orders(if_none_match)
     except Exception:
         raise RepositoryError.get_operation_failed()
 
-    return result
+    return conditional_response(result, etag, response)
 
 
 @router.get(
@@ -59,37 +135,100 @@ async def list_ongoing_orders() -> dict:
                500: {"model": APIErrorMessage}}
 )
 async def get_order_by_id(
-    order_id: uuid.UUID
-) -> dict:
+    order_id: uuid.UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
     try:
-        result = await OrderStatusController.get_order_by_id(order_id)
+        result, etag = await controller.get_order_by_id(order_id, if_none_match)
     except ResourceNotFound:
         raise ResourceNotFound.get_operation_failed(f"No order with id: {order_id}")
     except Exception:
         raise RepositoryError.get_operation_failed()
 
-    return result
+    return conditional_response(result, etag, response)
 
 
 @router.get(
     "/order-status/id/{order_id}/status", tags=["Order Status"],
-    response_model=OrderStatusDTOResponse,
+    response_model=OrderStatusProjectionDTOResponse,
     status_code=status.HTTP_200_OK,
     responses={400: {"model": APIErrorMessage},
                404: {"model": APIErrorMessage},
                500: {"model": APIErrorMessage}}
 )
 async def get_order_status(
-    order_id: uuid.UUID
-) -> dict:
+    order_id: uuid.UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
     try:
-        result = await OrderStatusController.get_order_by_id(order_id)
+        result, etag = await controller.get_order_status(order_id, if_none_match)
     except ResourceNotFound:
         raise ResourceNotFound.get_operation_failed(f"No order with id: {order_id}")
     except Exception:
         raise RepositoryError.get_operation_failed()
 
-    return result
+    return conditional_response(result, etag, response)
+
+
+async def event_stream(request: Request, subscription: Subscription, initial_event: str):
+    try:
+        async for event in order_status_events(
+            initial_event, subscription.queue, request.is_disconnected, settings.PUSH_HEARTBEAT_SECONDS
+        ):
+            yield event
+    finally:
+        order_status_hub.unsubscribe(subscription)
+
+
+@router.get(
+    "/order-status/ongoing/events", tags=["Order Status"],
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={200: {"content": {SSE_MEDIA_TYPE: {}}},
+               500: {"model": APIErrorMessage}}
+)
+async def stream_ongoing_orders(request: Request) -> StreamingResponse:
+    # Subscribing before reading the board means no change can slip in between the two
+    subscription = order_status_hub.subscribe()
+    try:
+        result, _ = await controller.list_ongoing_orders()
+    except Exception:
+        order_status_hub.unsubscribe(subscription)
+        raise RepositoryError.get_operation_failed()
+
+    return StreamingResponse(
+        event_stream(request, subscription, sse_event("kitchen-board", result)),
+        media_type=SSE_MEDIA_TYPE,
+        headers=SSE_HEADERS
+    )
+
+
+@router.get(
+    "/order-status/id/{order_id}/events", tags=["Order Status"],
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={200: {"content": {SSE_MEDIA_TYPE: {}}},
+               404: {"model": APIErrorMessage},
+               500: {"model": APIErrorMessage}}
+)
+async def stream_order_status(order_id: uuid.UUID, request: Request) -> StreamingResponse:
+    subscription = order_status_hub.subscribe(order_id)
+    try:
+        result, _ = await controller.get_order_by_id(order_id)
+    except ResourceNotFound:
+        order_status_hub.unsubscribe(subscription)
+        raise ResourceNotFound.get_operation_failed(f"No order with id: {order_id}")
+    except Exception:
+        order_status_hub.unsubscribe(subscription)
+        raise RepositoryError.get_operation_failed()
+
+    return StreamingResponse(
+        event_stream(request, subscription, sse_event("order-status", result["result"])),
+        media_type=SSE_MEDIA_TYPE,
+        headers=SSE_HEADERS
+    )
 
 
 @router.post(
@@ -104,7 +243,26 @@ async def create_order_status(
     request: CreateOrderStatusDTO
 ) -> dict:
     try:
-        result = await OrderStatusController.create_order(request)
+        result = await controller.create_order(request)
+    except Exception:
+        raise RepositoryError.save_operation_failed()
+
+    return result
+
+
+@router.post(
+    "/order-status/batch", tags=["Orders"],
+    response_model=OrderStatusBatchDTOResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={400: {"model": APIErrorMessage},
+               404: {"model": APIErrorMessage},
+               500: {"model": APIErrorMessage}}
+)
+async def create_orders_status_batch(
+    request: CreateOrderStatusBatchDTO
+) -> dict:
+    try:
+        result = await controller.create_many_orders(request)
     except Exception:
         raise RepositoryError.save_operation_failed()
 
@@ -117,7 +275,9 @@ async def create_order_status(
     status_code=status.HTTP_201_CREATED,
     responses={400: {"model": APIErrorMessage},
                404: {"model": APIErrorMessage},
-               500: {"model": APIErrorMessage}}
+               409: {"model": APIErrorMessage},
+               500: {"model": APIErrorMessage},
+               503: {"model": APIErrorMessage}}
 )
 async def confirm_order(
     order_id: uuid.UUID
@@ -131,13 +291,15 @@ async def confirm_order(
             "order_id": str(order_id)
         }
 
-        r = httpx.post(f"{settings.PAYMENTS_SERVICE}/payments/mercado-pago", headers=headers, json=params)
+        r = await service_clients.payments.post("/payments/mercado-pago", headers=headers, json=params)
         json_response = json.loads(r.content)
         qr_code = json_response["result"]["qrCode"]
 
         print(r)
 
-        result = await OrderStatusController.confirm_order(order_id, qr_code)
+        result = await controller.confirm_order(order_id, qr_code)
+    except (ConcurrencyError, ServiceUnavailable):
+        raise
     except Exception:
         raise RepositoryError.save_operation_failed()
 
@@ -150,7 +312,9 @@ async def confirm_order(
     status_code=status.HTTP_201_CREATED,
     responses={400: {"model": APIErrorMessage},
                404: {"model": APIErrorMessage},
-               500: {"model": APIErrorMessage}}
+               409: {"model": APIErrorMessage},
+               500: {"model": APIErrorMessage},
+               503: {"model": APIErrorMessage}}
 )
 async def order_in_progress(
     order_id: uuid.UUID
@@ -160,11 +324,13 @@ async def order_in_progress(
             # "Authorization": f"Bearer {access_token}",
         }
 
-        r = httpx.get(f"{settings.PAYMENTS_SERVICE}/payments/id/{order_id}", headers=headers)
+        r = await service_clients.payments.get(f"/payments/id/{order_id}", headers=headers)
         json_response = json.loads(r.content)
         payment_status = json_response["result"]["paymentStatus"]
 
-        result = await OrderStatusController.change_order_status_in_progress(order_id, payment_status)
+        result = await controller.change_order_status_in_progress(order_id, payment_status)
+    except (ConcurrencyError, ServiceUnavailable):
+        raise
     except Exception:
         raise RepositoryError.save_operation_failed()
 
@@ -177,13 +343,16 @@ async def order_in_progress(
     status_code=status.HTTP_201_CREATED,
     responses={400: {"model": APIErrorMessage},
                404: {"model": APIErrorMessage},
+               409: {"model": APIErrorMessage},
                500: {"model": APIErrorMessage}}
 )
 async def order_ready(
     order_id: uuid.UUID
 ) -> dict:
     try:
-        result = await OrderStatusController.change_order_status_ready(order_id)
+        result = await controller.change_order_status_ready(order_id)
+    except ConcurrencyError:
+        raise
     except Exception:
         raise RepositoryError.save_operation_failed()
 
@@ -196,13 +365,37 @@ async def order_ready(
     status_code=status.HTTP_201_CREATED,
     responses={400: {"model": APIErrorMessage},
                404: {"model": APIErrorMessage},
+               409: {"model": APIErrorMessage},
                500: {"model": APIErrorMessage}}
 )
 async def order_finalized(
     order_id: uuid.UUID
 ) -> dict:
     try:
-        result = await OrderStatusController.change_order_status_finalized(order_id)
+        result = await controller.change_order_status_finalized(order_id)
+    except ConcurrencyError:
+        raise
+    except Exception:
+        raise RepositoryError.save_operation_failed()
+
+    return result
+
+
+@router.put(
+    "/order-status/batch/status", tags=["Order Status"],
+    response_model=OrderStatusTransitionBatchDTOResponse,
+    status_code=status.HTTP_200_OK,
+    responses={400: {"model": APIErrorMessage},
+               404: {"model": APIErrorMessage},
+               500: {"model": APIErrorMessage}}
+)
+async def change_orders_status_batch(
+    request: ChangeOrderStatusBatchDTO
+) -> dict:
+    try:
+        result = await controller.change_many_orders_status(request)
+    except OrderStatusError:
+        raise
     except Exception:
         raise RepositoryError.save_operation_failed()
 
@@ -220,7 +413,7 @@ async def remove_order_status(
     order_id: uuid.UUID
 ) -> dict:
     try:
-        await OrderStatusController.remove_order_status(order_id)
+        await controller.remove_order_status(order_id)
     except DomainError:
         raise OrderStatusError.invalid_status()
     except Exception:
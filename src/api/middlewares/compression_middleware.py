@@ -0,0 +1,44 @@
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+from src.adapters.order_sse_adapter import SSE_MEDIA_TYPE
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    # Honours q-values, so "gzip;q=0" opts out and "*" opts in unless gzip is listed explicitly
+    wildcard = False
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name == "gzip":
+            return quality > 0
+        if name == "*":
+            wildcard = quality > 0
+    return wildcard
+
+
+class CompressionResponder(GZipResponder):
+    async def send_with_gzip(self, message: Message) -> None:
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            # gzip holds events back until its buffer fills, so event streams go out uncompressed
+            if content_type.startswith(SSE_MEDIA_TYPE):
+                self.content_encoding_set = True
+
+
+class CompressionMiddleware(GZipMiddleware):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and accepts_gzip(Headers(scope=scope).get("accept-encoding", "")):
+            responder = CompressionResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
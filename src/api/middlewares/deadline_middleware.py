@@ -0,0 +1,24 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.deadline import deadline, clear_deadline
+
+
+class DeadlineMiddleware:
+    def __init__(self, app: ASGIApp, seconds: float) -> None:
+        self.app = app
+        self.seconds = seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_clearing_deadline(message: Message) -> None:
+            # The deadline bounds the work before the response starts, exports and event streams
+            # keep going once their body is flowing
+            if message["type"] == "http.response.start":
+                clear_deadline()
+            await send(message)
+
+        with deadline(self.seconds):
+            await self.app(scope, receive, send_clearing_deadline)
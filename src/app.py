@@ -1,3 +1,4 @@
+import logging
 from typing import Any, Dict
 
 import uvicorn
@@ -6,19 +7,38 @@ from fastapi.openapi.utils import get_openapi
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
-from src.api.endpoints.order_status_api import router as order_status_router
+from src.api.endpoints.order_status_api import router as order_status_router, controller as order_status_controller
 from src.api.endpoints.health_api import router as health_router
 from src.api.errors.api_errors import APIErrorMessage
-from src.config.errors import DomainError, ResourceNotFound, RepositoryError
-from src.external.messaging_listeners import PaymentConfirmationListener, PaymentErrorListener
+from src.api.middlewares.compression_middleware import CompressionMiddleware
+from src.api.middlewares.deadline_middleware import DeadlineMiddleware
+from src.config.config import settings
+from src.config.errors import DomainError, ResourceNotFound, RepositoryError, ConcurrencyError, ServiceUnavailable
+from src.external.archival_job import FinalizedOrdersArchivalJob
+from src.external.messaging_listeners import message_consumer
+from src.external.order_status_push import OrderStatusNotificationListener, order_status_hub
+from src.external.service_clients import service_clients
 from src.utils import utils
+from src.utils.json_response import FastJSONResponse
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+app = FastAPI(default_response_class=FastJSONResponse)
 # app.include_router(order_status_router, dependencies=[Depends(utils.verify_jwt)])
 # app.include_router(health_router, dependencies=[Depends(utils.verify_jwt)])
 app.include_router(order_status_router)
 app.include_router(health_router)
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        compresslevel=settings.COMPRESSION_LEVEL
+    )
+
+if settings.REQUEST_DEADLINE_SECONDS:
+    app.add_middleware(DeadlineMiddleware, seconds=settings.REQUEST_DEADLINE_SECONDS)
+
 
 @app.exception_handler(DomainError)
 async def domain_error_handler(request: Request, exc: DomainError) -> JSONResponse:
@@ -35,6 +55,18 @@ async def resource_not_found_handler(request: Request, exc: ResourceNotFound) ->
     return JSONResponse(status_code=404, content=error_msg.dict())
 
 
+@app.exception_handler(ConcurrencyError)
+async def concurrency_error_handler(request: Request, exc: ConcurrencyError) -> JSONResponse:
+    error_msg = APIErrorMessage(type=exc.__class__.__name__, message=str(exc))
+    return JSONResponse(status_code=409, content=error_msg.dict())
+
+
+@app.exception_handler(ServiceUnavailable)
+async def service_unavailable_handler(request: Request, exc: ServiceUnavailable) -> JSONResponse:
+    error_msg = APIErrorMessage(type=exc.__class__.__name__, message=str(exc))
+    return JSONResponse(status_code=503, content=error_msg.dict())
+
+
 @app.exception_handler(RepositoryError)
 async def repository_error_handler(request: Request, exc: RepositoryError) -> JSONResponse:
     error_msg = APIErrorMessage(
@@ -63,26 +95,43 @@ def custom_openapi() -> Dict[str, Any]:
 
 app.openapi = custom_openapi  # type: ignore
 
-payment_confirmation_listener = PaymentConfirmationListener()
-payment_error_listener = PaymentErrorListener()
+archival_job = FinalizedOrdersArchivalJob()
+order_status_notification_listener = OrderStatusNotificationListener(order_status_hub)
 
 
 @app.on_event("startup")
 async def startup_event():
-    payment_confirmation_listener.setDaemon(True)
-    payment_error_listener.setDaemon(True)
+    service_clients.start()
+    await message_consumer.start()
 
-    payment_confirmation_listener.start()
-    payment_error_listener.start()
+    if settings.ARCHIVAL_ENABLED:
+        archival_job.setDaemon(True)
+        archival_job.start()
+
+    if settings.PUSH_ENABLED:
+        order_status_notification_listener.setDaemon(True)
+        order_status_notification_listener.start()
+
+    # The board rebuilds itself on the first read while it is unloaded, so a database outage must not stop startup
+    try:
+        await order_status_controller.rebuild_kitchen_board()
+    except Exception:
+        logger.exception("Rebuilding the kitchen board failed")
 
 
 @app.on_event("shutdown")
 async def startup_event():
-    payment_confirmation_listener.shutdown_flag.set()
-    payment_error_listener.shutdown_flag.set()
+    await message_consumer.stop()
+    # Only after the consumer, whose in-flight handlers still call the other services
+    await service_clients.close()
+
+    if archival_job.is_alive():
+        archival_job.shutdown_flag.set()
+        archival_job.join()
 
-    payment_confirmation_listener.join()
-    payment_error_listener.join()
+    if order_status_notification_listener.is_alive():
+        order_status_notification_listener.shutdown_flag.set()
+        order_status_notification_listener.join()
 
 
 if __name__ == "__main__":
@@ -15,7 +15,24 @@ class PostgresDBSettings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_DB: str
 
+    POSTGRES_ASYNC_ENABLED: bool = False
+    POSTGRES_GATEWAY_MODE: str = "core"
+
+    POSTGRES_APPLICATION_NAME: str = "m5-production"
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: int = 30
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_STATEMENT_TIMEOUT_MS: int = 0
+
+    POSTGRES_REPLICA_HOST: Optional[str] = None
+    POSTGRES_READ_YOUR_WRITES_SECONDS: float = 5
+
     SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn]
+    SQLALCHEMY_ASYNC_DATABASE_URI: Optional[PostgresDsn]
+    SQLALCHEMY_REPLICA_DATABASE_URI: Optional[PostgresDsn]
+    SQLALCHEMY_ASYNC_REPLICA_DATABASE_URI: Optional[PostgresDsn]
 
     @validator("SQLALCHEMY_DATABASE_URI", pre=True)
     def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
@@ -29,6 +46,42 @@ class PostgresDBSettings(BaseSettings):
             path=f"/{values.get('POSTGRES_DB') or ''}",
         )
 
+    @validator("SQLALCHEMY_ASYNC_DATABASE_URI", pre=True)
+    def assemble_async_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
+        if isinstance(v, str):
+            return v
+        return PostgresDsn.build(
+            scheme="postgresql+asyncpg",
+            user=values.get("POSTGRES_USER"),
+            password=values.get("POSTGRES_PASS"),
+            host=values.get("POSTGRES_HOST"),
+            path=f"/{values.get('POSTGRES_DB') or ''}",
+        )
+
+    @validator("SQLALCHEMY_REPLICA_DATABASE_URI", pre=True)
+    def assemble_replica_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
+        if isinstance(v, str) or not values.get("POSTGRES_REPLICA_HOST"):
+            return v
+        return PostgresDsn.build(
+            scheme="postgresql",
+            user=values.get("POSTGRES_USER"),
+            password=values.get("POSTGRES_PASS"),
+            host=values.get("POSTGRES_REPLICA_HOST"),
+            path=f"/{values.get('POSTGRES_DB') or ''}",
+        )
+
+    @validator("SQLALCHEMY_ASYNC_REPLICA_DATABASE_URI", pre=True)
+    def assemble_async_replica_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
+        if isinstance(v, str) or not values.get("POSTGRES_REPLICA_HOST"):
+            return v
+        return PostgresDsn.build(
+            scheme="postgresql+asyncpg",
+            user=values.get("POSTGRES_USER"),
+            password=values.get("POSTGRES_PASS"),
+            host=values.get("POSTGRES_REPLICA_HOST"),
+            path=f"/{values.get('POSTGRES_DB') or ''}",
+        )
+
 
 class Settings(BaseSettings):
     JWT_SECRET: str
@@ -40,11 +93,71 @@ class Settings(BaseSettings):
     ORDERS_SERVICE: str
     CUSTOMERS_SERVICE: str
 
+    PAYMENTS_SERVICE_TIMEOUT_SECONDS: float = 10
+    PAYMENTS_SERVICE_MAX_CONNECTIONS: int = 20
+    ORDERS_SERVICE_TIMEOUT_SECONDS: float = 5
+    ORDERS_SERVICE_MAX_CONNECTIONS: int = 20
+    CUSTOMERS_SERVICE_TIMEOUT_SECONDS: float = 5
+    CUSTOMERS_SERVICE_MAX_CONNECTIONS: int = 20
+
+    HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS: float = 2
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 30
+    HTTP_CLIENT_HTTP2_ENABLED: bool = False
+    HTTP_CLIENT_HEDGE_DELAY_SECONDS: float = 0
+
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RESET_TIMEOUT_SECONDS: float = 30
+    CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS: int = 1
+
+    REQUEST_DEADLINE_SECONDS: float = 15
+
     db: PostgresDBSettings = PostgresDBSettings()
 
+    ORDER_STATUS_PAGE_SIZE: int = 100
+    ORDER_STATUS_MAX_PAGE_SIZE: int = 1000
+    ORDER_STATUS_EXPORT_BATCH_SIZE: int = 1000
+    ORDER_STATUS_CACHE_MAX_AGE_SECONDS: int = 0
+    ORDER_STATUS_CONFLICT_RETRIES: int = 2
+
+    RESPONSE_VALIDATION_ENABLED: bool = True
+
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_LEVEL: int = 1
+
+    KITCHEN_BOARD_ENABLED: bool = True
+    KITCHEN_BOARD_MAX_AGE_SECONDS: float = 300
+
+    CACHE_BACKEND: str = "memory"
+    CACHE_TTL_SECONDS: float = 5
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_REDIS_URL: Optional[str] = None
+
+    ARCHIVAL_ENABLED: bool = True
+    ARCHIVAL_FINALIZED_AFTER_DAYS: int = 30
+    ARCHIVAL_BATCH_SIZE: int = 1000
+    ARCHIVAL_MAX_BATCHES_PER_RUN: int = 50
+    ARCHIVAL_INTERVAL_SECONDS: int = 300
+
+    PUSH_ENABLED: bool = True
+    PUSH_HEARTBEAT_SECONDS: float = 15
+    PUSH_SUBSCRIBER_QUEUE_SIZE: int = 100
+    PUSH_RECONNECT_SECONDS: float = 5
+
     PAYMENT_CONFIRMATION_QUEUE: str
     PAYMENT_ERROR_QUEUE: str
 
+    SQS_MAX_CONCURRENCY: int = 10
+    SQS_WAIT_TIME_SECONDS: int = 20
+    SQS_VISIBILITY_TIMEOUT_SECONDS: int = 60
+    SQS_ERROR_BACKOFF_SECONDS: float = 5
+    SQS_ACK_FLUSH_SECONDS: float = 0.5
+    SQS_MAX_PROCESSING_SECONDS: float = 900
+
+    MESSAGE_DEDUPE_BACKEND: str = "memory"
+    MESSAGE_DEDUPE_MAX_ENTRIES: int = 100000
+    MESSAGE_DEDUPE_TTL_SECONDS: float = 86400
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -8,6 +8,22 @@ class ResourceNotFound(DomainError):
         return cls(e)
 
 
+class PaginationError(DomainError):
+    @classmethod
+    def invalid_cursor(cls) -> "PaginationError":
+        return cls("Provided pagination cursor is not valid!")
+
+
+class ConcurrencyError(DomainError):
+    @classmethod
+    def version_conflict(cls, order_id) -> "ConcurrencyError":
+        return cls(f"Order {order_id} was modified by another request, reload it and try again!")
+
+    @classmethod
+    def transition_conflict(cls, order_id) -> "ConcurrencyError":
+        return cls(f"Order {order_id} kept changing while its status was being updated, please try again!")
+
+
 class RepositoryError(DomainError):
     @classmethod
     def save_operation_failed(cls) -> "RepositoryError":
@@ -16,3 +32,17 @@ class RepositoryError(DomainError):
     @classmethod
     def get_operation_failed(cls) -> "RepositoryError":
         return cls("An error occurred while retrieving the data from the database!")
+
+
+class ServiceUnavailable(DomainError):
+    @classmethod
+    def circuit_open(cls, service: str) -> "ServiceUnavailable":
+        return cls(f"The {service} service is unavailable, please try again later!")
+
+    @classmethod
+    def request_failed(cls, service: str) -> "ServiceUnavailable":
+        return cls(f"The {service} service did not respond, please try again later!")
+
+    @classmethod
+    def deadline_exceeded(cls, service: str) -> "ServiceUnavailable":
+        return cls(f"The request ran out of time before calling the {service} service!")
@@ -0,0 +1,169 @@
+import contextlib
+import datetime
+import uuid
+from typing import Optional, Tuple, AsyncIterator
+
+from src.adapters.order_cursor_adapter import cursor_to_keyset
+from src.adapters.order_etag_adapter import order_status_etag, order_status_projection_etag
+from src.adapters.order_export_adapter import async_orders_to_export_chunks
+from src.adapters.order_json_adapter import order_status_list_to_json, order_with_qrcode_to_json, \
+    order_transition_results_to_json, order_status_projection_to_json
+from src.config.config import settings
+from src.controllers.order_status_responses import reading, writing, removing, page_response, order_response, \
+    conditional, kitchen_board_response
+from src.entities.errors.order_status_error import OrderStatusError
+from src.entities.models.order_status_entity import status_from_label, payment_status_from_label
+from src.entities.schemas.order_status_dto import CreateOrderStatusDTO, CreateOrderStatusBatchDTO, \
+    ChangeOrderStatusBatchDTO
+from src.external.order_status_cache import order_status_cache
+from src.external.postgresql_database import read_from_primary
+from src.gateways.cached_gateways.order_status_cached_async_gateway import CachedAsyncOrderStatusRepository
+from src.gateways.postgres_gateways.order_status_core_async_gateway import PostgresDBCoreAsyncOrderStatusRepository
+from src.gateways.postgres_gateways.order_status_async_gateway import PostgresDBAsyncOrderStatusRepository
+from src.interfaces.gateways.order_status_async_gateway_interface import IAsyncOrderStatusGateway
+from src.usecases.order_status_async_usecase import AsyncOrderStatusUseCase
+from src.usecases.kitchen_board import kitchen_board
+
+
+def order_status_repository() -> IAsyncOrderStatusGateway:
+    if settings.db.POSTGRES_GATEWAY_MODE == "core":
+        order_status_gateway = PostgresDBCoreAsyncOrderStatusRepository()
+    else:
+        order_status_gateway = PostgresDBAsyncOrderStatusRepository()
+    if order_status_cache:
+        return CachedAsyncOrderStatusRepository(order_status_gateway, order_status_cache)
+    return order_status_gateway
+
+
+def order_status_usecase() -> AsyncOrderStatusUseCase:
+    return AsyncOrderStatusUseCase(order_status_repository(), kitchen_board)
+
+
+class AsyncOrderStatusController:
+    @staticmethod
+    async def get_all_orders_status(
+        limit: int,
+        after: Optional[str] = None
+    ) -> dict:
+        keyset = cursor_to_keyset(after) if after else None
+
+        with reading():
+            orders = await order_status_usecase().get_all(limit + 1, keyset)
+        return page_response(orders, limit)
+
+    @staticmethod
+    async def export_orders_status(
+        export_format: str,
+        order_status: Optional[str] = None,
+        start_date: Optional[datetime.datetime] = None,
+        end_date: Optional[datetime.datetime] = None
+    ) -> AsyncIterator[str]:
+        orders = order_status_usecase().stream_orders(
+            status_from_label(order_status) if order_status else None, start_date, end_date,
+            settings.ORDER_STATUS_EXPORT_BATCH_SIZE
+        )
+        return async_orders_to_export_chunks(orders, export_format)
+
+    @staticmethod
+    async def list_ongoing_orders(
+        if_none_match: Optional[str] = None
+    ) -> Tuple[Optional[dict], str]:
+        with reading():
+            # Board rebuilds read the primary, a lagging replica would leave the board stale until the next rebuild
+            with read_from_primary() if kitchen_board else contextlib.nullcontext():
+                version, ongoing_orders = await order_status_usecase().get_kitchen_board()
+        return kitchen_board_response(version, ongoing_orders, if_none_match)
+
+    @staticmethod
+    async def rebuild_kitchen_board() -> None:
+        with read_from_primary():
+            await order_status_usecase().rebuild_kitchen_board()
+
+    @staticmethod
+    async def get_order_by_id(
+            order_id: uuid.UUID,
+            if_none_match: Optional[str] = None
+    ) -> Tuple[Optional[dict], str]:
+        with reading(order_id):
+            order = await order_status_usecase().get_by_id(order_id)
+        return conditional(order_status_etag(order), if_none_match, lambda: order_response(order))
+
+    @staticmethod
+    async def get_order_status(
+        order_id: uuid.UUID,
+        if_none_match: Optional[str] = None
+    ) -> Tuple[Optional[dict], str]:
+        with reading(order_id):
+            projection = await order_status_usecase().get_order_status(order_id)
+        return conditional(
+            order_status_projection_etag(projection), if_none_match,
+            lambda: {"result": order_status_projection_to_json(projection)}
+        )
+
+    @staticmethod
+    async def create_order(
+        request: CreateOrderStatusDTO
+    ) -> dict:
+        with writing():
+            order = await order_status_usecase().create_order_status(request)
+        return order_response(order)
+
+    @staticmethod
+    async def create_many_orders(
+        request: CreateOrderStatusBatchDTO
+    ) -> dict:
+        with writing():
+            created_orders, existing_ids = await order_status_usecase().create_many_order_status(request)
+        return {"result": {"created": order_status_list_to_json(created_orders), "existing": existing_ids}}
+
+    @staticmethod
+    async def confirm_order(
+        order_id: uuid.UUID,
+        qr_code: str
+    ) -> dict:
+        with writing():
+            order = await order_status_usecase().confirm_order(order_id)
+        return {"result": order_with_qrcode_to_json(order, qr_code)}
+
+    @staticmethod
+    async def change_order_status_in_progress(
+        order_id: uuid.UUID,
+        payment_status: str
+    ) -> dict:
+        payment_status_code = payment_status_from_label(payment_status)
+
+        with writing():
+            order = await order_status_usecase().change_order_status_in_progress(order_id, payment_status_code)
+        return order_response(order)
+
+    @staticmethod
+    async def change_order_status_ready(
+        order_id: uuid.UUID
+    ) -> dict:
+        with writing():
+            order = await order_status_usecase().change_order_status_ready(order_id)
+        return order_response(order)
+
+    @staticmethod
+    async def change_order_status_finalized(
+        order_id: uuid.UUID
+    ) -> dict:
+        with writing():
+            order = await order_status_usecase().change_order_status_finalized(order_id)
+        return order_response(order)
+
+    @staticmethod
+    async def change_many_orders_status(
+        request: ChangeOrderStatusBatchDTO
+    ) -> dict:
+        with writing(passthrough=(OrderStatusError,)):
+            results = await order_status_usecase().change_many_orders_status(request)
+        return {"result": order_transition_results_to_json(results)}
+
+    @staticmethod
+    async def remove_order_status(
+        order_id: uuid.UUID
+    ) -> dict:
+        with removing():
+            await order_status_usecase().remove_order_status(order_id)
+        return {"result": "Order removed successfully"}
@@ -1,160 +1,181 @@
+import contextlib
+import datetime
 import uuid
+from typing import Optional, Tuple, Iterator
 
 from fastapi import APIRouter
 
-from src.adapters.order_json_adapter import order_status_list_to_json, order_status_to_json, order_with_qrcode_to_json
-from src.config.errors import RepositoryError, ResourceNotFound, DomainError
+from src.adapters.order_cursor_adapter import cursor_to_keyset
+from src.adapters.order_etag_adapter import order_status_etag, order_status_projection_etag
+from src.adapters.order_export_adapter import orders_to_export_chunks
+from src.adapters.order_json_adapter import order_status_list_to_json, order_with_qrcode_to_json, \
+    order_transition_results_to_json, order_status_projection_to_json
+from src.config.config import settings
+from src.controllers.order_status_responses import reading, writing, removing, page_response, order_response, \
+    conditional, kitchen_board_response
 from src.entities.errors.order_status_error import OrderStatusError
-from src.entities.schemas.order_status_dto import CreateOrderStatusDTO
+from src.entities.models.order_status_entity import status_from_label, payment_status_from_label
+from src.entities.schemas.order_status_dto import CreateOrderStatusDTO, CreateOrderStatusBatchDTO, \
+    ChangeOrderStatusBatchDTO
+from src.external.order_status_cache import order_status_cache
+from src.external.postgresql_database import read_from_primary
+from src.gateways.cached_gateways.order_status_cached_gateway import CachedOrderStatusRepository
+from src.gateways.postgres_gateways.order_status_core_gateway import PostgresDBCoreOrderStatusRepository
 from src.gateways.postgres_gateways.order_status_gateway import PostgresDBOrderStatusRepository
+from src.interfaces.gateways.order_status_gateway_interface import IOrderStatusGateway
 from src.usecases.order_status_usecase import OrderStatusUseCase
+from src.usecases.kitchen_board import kitchen_board
 
 router = APIRouter()
 
 
-class OrderStatusController:
-    @staticmethod
-    async def get_all_orders_status() -> dict:
+def order_status_repository() -> IOrderStatusGateway:
+    if settings.db.POSTGRES_GATEWAY_MODE == "core":
+        order_status_gateway = PostgresDBCoreOrderStatusRepository()
+    else:
         order_status_gateway = PostgresDBOrderStatusRepository()
+    if order_status_cache:
+        return CachedOrderStatusRepository(order_status_gateway, order_status_cache)
+    return order_status_gateway
+
 
-        try:
-            all_orders = OrderStatusUseCase(order_status_gateway).get_all()
-            result = order_status_list_to_json(all_orders)
-        except Exception as e:
-            print(e)
-            raise RepositoryError.get_operation_failed()
+def order_status_usecase() -> OrderStatusUseCase:
+    return OrderStatusUseCase(order_status_repository(), kitchen_board)
 
-        return {"result": result}
 
+class OrderStatusController:
     @staticmethod
-    async def list_ongoing_orders() -> dict:
-        order_status_gateway = PostgresDBOrderStatusRepository()
+    async def get_all_orders_status(
+        limit: int,
+        after: Optional[str] = None
+    ) -> dict:
+        keyset = cursor_to_keyset(after) if after else None
 
-        try:
-            ongoing_orders = OrderStatusUseCase(order_status_gateway).list_ongoing_orders()
-            result = order_status_list_to_json(ongoing_orders)
-        except Exception as e:
-            raise RepositoryError.get_operation_failed()
+        with reading():
+            orders = order_status_usecase().get_all(limit + 1, keyset)
+        return page_response(orders, limit)
 
-        return {"result": result}
+    @staticmethod
+    async def export_orders_status(
+        export_format: str,
+        order_status: Optional[str] = None,
+        start_date: Optional[datetime.datetime] = None,
+        end_date: Optional[datetime.datetime] = None
+    ) -> Iterator[str]:
+        orders = order_status_usecase().stream_orders(
+            status_from_label(order_status) if order_status else None, start_date, end_date,
+            settings.ORDER_STATUS_EXPORT_BATCH_SIZE
+        )
+        return orders_to_export_chunks(orders, export_format)
 
     @staticmethod
-    async def get_order_by_id(
-            order_id: uuid.UUID
-    ) -> dict:
-        order_status_gateway = PostgresDBOrderStatusRepository()
+    async def list_ongoing_orders(
+        if_none_match: Optional[str] = None
+    ) -> Tuple[Optional[dict], str]:
+        with reading():
+            # Board rebuilds read the primary, a lagging replica would leave the board stale until the next rebuild
+            with read_from_primary() if kitchen_board else contextlib.nullcontext():
+                version, ongoing_orders = order_status_usecase().get_kitchen_board()
+        return kitchen_board_response(version, ongoing_orders, if_none_match)
 
-        try:
-            order = OrderStatusUseCase(order_status_gateway).get_by_id(order_id)
-            result = order_status_to_json(order)
-        except ResourceNotFound:
-            raise ResourceNotFound.get_operation_failed(f"No order with id: {order_id}")
-        except Exception:
-            raise RepositoryError.get_operation_failed()
+    @staticmethod
+    async def rebuild_kitchen_board() -> None:
+        with read_from_primary():
+            order_status_usecase().rebuild_kitchen_board()
 
-        return {"result": result}
+    @staticmethod
+    async def get_order_by_id(
+            order_id: uuid.UUID,
+            if_none_match: Optional[str] = None
+    ) -> Tuple[Optional[dict], str]:
+        with reading(order_id):
+            order = order_status_usecase().get_by_id(order_id)
+        return conditional(order_status_etag(order), if_none_match, lambda: order_response(order))
 
     @staticmethod
     async def get_order_status(
-        order_id: uuid.UUID
-    ) -> dict:
-        order_status_gateway = PostgresDBOrderStatusRepository()
-
-        try:
-            order = OrderStatusUseCase(order_status_gateway).get_order_status(order_id)
-            result = order_status_to_json(order)
-        except ResourceNotFound:
-            raise ResourceNotFound.get_operation_failed(f"No order with id: {order_id}")
-        except Exception:
-            raise RepositoryError.get_operation_failed()
-
-        return {"result": result}
+        order_id: uuid.UUID,
+        if_none_match: Optional[str] = None
+    ) -> Tuple[Optional[dict], str]:
+        with reading(order_id):
+            projection = order_status_usecase().get_order_status(order_id)
+        return conditional(
+            order_status_projection_etag(projection), if_none_match,
+            lambda: {"result": order_status_projection_to_json(projection)}
+        )
 
     @staticmethod
     async def create_order(
         request: CreateOrderStatusDTO
     ) -> dict:
-        order_status_gateway = PostgresDBOrderStatusRepository()
+        with writing():
+            order = order_status_usecase().create_order_status(request)
+        return order_response(order)
 
-        try:
-            order = OrderStatusUseCase(order_status_gateway).create_order_status(request)
-            result = order_status_to_json(order)
-        except Exception as e:
-            print(e)
-            raise RepositoryError.save_operation_failed()
-
-        return {"result": result}
+    @staticmethod
+    async def create_many_orders(
+        request: CreateOrderStatusBatchDTO
+    ) -> dict:
+        with writing():
+            created_orders, existing_ids = order_status_usecase().create_many_order_status(request)
+        return {"result": {"created": order_status_list_to_json(created_orders), "existing": existing_ids}}
 
     @staticmethod
     async def confirm_order(
         order_id: uuid.UUID,
         qr_code: str
     ) -> dict:
-        order_status_gateway = PostgresDBOrderStatusRepository()
-
-        try:
-            order = OrderStatusUseCase(order_status_gateway).confirm_order(order_id)
-            result = order_with_qrcode_to_json(order, qr_code)
-        except Exception as e:
-            print(e)
-            raise RepositoryError.save_operation_failed()
-
-        return {"result": result}
+        with writing():
+            order = order_status_usecase().confirm_order(order_id)
+        return {"result": order_with_qrcode_to_json(order, qr_code)}
 
     @staticmethod
-    def change_order_status_in_progress(
+    async def change_order_status_in_progress(
         order_id: uuid.UUID,
         payment_status: str
     ) -> dict:
-        order_status_gateway = PostgresDBOrderStatusRepository()
-
-        try:
-            order = OrderStatusUseCase(order_status_gateway).change_order_status_in_progress(order_id, payment_status)
-            result = order_status_to_json(order)
-        except Exception:
-            raise RepositoryError.save_operation_failed()
+        payment_status_code = payment_status_from_label(payment_status)
 
-        return {"result": result}
+        with writing():
+            order = order_status_usecase().change_order_status_in_progress(order_id, payment_status_code)
+        return order_response(order)
 
     @staticmethod
     async def change_order_status_ready(
         order_id: uuid.UUID
     ) -> dict:
-        order_status_gateway = PostgresDBOrderStatusRepository()
-
-        try:
-            order = OrderStatusUseCase(order_status_gateway).change_order_status_ready(order_id)
-            result = order_status_to_json(order)
-        except Exception:
-            raise RepositoryError.save_operation_failed()
-
-        return {"result": result}
+        with writing():
+            order = order_status_usecase().change_order_status_ready(order_id)
+        return order_response(order)
 
     @staticmethod
     async def change_order_status_finalized(
         order_id: uuid.UUID
     ) -> dict:
-        order_status_gateway = PostgresDBOrderStatusRepository()
+        with writing():
+            order = order_status_usecase().change_order_status_finalized(order_id)
+        return order_response(order)
 
-        try:
-            order = OrderStatusUseCase(order_status_gateway).change_order_status_finalized(order_id)
-            result = order_status_to_json(order)
-        except Exception:
-            raise RepositoryError.save_operation_failed()
+    @staticmethod
+    async def change_many_orders_status(
+        request: ChangeOrderStatusBatchDTO
+    ) -> dict:
+        with writing(passthrough=(OrderStatusError,)):
+            results = order_status_usecase().change_many_orders_status(request)
+        return {"result": order_transition_results_to_json(results)}
 
-        return {"result": result}
+    @staticmethod
+    def archive_finalized_orders() -> int:
+        finalized_before = datetime.datetime.utcnow() - datetime.timedelta(days=settings.ARCHIVAL_FINALIZED_AFTER_DAYS)
+
+        return order_status_usecase().archive_finalized_orders(
+            finalized_before, settings.ARCHIVAL_BATCH_SIZE, settings.ARCHIVAL_MAX_BATCHES_PER_RUN
+        )
 
     @staticmethod
     async def remove_order_status(
         order_id: uuid.UUID
     ) -> dict:
-        order_status_gateway = PostgresDBOrderStatusRepository()
-
-        try:
-            OrderStatusUseCase(order_status_gateway).remove_order_status(order_id)
-        except DomainError:
-            raise OrderStatusError.invalid_status()
-        except Exception:
-            raise RepositoryError.save_operation_failed()
-
+        with removing():
+            order_status_usecase().remove_order_status(order_id)
         return {"result": "Order removed successfully"}
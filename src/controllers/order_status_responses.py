@@ -0,0 +1,76 @@
+import contextlib
+import logging
+import uuid
+from typing import Callable, Iterator, List, Optional, Tuple, Type
+
+from src.adapters.order_cursor_adapter import order_status_to_cursor
+from src.adapters.order_etag_adapter import etag_matches, kitchen_board_etag, order_status_list_etag
+from src.adapters.order_json_adapter import order_status_list_to_json, order_status_to_json
+from src.config.errors import RepositoryError, ResourceNotFound, DomainError, ConcurrencyError
+from src.entities.errors.order_status_error import OrderStatusError
+from src.entities.models.order_status_entity import OrderStatus
+from src.usecases.kitchen_board import kitchen_board
+
+logger = logging.getLogger(__name__)
+
+
+@contextlib.contextmanager
+def reading(order_id: Optional[uuid.UUID] = None) -> Iterator[None]:
+    try:
+        yield
+    except ResourceNotFound:
+        raise ResourceNotFound.get_operation_failed(f"No order with id: {order_id}")
+    except Exception:
+        logger.exception("Reading order status failed")
+        raise RepositoryError.get_operation_failed()
+
+
+@contextlib.contextmanager
+def writing(passthrough: Tuple[Type[Exception], ...] = (ConcurrencyError,)) -> Iterator[None]:
+    try:
+        yield
+    except passthrough:
+        raise
+    except Exception:
+        logger.exception("Saving order status failed")
+        raise RepositoryError.save_operation_failed()
+
+
+@contextlib.contextmanager
+def removing() -> Iterator[None]:
+    try:
+        yield
+    except DomainError:
+        raise OrderStatusError.invalid_status()
+    except Exception:
+        logger.exception("Removing order status failed")
+        raise RepositoryError.save_operation_failed()
+
+
+def page_response(orders: List[OrderStatus], limit: int) -> dict:
+    # Pages are read with one extra row, its presence is what tells another page exists
+    next_cursor = order_status_to_cursor(orders[limit - 1]) if len(orders) > limit else None
+    return {"result": order_status_list_to_json(orders[:limit]), "nextCursor": next_cursor}
+
+
+def order_response(order: OrderStatus) -> dict:
+    return {"result": order_status_to_json(order)}
+
+
+def conditional(etag: str, if_none_match: Optional[str], render: Callable[[], dict]) -> Tuple[Optional[dict], str]:
+    # A matching If-None-Match skips serializing the body at all
+    if etag_matches(if_none_match, etag):
+        return None, etag
+    return render(), etag
+
+
+def kitchen_board_response(
+    version: Optional[int], ongoing_orders: List[OrderStatus], if_none_match: Optional[str]
+) -> Tuple[Optional[dict], str]:
+    if version is None:
+        etag = order_status_list_etag(ongoing_orders)
+    else:
+        etag = kitchen_board_etag(kitchen_board.board_id, version)
+    return conditional(
+        etag, if_none_match, lambda: {"result": order_status_list_to_json(ongoing_orders), "version": version}
+    )
@@ -5,3 +5,7 @@ class OrderStatusError(DomainError):
     @classmethod
     def invalid_status(cls) -> "OrderStatusError":
         return cls("Provided order status is not valid!")
+
+    @classmethod
+    def invalid_payment_status(cls) -> "OrderStatusError":
+        return cls("Provided payment status is not valid!")
@@ -1,37 +1,88 @@
 import datetime
 import uuid
 from dataclasses import dataclass
-from typing import List
+from enum import IntEnum
+from typing import List, Optional
 
 from src.entities.errors.order_status_error import OrderStatusError
 
 
-class Status:
-    PENDING = "Pendente"
-    CONFIRMED = "Confirmado"
-    IN_PROGRESS = "Em preparo"
-    READY = "Pronto"
-    FINALIZED = "Finalizado"
+# Stored as smallint codes in the same order as the order lifecycle, so later statuses sort higher
+class Status(IntEnum):
+    PENDING = 1
+    CONFIRMED = 2
+    IN_PROGRESS = 3
+    READY = 4
+    FINALIZED = 5
 
 
-class PaymentStatus:
-    PENDING = "Pendente"
-    CONFIRMED = "Confirmado"
-    REFUSED = "Negado"
+class PaymentStatus(IntEnum):
+    PENDING = 1
+    CONFIRMED = 2
+    REFUSED = 3
+
+
+# Display labels are only used at the API and messaging edges
+STATUS_LABELS = {
+    Status.PENDING: "Pendente",
+    Status.CONFIRMED: "Confirmado",
+    Status.IN_PROGRESS: "Em preparo",
+    Status.READY: "Pronto",
+    Status.FINALIZED: "Finalizado",
+}
+
+PAYMENT_STATUS_LABELS = {
+    PaymentStatus.PENDING: "Pendente",
+    PaymentStatus.CONFIRMED: "Confirmado",
+    PaymentStatus.REFUSED: "Negado",
+}
+
+STATUSES_BY_LABEL = {label: status for status, label in STATUS_LABELS.items()}
+
+PAYMENT_STATUSES_BY_LABEL = {label: status for status, label in PAYMENT_STATUS_LABELS.items()}
+
+# Statuses shown on the kitchen board, which lists them from the highest code down
+ONGOING_STATUSES = frozenset((Status.CONFIRMED, Status.IN_PROGRESS, Status.READY))
+
+# Maps each target status to the only status it may be reached from
+STATUS_TRANSITIONS = {
+    Status.CONFIRMED: Status.PENDING,
+    Status.IN_PROGRESS: Status.CONFIRMED,
+    Status.READY: Status.IN_PROGRESS,
+    Status.FINALIZED: Status.READY,
+}
+
+
+def status_from_label(label: str) -> Status:
+    try:
+        return STATUSES_BY_LABEL[label]
+    except KeyError:
+        raise OrderStatusError.invalid_status()
+
+
+def payment_status_from_label(label: str) -> PaymentStatus:
+    try:
+        return PAYMENT_STATUSES_BY_LABEL[label]
+    except KeyError:
+        raise OrderStatusError.invalid_payment_status()
 
 
 @dataclass
 class OrderStatus:
+    __slots__ = ("order_id", "creation_date", "order_status", "version")
+
     order_id: uuid.UUID
     creation_date: datetime.datetime
-    order_status: str
+    order_status: Status
+    version: int
 
     @classmethod
     def create_new_order_status(cls, order_id: uuid.uuid4()) -> "OrderStatus":
         return cls(
             order_id,
             datetime.datetime.utcnow(),
-            Status.PENDING
+            Status.PENDING,
+            1
         )
 
     def check_if_pending_order(self) -> None:
@@ -39,7 +90,12 @@ class OrderStatus:
             raise OrderStatusError("Order already confirmed, modification not allowed!")
 
     @staticmethod
-    def check_payment_status(payment_status: str) -> None:
+    def check_valid_status(order_status: Status) -> None:
+        if order_status not in STATUS_LABELS:
+            raise OrderStatusError.invalid_status()
+
+    @staticmethod
+    def check_payment_status(payment_status: PaymentStatus) -> None:
         if payment_status == PaymentStatus.PENDING:
             raise OrderStatusError("Order payment id pending!")
         if payment_status == PaymentStatus.REFUSED:
@@ -49,7 +105,7 @@ class OrderStatus:
         self.check_if_pending_order()
         self.order_status = Status.CONFIRMED
 
-    def order_in_progress(self, payment_status: str) -> None:
+    def order_in_progress(self, payment_status: PaymentStatus) -> None:
         if self.order_status == Status.CONFIRMED:
             self.check_payment_status(payment_status)
             self.order_status = Status.IN_PROGRESS
@@ -73,13 +129,30 @@ class OrderStatus:
             raise OrderStatusError("Order not yet ready!")
 
 
+@dataclass
+class OrderStatusProjection:
+    __slots__ = ("order_id", "order_status")
+
+    order_id: uuid.UUID
+    order_status: Status
+
+
+@dataclass
+class OrderStatusTransitionResult:
+    order_id: uuid.UUID
+    order_status: Optional[OrderStatus] = None
+    error: Optional[str] = None
+
+
 def order_status_factory(
     order_id: uuid.UUID,
     creation_date: datetime.datetime,
-    order_status: str
+    order_status: int,
+    version: int = 1
 ) -> OrderStatus:
     return OrderStatus(
         order_id=order_id,
         creation_date=creation_date,
-        order_status=order_status
+        order_status=Status(order_status),
+        version=version
     )
@@ -1,9 +1,41 @@
 import datetime
 import uuid
+from enum import Enum
 from typing import Optional, List
 
+from pydantic import conlist
+
+from src.entities.errors.order_status_error import OrderStatusError
+from src.entities.models.order_status_entity import Status, STATUS_LABELS, status_from_label
 from src.utils.utils import CamelModel
 
+MAX_BATCH_SIZE = 5000
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class StatusLabel(int):
+    # Clients keep sending the display label, the DTO hands the use cases the stored Status code
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: dict) -> None:
+        field_schema.update(type="string", enum=list(STATUS_LABELS.values()))
+
+    @classmethod
+    def validate(cls, value) -> Status:
+        if isinstance(value, Status):
+            return value
+        try:
+            return status_from_label(value)
+        except OrderStatusError as e:
+            raise ValueError(str(e))
+
 
 class OrderStatusDTO(CamelModel):
     order_id: uuid.UUID
@@ -20,6 +52,19 @@ class OrderStatusDTO(CamelModel):
         }
 
 
+class OrderStatusProjectionDTO(CamelModel):
+    order_id: uuid.UUID
+    order_status: str
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "order_id": "00000000-0000-0000-0000-000000000000",
+                "order_status": "Pendente",
+            }
+        }
+
+
 class CreateOrderStatusDTO(CamelModel):
     order_id: uuid.UUID
 
@@ -31,6 +76,36 @@ class CreateOrderStatusDTO(CamelModel):
         }
 
 
+class CreateOrderStatusBatchDTO(CamelModel):
+    order_ids: conlist(uuid.UUID, min_items=1, max_items=MAX_BATCH_SIZE)
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "order_ids": [
+                    "00000000-0000-0000-0000-000000000000",
+                    "00000000-0000-0000-0000-000000000001",
+                ],
+            }
+        }
+
+
+class ChangeOrderStatusBatchDTO(CamelModel):
+    order_ids: conlist(uuid.UUID, min_items=1, max_items=MAX_BATCH_SIZE)
+    order_status: StatusLabel
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "order_ids": [
+                    "00000000-0000-0000-0000-000000000000",
+                    "00000000-0000-0000-0000-000000000001",
+                ],
+                "order_status": "Pronto",
+            }
+        }
+
+
 class UpdateOrderStatusDTO(CamelModel):
     order_id: uuid.UUID
     order_status: str
@@ -59,5 +134,39 @@ class OrderStatusDTOResponse(CamelModel):
     result: OrderStatusDTO
 
 
+class OrderStatusProjectionDTOResponse(CamelModel):
+    result: OrderStatusProjectionDTO
+
+
 class OrderStatusDTOListResponse(CamelModel):
     result: List[OrderStatusDTO]
+
+
+class OngoingOrdersDTOResponse(CamelModel):
+    result: List[OrderStatusDTO]
+    version: Optional[int]
+
+
+class OrderStatusBatchDTO(CamelModel):
+    created: List[OrderStatusDTO]
+    existing: List[uuid.UUID]
+
+
+class OrderStatusBatchDTOResponse(CamelModel):
+    result: OrderStatusBatchDTO
+
+
+class OrderStatusTransitionDTO(CamelModel):
+    order_id: uuid.UUID
+    success: bool
+    order_status: Optional[OrderStatusDTO]
+    error: Optional[str]
+
+
+class OrderStatusTransitionBatchDTOResponse(CamelModel):
+    result: List[OrderStatusTransitionDTO]
+
+
+class OrderStatusDTOPageResponse(CamelModel):
+    result: List[OrderStatusDTO]
+    next_cursor: Optional[str]
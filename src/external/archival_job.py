@@ -0,0 +1,23 @@
+import threading
+
+from src.config.config import settings
+
+from src.controllers.order_status_controller import OrderStatusController
+
+
+class FinalizedOrdersArchivalJob(threading.Thread):
+    def __init__(self):
+        super().__init__()
+        self.interval = settings.ARCHIVAL_INTERVAL_SECONDS
+        self.shutdown_flag = threading.Event()
+
+    def run(self, *args, **kwargs):
+        while not self.shutdown_flag.is_set():
+            try:
+                archived = OrderStatusController.archive_finalized_orders()
+                if archived:
+                    print(f"archived {archived} finalized orders")
+            except Exception as e:
+                print(e)
+
+            self.shutdown_flag.wait(self.interval)
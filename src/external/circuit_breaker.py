@@ -0,0 +1,75 @@
+import time
+from typing import Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout_seconds: float,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_seconds = reset_timeout_seconds
+        self._half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self.state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self.opened = 0
+        self.rejected = 0
+        self.probes = 0
+
+    def allow(self) -> bool:
+        if self.state == OPEN and self._clock() - self._opened_at >= self._reset_timeout_seconds:
+            self.state = HALF_OPEN
+        if self.state == CLOSED:
+            return True
+        # Half open lets a few probes find out whether the service is back, everyone else fails fast
+        if self.state == HALF_OPEN and self._probes_in_flight < self._half_open_max_calls:
+            self._probes_in_flight += 1
+            self.probes += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self._consecutive_failures = 0
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+            self.state = CLOSED
+
+    def record_failure(self) -> None:
+        self._consecutive_failures += 1
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+            self._open()
+        elif self.state == CLOSED and self._consecutive_failures >= self._failure_threshold:
+            self._open()
+
+    def record_cancelled(self) -> None:
+        # A probe abandoned by its caller tells nothing about the service, but must free its slot
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self._opened_at = self._clock()
+        self.opened += 1
+
+    def statistics(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutiveFailures": self._consecutive_failures,
+            "failureThreshold": self._failure_threshold,
+            "resetTimeoutSeconds": self._reset_timeout_seconds,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "probes": self.probes,
+        }
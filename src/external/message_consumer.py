@@ -0,0 +1,311 @@
+import asyncio
+import functools
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+from src.external.messaging_client import MessagingClient
+from src.interfaces.gateways.message_dedupe_interface import IMessageDedupeStore, IN_PROGRESS, PROCESSED
+
+# SQS never returns more messages than this from a single ReceiveMessage call, nor deletes more per batch
+MAX_RECEIVE_BATCH = 10
+MAX_DELETE_BATCH = 10
+
+MessageHandler = Callable[[dict], Any]
+# Names the event a message carries, for queues where handling the same event twice is never wanted
+EventKey = Callable[[dict], Optional[str]]
+
+
+def notification_content(message: dict) -> dict:
+    # Payment events reach the queues through SNS, which wraps them in its own envelope
+    return json.loads(json.loads(message["Body"])["Message"])
+
+
+def dedupe_keys(event_type: str, message: dict, event_key: Optional[EventKey] = None) -> List[str]:
+    keys = [f"message:{message['MessageId']}"]
+    key = event_key(notification_content(message)) if event_key else None
+    if key:
+        # SNS can publish the same event twice under different message ids
+        keys.append(f"{event_type}:{key}")
+    return keys
+
+
+def receive_count(message: dict) -> int:
+    return int(message.get("Attributes", {}).get("ApproximateReceiveCount", 1))
+
+
+class AckBatcher:
+    def __init__(
+        self, queue: str, delete_batch: Callable[[str, List[str]], Awaitable[List[str]]], flush_seconds: float
+    ) -> None:
+        self._queue = queue
+        self._delete_batch = delete_batch
+        self._flush_seconds = flush_seconds
+        self._pending: List[Tuple[str, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Future] = set()
+        self.calls = 0
+        self.acked = 0
+        self.failed = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def ack(self, receipt_handle: str) -> None:
+        self._pending.append((receipt_handle, time.monotonic()))
+        if len(self._pending) >= MAX_DELETE_BATCH:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._flush_seconds, self._flush)
+
+    async def close(self) -> None:
+        self._flush()
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        flush = asyncio.ensure_future(self._send(batch))
+        self._flushes.add(flush)
+        flush.add_done_callback(self._flushes.discard)
+
+    async def _send(self, batch: List[Tuple[str, float]]) -> None:
+        self.calls += 1
+        try:
+            failed = set(await self._delete_batch(self._queue, [receipt_handle for receipt_handle, _ in batch]))
+        except Exception as e:
+            print(e)
+            failed = {receipt_handle for receipt_handle, _ in batch}
+
+        acked_at = time.monotonic()
+        for receipt_handle, queued_at in batch:
+            # A failed delete only means SQS will deliver the message once more
+            if receipt_handle in failed:
+                self.failed += 1
+                continue
+            self.acked += 1
+            self._latency_total += acked_at - queued_at
+            self._latency_max = max(self._latency_max, acked_at - queued_at)
+
+    def statistics(self) -> dict:
+        return {
+            "ackCalls": self.calls,
+            "acked": self.acked,
+            "ackFailures": self.failed,
+            "ackLatencyAvgMs": round(self._latency_total / self.acked * 1000, 3) if self.acked else 0.0,
+            "ackLatencyMaxMs": round(self._latency_max * 1000, 3),
+        }
+
+
+class QueueConsumer:
+    def __init__(
+        self, queue: str, handler: MessageHandler, event_type: str, event_key: Optional[EventKey] = None
+    ) -> None:
+        self.queue = queue
+        self.handler = handler
+        self.event_type = event_type
+        self.event_key = event_key
+        self.acks: Optional[AckBatcher] = None
+        self.receive_calls = 0
+        self.received = 0
+        self.redelivered = 0
+        self.processed = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.deferred = 0
+        self.in_flight = 0
+        self.heartbeats = 0
+
+    def statistics(self) -> dict:
+        return {
+            "queue": self.queue.rsplit("/", 1)[-1],
+            "receiveCalls": self.receive_calls,
+            "received": self.received,
+            "redelivered": self.redelivered,
+            "processed": self.processed,
+            "failed": self.failed,
+            "duplicates": self.duplicates,
+            "duplicateRate": round(self.duplicates / self.received, 4) if self.received else 0.0,
+            "deferred": self.deferred,
+            "inFlight": self.in_flight,
+            "heartbeats": self.heartbeats,
+            **(self.acks.statistics() if self.acks else {}),
+        }
+
+
+class MessageConsumer:
+    def __init__(
+        self,
+        max_concurrency: int,
+        wait_time_seconds: int,
+        visibility_timeout: int,
+        error_backoff_seconds: float,
+        ack_flush_seconds: float,
+        max_processing_seconds: float,
+        dedupe: Optional[IMessageDedupeStore] = None,
+        client=MessagingClient
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._wait_time_seconds = wait_time_seconds
+        self._visibility_timeout = visibility_timeout
+        self._error_backoff_seconds = error_backoff_seconds
+        self._ack_flush_seconds = ack_flush_seconds
+        self._max_processing_seconds = max_processing_seconds
+        self._dedupe = dedupe
+        self._client = client
+        self._consumers: List[QueueConsumer] = []
+        self._pollers: List[asyncio.Future] = []
+        self._handling: Set[asyncio.Future] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    def register(
+        self, queue: str, handler: MessageHandler, event_type: str, event_key: Optional[EventKey] = None
+    ) -> None:
+        self._consumers.append(QueueConsumer(queue, handler, event_type, event_key))
+
+    async def start(self) -> None:
+        # Long polls, synchronous handlers and their heartbeats block, so they get their own threads
+        # instead of the loop's default executor
+        workers = len(self._consumers) * (2 * self._max_concurrency + 2)
+        self._executor = ThreadPoolExecutor(max_workers=workers or 1)
+        self._stopping = asyncio.Event()
+        for consumer in self._consumers:
+            consumer.acks = AckBatcher(
+                consumer.queue, functools.partial(self._run_blocking, self._client.delete_batch),
+                self._ack_flush_seconds
+            )
+        self._pollers = [asyncio.ensure_future(self._poll(consumer)) for consumer in self._consumers]
+
+    async def stop(self) -> None:
+        if self._stopping is None:
+            return
+        self._stopping.set()
+        for poller in self._pollers:
+            poller.cancel()
+        await asyncio.gather(*self._pollers, return_exceptions=True)
+        # Messages already taken are finished and acknowledged rather than left for redelivery
+        await asyncio.gather(*self._handling, return_exceptions=True)
+        await asyncio.gather(*(consumer.acks.close() for consumer in self._consumers))
+        self._executor.shutdown(wait=False)
+
+    def statistics(self) -> dict:
+        return {
+            "maxConcurrency": self._max_concurrency,
+            "dedupe": self._dedupe.statistics() if self._dedupe else {"backend": "none"},
+            "queues": [consumer.statistics() for consumer in self._consumers],
+        }
+
+    async def _run_blocking(self, function: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(function, *args))
+
+    @staticmethod
+    async def _reserve(semaphore: asyncio.Semaphore) -> int:
+        await semaphore.acquire()
+        slots = 1
+        # Only asks for as many messages as there are free handlers, so none sit out their visibility timeout here
+        while slots < MAX_RECEIVE_BATCH and not semaphore.locked():
+            await semaphore.acquire()
+            slots += 1
+        return slots
+
+    async def _poll(self, consumer: QueueConsumer) -> None:
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        while not self._stopping.is_set():
+            slots = await self._reserve(semaphore)
+            try:
+                consumer.receive_calls += 1
+                messages = await self._run_blocking(
+                    self._client.receive, consumer.queue, slots, self._wait_time_seconds, self._visibility_timeout
+                )
+            except Exception as e:
+                print(e)
+                messages = None
+
+            for _ in range(slots - len(messages or ())):
+                semaphore.release()
+
+            if messages is None:
+                # Only a failing SQS call backs off, a healthy queue is polled back to back
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self._error_backoff_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            consumer.received += len(messages)
+            consumer.redelivered += sum(1 for message in messages if receive_count(message) > 1)
+            for message in messages:
+                handling = asyncio.ensure_future(self._process(consumer, message, semaphore))
+                self._handling.add(handling)
+                handling.add_done_callback(self._handling.discard)
+
+    async def _heartbeat(self, consumer: QueueConsumer, receipt_handle: str, keys: List[str]) -> None:
+        # Keeps a slow handler's message invisible and its dedupe lease held, but only up to max_processing_seconds
+        # so a hung handler cannot hide it for good
+        interval = self._visibility_timeout / 2
+        deadline = time.monotonic() + self._max_processing_seconds
+        while time.monotonic() + interval < deadline:
+            await asyncio.sleep(interval)
+            try:
+                await self._run_blocking(
+                    self._client.change_visibility, consumer.queue, receipt_handle, self._visibility_timeout
+                )
+                consumer.heartbeats += 1
+                if keys:
+                    await self._run_blocking(self._dedupe.extend, keys, self._visibility_timeout)
+            except Exception as e:
+                print(e)
+
+    async def _settle(self, settle: Callable[[List[str]], None], keys: List[str]) -> None:
+        try:
+            await self._run_blocking(settle, keys)
+        except Exception as e:
+            print(e)
+
+    async def _process(self, consumer: QueueConsumer, message: dict, semaphore: asyncio.Semaphore) -> None:
+        consumer.in_flight += 1
+        heartbeat: Optional[asyncio.Future] = None
+        keys: List[str] = []
+        try:
+            if self._dedupe:
+                message_keys = dedupe_keys(consumer.event_type, message, consumer.event_key)
+                # The lease lapses with the visibility timeout, so the redelivery of a message whose worker died
+                # mid handler is claimable again instead of looking like a duplicate
+                outcome = await self._run_blocking(self._dedupe.claim, message_keys, self._visibility_timeout)
+                if outcome == PROCESSED:
+                    # Already handled, so it is only acknowledged
+                    consumer.duplicates += 1
+                    consumer.acks.ack(message["ReceiptHandle"])
+                    return
+                if outcome == IN_PROGRESS:
+                    # Another copy is being handled and may still fail, this one comes back after its visibility
+                    # timeout and is acknowledged once that copy is done
+                    consumer.deferred += 1
+                    return
+                keys = message_keys
+            heartbeat = asyncio.ensure_future(self._heartbeat(consumer, message["ReceiptHandle"], keys))
+            if asyncio.iscoroutinefunction(consumer.handler):
+                await consumer.handler(message)
+            else:
+                await self._run_blocking(consumer.handler, message)
+        except Exception as e:
+            # Left unacknowledged, so SQS redelivers it once the visibility timeout runs out
+            consumer.failed += 1
+            print(e)
+            if keys:
+                await self._settle(self._dedupe.release, keys)
+        else:
+            if keys:
+                await self._settle(self._dedupe.complete, keys)
+            consumer.processed += 1
+            consumer.acks.ack(message["ReceiptHandle"])
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            consumer.in_flight -= 1
+            semaphore.release()
@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+from src.config.config import Settings
+from src.gateways.postgres_gateways.message_dedupe_gateway import PostgresDBMessageDedupeRepository
+from src.interfaces.gateways.message_dedupe_interface import IMessageDedupeStore, CLAIMED, IN_PROGRESS, PROCESSED
+
+
+class InMemoryDedupeStore(IMessageDedupeStore):
+    def __init__(
+        self, max_entries: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Keys map to when they expire and whether their message was processed or is only leased
+        self._entries: "OrderedDict[str, Tuple[float, bool]]" = OrderedDict()
+        self._evictions = 0
+
+    def claim(self, keys: List[str], lease_seconds: float) -> str:
+        now = self._clock()
+        with self._lock:
+            held = [entry for entry in map(self._entries.get, keys) if entry and entry[0] > now]
+            if held:
+                return PROCESSED if any(processed for _, processed in held) else IN_PROGRESS
+            self._store(keys, now + lease_seconds, False)
+        return CLAIMED
+
+    def extend(self, keys: List[str], lease_seconds: float) -> None:
+        expires_at = self._clock() + lease_seconds
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry and not entry[1]:
+                    self._entries[key] = (expires_at, False)
+
+    def complete(self, keys: List[str]) -> None:
+        expires_at = self._clock() + self._ttl_seconds
+        with self._lock:
+            self._store(keys, expires_at, True)
+
+    def release(self, keys: List[str]) -> None:
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry and not entry[1]:
+                    del self._entries[key]
+
+    def _store(self, keys: List[str], expires_at: float, processed: bool) -> None:
+        for key in keys:
+            self._entries[key] = (expires_at, processed)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def statistics(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "size": len(self._entries),
+                "maxEntries": self._max_entries,
+                "ttlSeconds": self._ttl_seconds,
+                "evictions": self._evictions,
+            }
+
+
+class TieredDedupeStore(IMessageDedupeStore):
+    def __init__(self, local: IMessageDedupeStore, shared: IMessageDedupeStore) -> None:
+        self._local = local
+        self._shared = shared
+
+    def claim(self, keys: List[str], lease_seconds: float) -> str:
+        # Copies this worker has already seen are turned away without a database round trip
+        outcome = self._local.claim(keys, lease_seconds)
+        if outcome != CLAIMED:
+            return outcome
+        try:
+            outcome = self._shared.claim(keys, lease_seconds)
+        except Exception:
+            # Without the database answer the message must stay claimable for its redelivery
+            self._local.release(keys)
+            raise
+        if outcome == PROCESSED:
+            self._local.complete(keys)
+        elif outcome == IN_PROGRESS:
+            self._local.release(keys)
+        return outcome
+
+    def extend(self, keys: List[str], lease_seconds: float) -> None:
+        self._local.extend(keys, lease_seconds)
+        self._shared.extend(keys, lease_seconds)
+
+    def complete(self, keys: List[str]) -> None:
+        self._local.complete(keys)
+        self._shared.complete(keys)
+
+    def release(self, keys: List[str]) -> None:
+        self._local.release(keys)
+        self._shared.release(keys)
+
+    def statistics(self) -> dict:
+        return {**self._shared.statistics(), "local": self._local.statistics()}
+
+
+def create_dedupe_store(app_settings: Settings) -> Optional[IMessageDedupeStore]:
+    if app_settings.MESSAGE_DEDUPE_BACKEND == "none":
+        return None
+    local = InMemoryDedupeStore(app_settings.MESSAGE_DEDUPE_MAX_ENTRIES, app_settings.MESSAGE_DEDUPE_TTL_SECONDS)
+    if app_settings.MESSAGE_DEDUPE_BACKEND == "database":
+        return TieredDedupeStore(local, PostgresDBMessageDedupeRepository(app_settings.MESSAGE_DEDUPE_TTL_SECONDS))
+    return local
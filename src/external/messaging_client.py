@@ -1,4 +1,5 @@
 import json
+from typing import List
 
 import boto3
 from botocore.config import Config
@@ -13,25 +14,42 @@ sns_client = boto3.client('sns', config=my_config)
 
 class MessagingClient:
     @staticmethod
-    def receive(queue: str):
+    def receive(queue: str, max_messages: int, wait_time_seconds: int, visibility_timeout: int) -> List[dict]:
         response = sqs_client.receive_message(
             QueueUrl=queue,
             AttributeNames=[
-                'SentTimestamp'
+                'SentTimestamp',
+                'ApproximateReceiveCount'
             ],
-            MaxNumberOfMessages=1,
+            MaxNumberOfMessages=max_messages,
             MessageAttributeNames=[
                 'All'
             ],
-            VisibilityTimeout=0,
-            WaitTimeSeconds=5
+            VisibilityTimeout=visibility_timeout,
+            WaitTimeSeconds=wait_time_seconds
         )
 
-        if 'Messages' in response:
-            message = response['Messages'][0]
-            return message
-        else:
-            return None
+        return response.get('Messages', [])
+
+    @staticmethod
+    def delete_batch(queue: str, receipt_handles: List[str]) -> List[str]:
+        response = sqs_client.delete_message_batch(
+            QueueUrl=queue,
+            Entries=[
+                {'Id': str(index), 'ReceiptHandle': receipt_handle}
+                for index, receipt_handle in enumerate(receipt_handles)
+            ]
+        )
+
+        return [receipt_handles[int(failure['Id'])] for failure in response.get('Failed', [])]
+
+    @staticmethod
+    def change_visibility(queue: str, receipt_handle: str, visibility_timeout: int) -> None:
+        sqs_client.change_message_visibility(
+            QueueUrl=queue,
+            ReceiptHandle=receipt_handle,
+            VisibilityTimeout=visibility_timeout
+        )
 
     @staticmethod
     def send_event(topic: str, message: dict):
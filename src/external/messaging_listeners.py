@@ -1,94 +1,87 @@
+import asyncio
 import json
-import threading
-import time
+import uuid
 
-import httpx
+from starlette.concurrency import run_in_threadpool
 
 from src.config.config import settings
 
+from src.controllers.order_status_async_controller import AsyncOrderStatusController
 from src.controllers.order_status_controller import OrderStatusController
-from src.external.messaging_client import MessagingClient, sqs_client
+from src.external.message_consumer import MessageConsumer, notification_content
+from src.external.message_dedupe import create_dedupe_store
+from src.external.messaging_client import MessagingClient
+from src.external.service_clients import service_clients
 
 
-class PaymentConfirmationListener(threading.Thread):
-    def __init__(self):
-        super().__init__()
-        self.queue = settings.PAYMENT_CONFIRMATION_QUEUE
-        self.shutdown_flag = threading.Event()
+async def customer_phone(order_id: uuid.UUID) -> str:
+    r = await service_clients.orders.get(f"/orders/id/{order_id}")
+    json_response = json.loads(r.content)
 
-    def run(self, *args, **kwargs):
-        while not self.shutdown_flag.is_set():
-            message = MessagingClient().receive(self.queue)
-            if message is not None:
-                try:
-                    receipt_handle = message['ReceiptHandle']
-                    message_body = json.loads(message["Body"])
-                    content = json.loads(message_body["Message"])
+    customer_id = json_response["result"]["customerId"]
 
-                    OrderStatusController.change_order_status_in_progress(
-                        content["order_id"], content["payment_status"]
-                    )
+    r = await service_clients.customers.get(f"/customers/id/{customer_id}")
+    json_response = json.loads(r.content)
 
-                    sqs_client.delete_message(
-                        QueueUrl=self.queue,
-                        ReceiptHandle=receipt_handle
-                    )
+    return json_response["result"]["phone"]
 
-                    order_id = content["order_id"]
 
-                    r = httpx.get(f"{settings.ORDERS_SERVICE}/orders/id/{order_id}")
-                    json_response = json.loads(r.content)
+async def change_order_status_in_progress(order_id: uuid.UUID, payment_status: str) -> dict:
+    if settings.db.POSTGRES_ASYNC_ENABLED:
+        return await AsyncOrderStatusController.change_order_status_in_progress(order_id, payment_status)
+    # The sync controller blocks on the database, so it runs on a worker thread instead of the consumer's loop
+    return await run_in_threadpool(
+        lambda: asyncio.run(OrderStatusController.change_order_status_in_progress(order_id, payment_status))
+    )
 
-                    customer_id = json_response["result"]["customerId"]
 
-                    r = httpx.get(f"{settings.CUSTOMERS_SERVICE}/customers/id/{customer_id}")
-                    json_response = json.loads(r.content)
+def payment_confirmation_key(content: dict) -> str:
+    # A payment status is applied to an order only once, while payment errors repeat on every failed attempt
+    return f"{content['order_id']}:{content['payment_status']}"
 
-                    message = f"O pagamento do pedido {order_id} foi confirmado e o mesmo está sendo produzido"
 
-                    MessagingClient.send_sms(json_response["result"]["phone"], message)
+async def handle_payment_confirmation(message: dict) -> None:
+    content = notification_content(message)
+    order_id = uuid.UUID(content["order_id"])
 
-                    time.sleep(5)
-                except Exception as e:
-                    print(e)
+    await change_order_status_in_progress(order_id, content["payment_status"])
 
-            print("payment confirmation listener running")
+    # The status change is what counts, a failed notification must not bring the payment back for another run
+    try:
+        message = f"O pagamento do pedido {order_id} foi confirmado e o mesmo está sendo produzido"
+        await run_in_threadpool(MessagingClient.send_sms, await customer_phone(order_id), message)
+    except Exception as e:
+        print(e)
 
 
-class PaymentErrorListener(threading.Thread):
-    def __init__(self):
-        super().__init__()
-        self.queue = settings.PAYMENT_ERROR_QUEUE
-        self.shutdown_flag = threading.Event()
+async def handle_payment_error(message: dict) -> None:
+    content = notification_content(message)
+    order_id = uuid.UUID(content["order_id"])
 
-    def run(self, *args, **kwargs):
-        while not self.shutdown_flag.is_set():
-            message = MessagingClient().receive(self.queue)
-            if message is not None:
-                receipt_handle = message['ReceiptHandle']
-                message_body = json.loads(message["Body"])
-                content = json.loads(message_body["Message"])
+    notification = {
+        "order_id": str(order_id),
+        "message": "Houve um erro ao processar o pagamento, tente novamente"
+    }
 
-                order_id = content["order_id"]
+    await run_in_threadpool(MessagingClient.send_sms, await customer_phone(order_id), notification)
 
-                r = httpx.get(f"{settings.ORDERS_SERVICE}/orders/id/{order_id}")
-                json_response = json.loads(r.content)
 
-                customer_id = json_response["result"]["customerId"]
+def create_message_consumer() -> MessageConsumer:
+    consumer = MessageConsumer(
+        settings.SQS_MAX_CONCURRENCY,
+        settings.SQS_WAIT_TIME_SECONDS,
+        settings.SQS_VISIBILITY_TIMEOUT_SECONDS,
+        settings.SQS_ERROR_BACKOFF_SECONDS,
+        settings.SQS_ACK_FLUSH_SECONDS,
+        settings.SQS_MAX_PROCESSING_SECONDS,
+        create_dedupe_store(settings)
+    )
+    consumer.register(
+        settings.PAYMENT_CONFIRMATION_QUEUE, handle_payment_confirmation, "payment-confirmation",
+        payment_confirmation_key
+    )
+    consumer.register(settings.PAYMENT_ERROR_QUEUE, handle_payment_error, "payment-error")
+    return consumer
 
-                r = httpx.get(f"{settings.CUSTOMERS_SERVICE}/customers/id/{customer_id}")
-                json_response = json.loads(r.content)
 
-                notification = {
-                    "order_id": order_id,
-                    "message": "Houve um erro ao processar o pagamento, tente novamente"
-                }
-
-                MessagingClient.send_sms(json_response["result"]["phone"], notification)
-
-                sqs_client.delete_message(
-                    QueueUrl=self.queue,
-                    ReceiptHandle=receipt_handle
-                )
-            time.sleep(5)
-            print("payment error listener running")
+message_consumer = create_message_consumer()
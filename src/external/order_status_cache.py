@@ -0,0 +1,173 @@
+import dataclasses
+import datetime
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from src.config.config import settings, Settings
+from src.entities.models.order_status_entity import OrderStatus, order_status_factory
+from src.interfaces.gateways.cache_backend_interface import ICacheBackend
+
+
+class CacheCounters:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def statistics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class InMemoryCacheBackend(ICacheBackend):
+    def __init__(
+        self, max_entries: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[uuid.UUID, Tuple[float, OrderStatus]]" = OrderedDict()
+        self._counters = CacheCounters()
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, order_id: uuid.UUID) -> Optional[OrderStatus]:
+        with self._lock:
+            entry = self._entries.get(order_id)
+            if entry and entry[0] <= self._clock():
+                del self._entries[order_id]
+                self._expirations += 1
+                entry = None
+            if entry:
+                self._entries.move_to_end(order_id)
+        self._counters.record(entry is not None)
+        # Hand out copies, callers mutate entities while replaying transitions
+        return dataclasses.replace(entry[1]) if entry else None
+
+    def set(self, order_status: OrderStatus) -> None:
+        now = self._clock()
+        expires_at = now + self._ttl_seconds
+        with self._lock:
+            entry = self._entries.get(order_status.order_id)
+            # A reader that loaded the row before a concurrent write must not replace the newer version
+            if entry and entry[0] > now and entry[1].version > order_status.version:
+                return
+            self._entries[order_status.order_id] = (expires_at, dataclasses.replace(order_status))
+            self._entries.move_to_end(order_status.order_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, order_id: uuid.UUID) -> None:
+        with self._lock:
+            self._entries.pop(order_id, None)
+
+    def refresh(self, order_status: OrderStatus) -> None:
+        # Notified rows only replace older cached versions, late or echoed notifications leave newer entries alone
+        expires_at = self._clock() + self._ttl_seconds
+        with self._lock:
+            entry = self._entries.get(order_status.order_id)
+            if entry and entry[1].version < order_status.version:
+                self._entries[order_status.order_id] = (expires_at, dataclasses.replace(order_status))
+
+    def statistics(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "size": len(self._entries),
+                "maxEntries": self._max_entries,
+                "ttlSeconds": self._ttl_seconds,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                **self._counters.statistics(),
+            }
+
+
+class RedisCacheBackend(ICacheBackend):
+    # Bumped whenever the cached layout changes, entries written by older releases are then never read
+    KEY_PREFIX = "order-status:v2:"
+    # Compares versions inside Redis, a worker holding an older row cannot overwrite a newer one written by another
+    SET_IF_NOT_OLDER = """
+        local cached = redis.call('GET', KEYS[1])
+        if cached and cjson.decode(cached)[4] > tonumber(ARGV[2]) then
+            return 0
+        end
+        redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[3])
+        return 1
+    """
+
+    def __init__(self, redis_url: str, ttl_seconds: float, client=None) -> None:
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("CACHE_BACKEND=redis requires the redis package to be installed")
+            client = redis.Redis.from_url(redis_url)
+        self._client = client
+        self._set_if_not_older = client.register_script(self.SET_IF_NOT_OLDER)
+        self._ttl_milliseconds = int(ttl_seconds * 1000)
+        self._counters = CacheCounters()
+
+    def get(self, order_id: uuid.UUID) -> Optional[OrderStatus]:
+        cached = self._client.get(self.KEY_PREFIX + str(order_id))
+        self._counters.record(cached is not None)
+        if cached is None:
+            return None
+
+        order_id, creation_date, order_status, version = json.loads(cached)
+        return order_status_factory(
+            uuid.UUID(order_id), datetime.datetime.fromisoformat(creation_date), order_status, version
+        )
+
+    def set(self, order_status: OrderStatus) -> None:
+        cached = json.dumps([
+            str(order_status.order_id),
+            order_status.creation_date.isoformat(),
+            order_status.order_status,
+            order_status.version
+        ])
+        self._set_if_not_older(
+            keys=[self.KEY_PREFIX + str(order_status.order_id)],
+            args=[cached, order_status.version, self._ttl_milliseconds]
+        )
+
+    def delete(self, order_id: uuid.UUID) -> None:
+        self._client.delete(self.KEY_PREFIX + str(order_id))
+
+    def statistics(self) -> dict:
+        return {
+            "backend": "redis",
+            "ttlSeconds": self._ttl_milliseconds / 1000,
+            **self._counters.statistics(),
+        }
+
+
+def create_cache_backend(app_settings: Settings) -> Optional[ICacheBackend]:
+    if app_settings.CACHE_BACKEND == "memory":
+        return InMemoryCacheBackend(app_settings.CACHE_MAX_ENTRIES, app_settings.CACHE_TTL_SECONDS)
+    if app_settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(app_settings.CACHE_REDIS_URL, app_settings.CACHE_TTL_SECONDS)
+    return None
+
+
+def cache_statistics() -> dict:
+    return order_status_cache.statistics() if order_status_cache else {"backend": "none"}
+
+
+order_status_cache = create_cache_backend(settings)
@@ -0,0 +1,140 @@
+import asyncio
+import datetime
+import json
+import select
+import threading
+import uuid
+from typing import Dict, Optional, Set, Tuple
+
+import psycopg2
+
+from src.config.config import settings
+from src.entities.models.order_status_entity import OrderStatus, order_status_factory
+from src.external.order_status_cache import order_status_cache, InMemoryCacheBackend
+from src.usecases.kitchen_board import kitchen_board
+
+# Must match the channel used by the notify_order_status trigger in create_tables.sql
+ORDER_STATUS_CHANNEL = "order_status"
+
+
+class Subscription:
+    def __init__(self, order_id: Optional[uuid.UUID], max_queue_size: int) -> None:
+        self.order_id = order_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.loop = asyncio.get_running_loop()
+        self.dropped = 0
+
+    def deliver(self, order_status: OrderStatus) -> None:
+        # A slow client loses its oldest pending update rather than stalling the fan out
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(order_status)
+
+
+class OrderStatusHub:
+    def __init__(self, max_queue_size: int) -> None:
+        self._max_queue_size = max_queue_size
+        self._lock = threading.Lock()
+        # None keys the subscribers of the whole ongoing board
+        self._subscriptions: Dict[Optional[uuid.UUID], Set[Subscription]] = {}
+        self._published = 0
+
+    def subscribe(self, order_id: Optional[uuid.UUID] = None) -> Subscription:
+        subscription = Subscription(order_id, self._max_queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(order_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.order_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.order_id, None)
+
+    def publish(self, order_status: OrderStatus) -> None:
+        with self._lock:
+            self._published += 1
+            subscriptions = [
+                *self._subscriptions.get(order_status.order_id, ()),
+                *self._subscriptions.get(None, ()),
+            ]
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(subscription.deliver, order_status)
+
+    def statistics(self) -> dict:
+        with self._lock:
+            return {
+                "orderSubscribers": sum(len(subs) for key, subs in self._subscriptions.items() if key is not None),
+                "boardSubscribers": len(self._subscriptions.get(None, ())),
+                "published": self._published,
+            }
+
+
+def parse_notification(payload: str) -> Tuple[uuid.UUID, Optional[OrderStatus]]:
+    # Deleted rows, removed or moved to the archive, come without an order status
+    notification = json.loads(payload)
+    order_id = uuid.UUID(notification["order_id"])
+    if notification.get("deleted"):
+        return order_id, None
+    return order_id, order_status_factory(
+        order_id,
+        datetime.datetime.fromisoformat(notification["creation_date"]),
+        notification["order_status"],
+        notification["version"],
+    )
+
+
+class OrderStatusNotificationListener(threading.Thread):
+    def __init__(self, hub: OrderStatusHub):
+        super().__init__()
+        self.hub = hub
+        self.shutdown_flag = threading.Event()
+
+    def run(self, *args, **kwargs):
+        while not self.shutdown_flag.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                print(e)
+                self.shutdown_flag.wait(settings.PUSH_RECONNECT_SECONDS)
+
+    def _listen(self) -> None:
+        connection = psycopg2.connect(str(settings.db.SQLALCHEMY_DATABASE_URI))
+        try:
+            connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            connection.cursor().execute(f"LISTEN {ORDER_STATUS_CHANNEL}")
+            # Anything published while we were disconnected is lost, so the board has to reload
+            if kitchen_board:
+                kitchen_board.invalidate()
+
+            while not self.shutdown_flag.is_set():
+                if select.select([connection], [], [], 1.0) == ([], [], []):
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    order_id, order_status = parse_notification(connection.notifies.pop(0).payload)
+                    if order_status is None:
+                        self.dispatch_removal(order_id)
+                    else:
+                        self.dispatch(order_status)
+        finally:
+            connection.close()
+
+    def dispatch(self, order_status: OrderStatus) -> None:
+        # Keeps this worker's in-process state in line with writes made by the other workers
+        if kitchen_board:
+            kitchen_board.apply(order_status)
+        if isinstance(order_status_cache, InMemoryCacheBackend):
+            order_status_cache.refresh(order_status)
+        self.hub.publish(order_status)
+
+    def dispatch_removal(self, order_id: uuid.UUID) -> None:
+        if kitchen_board:
+            kitchen_board.remove(order_id)
+        if isinstance(order_status_cache, InMemoryCacheBackend):
+            order_status_cache.delete(order_id)
+
+
+order_status_hub = OrderStatusHub(settings.PUSH_SUBSCRIBER_QUEUE_SIZE)
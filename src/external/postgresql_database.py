@@ -1,9 +1,20 @@
-from typing import Generator, Dict, Any
+import contextlib
+import contextvars
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Generator, Dict, Any, Callable, Iterable, Iterator, Optional
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.engine import Engine, Connection
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession, AsyncConnection
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 
-from src.config.config import settings
+from src.config.config import settings, PostgresDBSettings
+from src.utils.deadline import remaining_seconds
 
 
 class_registry: Dict = {}
@@ -20,13 +31,247 @@ class Base:
         return cls.__name__.lower()
 
 
+class PoolStatisticsMixin:
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._checkout_timeouts = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._checkout_timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self._checkouts += 1
+                self._wait_time_total += elapsed
+                self._wait_time_max = max(self._wait_time_max, elapsed)
+
+    def statistics(self) -> dict:
+        with self._stats_lock:
+            checkouts = self._checkouts
+            return {
+                "size": self.size(),
+                "checkedOut": self.checkedout(),
+                "idle": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "maxOverflow": self._max_overflow,
+                "checkouts": checkouts,
+                "checkoutTimeouts": self._checkout_timeouts,
+                "waitTimeAvgMs": round(self._wait_time_total / checkouts * 1000, 3) if checkouts else 0.0,
+                "waitTimeMaxMs": round(self._wait_time_max * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(PoolStatisticsMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(PoolStatisticsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_options(db_settings: PostgresDBSettings) -> Dict[str, Any]:
+    return {
+        "pool_size": db_settings.POSTGRES_POOL_SIZE,
+        "max_overflow": db_settings.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": db_settings.POSTGRES_POOL_TIMEOUT,
+        "pool_pre_ping": db_settings.POSTGRES_POOL_PRE_PING,
+        "pool_recycle": db_settings.POSTGRES_POOL_RECYCLE,
+    }
+
+
+def _application_name(db_settings: PostgresDBSettings) -> str:
+    # Tags every connection with the pod hostname so pg_stat_activity shows which pool owns it
+    return f"{db_settings.POSTGRES_APPLICATION_NAME}-{socket.gethostname()}"[:63]
+
+
+def bound_statements_by_deadline(engine: Engine, default_timeout_ms: int) -> None:
+    @event.listens_for(engine, "begin")
+    def set_statement_timeout(connection: Connection) -> None:
+        remaining = remaining_seconds()
+        if remaining is None:
+            return
+        timeout_ms = max(int(remaining * 1000), 1)
+        if default_timeout_ms and timeout_ms >= default_timeout_ms:
+            return
+        # SET LOCAL ends with the transaction, so the connection goes back to the pool without it
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
+def create_db_engine(db_settings: PostgresDBSettings, connection_uri: str) -> Engine:
+    options = f"-c application_name={_application_name(db_settings)}"
+    if db_settings.POSTGRES_STATEMENT_TIMEOUT_MS:
+        options += f" -c statement_timeout={db_settings.POSTGRES_STATEMENT_TIMEOUT_MS}"
+
+    engine = create_engine(
+        connection_uri,
+        poolclass=InstrumentedQueuePool,
+        connect_args={"options": options},
+        **_pool_options(db_settings)
+    )
+    bound_statements_by_deadline(engine, db_settings.POSTGRES_STATEMENT_TIMEOUT_MS)
+    return engine
+
+
+def create_async_db_engine(db_settings: PostgresDBSettings, connection_uri: str) -> AsyncEngine:
+    server_settings = {"application_name": _application_name(db_settings)}
+    if db_settings.POSTGRES_STATEMENT_TIMEOUT_MS:
+        server_settings["statement_timeout"] = str(db_settings.POSTGRES_STATEMENT_TIMEOUT_MS)
+
+    engine = create_async_engine(
+        connection_uri,
+        poolclass=InstrumentedAsyncQueuePool,
+        connect_args={"server_settings": server_settings},
+        **_pool_options(db_settings)
+    )
+    bound_statements_by_deadline(engine.sync_engine, db_settings.POSTGRES_STATEMENT_TIMEOUT_MS)
+    return engine
+
+
+_read_from_primary: contextvars.ContextVar = contextvars.ContextVar("read_from_primary", default=False)
+
+
+@contextlib.contextmanager
+def read_from_primary() -> Iterator[None]:
+    token = _read_from_primary.set(True)
+    try:
+        yield
+    finally:
+        _read_from_primary.reset(token)
+
+
+class ReadRouter:
+    def __init__(
+        self, has_replica: bool, read_your_writes_seconds: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._has_replica = has_replica
+        self._read_your_writes_seconds = read_your_writes_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Orders written by this process recently, oldest first, read from the primary until the replica catches up
+        self._recent_writes: "OrderedDict[uuid.UUID, float]" = OrderedDict()
+        self._counters = {"primaryReads": 0, "replicaReads": 0, "pinnedReads": 0, "forcedPrimaryReads": 0, "writes": 0}
+
+    def record_writes(self, order_ids: Iterable[uuid.UUID]) -> None:
+        if not self._has_replica:
+            return
+        now = self._clock()
+        with self._lock:
+            for order_id in order_ids:
+                self._recent_writes[order_id] = now
+                self._recent_writes.move_to_end(order_id)
+                self._counters["writes"] += 1
+            self._expire_writes(now)
+
+    def use_replica(self, order_id: Optional[uuid.UUID] = None) -> bool:
+        with self._lock:
+            if not self._has_replica:
+                decision = "primaryReads"
+            elif _read_from_primary.get():
+                decision = "forcedPrimaryReads"
+            elif order_id is not None and self._recently_written(order_id):
+                decision = "pinnedReads"
+            else:
+                decision = "replicaReads"
+            self._counters[decision] += 1
+        return decision == "replicaReads"
+
+    def statistics(self) -> dict:
+        with self._lock:
+            self._expire_writes(self._clock())
+            return {
+                "replicaConfigured": self._has_replica,
+                "readYourWritesSeconds": self._read_your_writes_seconds,
+                "pinnedOrders": len(self._recent_writes),
+                **self._counters,
+            }
+
+    def _recently_written(self, order_id: uuid.UUID) -> bool:
+        written_at = self._recent_writes.get(order_id)
+        return written_at is not None and self._clock() - written_at < self._read_your_writes_seconds
+
+    def _expire_writes(self, now: float) -> None:
+        while self._recent_writes:
+            order_id, written_at = next(iter(self._recent_writes.items()))
+            if now - written_at < self._read_your_writes_seconds:
+                break
+            del self._recent_writes[order_id]
+
+
+def read_session(order_id: Optional[uuid.UUID] = None) -> Session:
+    return ReplicaSessionLocal() if read_router.use_replica(order_id) else SessionLocal()
+
+
+def async_read_session(order_id: Optional[uuid.UUID] = None) -> AsyncSession:
+    return AsyncReplicaSessionLocal() if read_router.use_replica(order_id) else AsyncSessionLocal()
+
+
+def read_connection(order_id: Optional[uuid.UUID] = None) -> Connection:
+    return (replica_engine if read_router.use_replica(order_id) else engine).connect()
+
+
+def async_read_connection(order_id: Optional[uuid.UUID] = None) -> AsyncConnection:
+    return (async_replica_engine if read_router.use_replica(order_id) else async_engine).connect()
+
+
+def pool_statistics() -> dict:
+    statistics = {
+        "sync": engine.pool.statistics(),
+        "async": async_engine.pool.statistics(),
+    }
+    if replica_engine is not engine:
+        statistics["syncReplica"] = replica_engine.pool.statistics()
+    if async_replica_engine is not async_engine:
+        statistics["asyncReplica"] = async_replica_engine.pool.statistics()
+    return statistics
+
+
+def replica_statistics() -> dict:
+    statistics = {**read_router.statistics(), "lagSeconds": None}
+    if replica_engine is not engine:
+        # NULL on a server that is not replaying WAL, e.g. a plain second database in development
+        with replica_engine.connect() as connection:
+            statistics["lagSeconds"] = connection.execute(
+                text("select extract(epoch from now() - pg_last_xact_replay_timestamp())")
+            ).scalar()
+    return statistics
+
+
 connection_uri = settings.db.SQLALCHEMY_DATABASE_URI
 
-engine = create_engine(
-    connection_uri
-)
+engine = create_db_engine(settings.db, connection_uri)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_db_engine(settings.db, settings.db.SQLALCHEMY_ASYNC_DATABASE_URI)
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False, bind=async_engine)
+
+replica_engine = engine
+ReplicaSessionLocal = SessionLocal
+if settings.db.SQLALCHEMY_REPLICA_DATABASE_URI:
+    replica_engine = create_db_engine(settings.db, settings.db.SQLALCHEMY_REPLICA_DATABASE_URI)
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
+async_replica_engine = async_engine
+AsyncReplicaSessionLocal = AsyncSessionLocal
+if settings.db.SQLALCHEMY_ASYNC_REPLICA_DATABASE_URI:
+    async_replica_engine = create_async_db_engine(settings.db, settings.db.SQLALCHEMY_ASYNC_REPLICA_DATABASE_URI)
+    AsyncReplicaSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False, bind=async_replica_engine)
+
+# Shared by both stacks, the payment listeners write through the sync gateway while the API may read async
+read_router = ReadRouter(
+    replica_engine is not engine or async_replica_engine is not async_engine,
+    settings.db.POSTGRES_READ_YOUR_WRITES_SECONDS
+)
+
 
 def get_db() -> Generator:
     db = SessionLocal()
@@ -0,0 +1,217 @@
+import asyncio
+import time
+from typing import Optional
+
+import httpx
+
+from src.config.config import settings, Settings
+from src.config.errors import ServiceUnavailable
+from src.external.circuit_breaker import CircuitBreaker, CLOSED
+from src.utils.deadline import remaining_seconds
+
+
+class ServiceClient:
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        timeout_seconds: float,
+        connect_timeout_seconds: float,
+        max_connections: int,
+        keepalive_expiry_seconds: float,
+        breaker: CircuitBreaker,
+        hedge_delay_seconds: float = 0,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ) -> None:
+        self.name = name
+        self.base_url = base_url
+        self._timeout_seconds = timeout_seconds
+        self._connect_timeout_seconds = connect_timeout_seconds
+        self._timeout = httpx.Timeout(timeout_seconds, connect=connect_timeout_seconds)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry_seconds
+        )
+        self.breaker = breaker
+        self._hedge_delay_seconds = hedge_delay_seconds
+        self._http2 = http2
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self.requests = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def start(self) -> None:
+        if self._client is not None:
+            return
+        try:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url, timeout=self._timeout, limits=self._limits,
+                http2=self._http2, transport=self._transport
+            )
+        except ImportError:
+            raise RuntimeError("HTTP_CLIENT_HTTP2_ENABLED requires the h2 package to be installed")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _attempt_timeout(self) -> httpx.Timeout:
+        remaining = remaining_seconds()
+        if remaining is None:
+            return self._timeout
+        if remaining <= 0:
+            raise ServiceUnavailable.deadline_exceeded(self.name)
+        # No single call may outlive the request that is waiting for it
+        timeout = min(self._timeout_seconds, remaining)
+        return httpx.Timeout(timeout, connect=min(self._connect_timeout_seconds, timeout))
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        timeout = self._attempt_timeout()
+        if not self.breaker.allow():
+            raise ServiceUnavailable.circuit_open(self.name)
+        # Also serves callers running before startup, e.g. scripts and tests
+        self.start()
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        start = time.monotonic()
+        try:
+            response = await self._client.request(method, path, timeout=timeout, **kwargs)
+        except httpx.TransportError as e:
+            self.failed += 1
+            self.breaker.record_failure()
+            raise ServiceUnavailable.request_failed(self.name) from e
+        except asyncio.CancelledError:
+            self.breaker.record_cancelled()
+            raise
+        finally:
+            latency = time.monotonic() - start
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
+            self.in_flight -= 1
+
+        if response.status_code >= 500:
+            self.failed += 1
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        if not self._hedge_delay_seconds:
+            return await self.request("GET", path, **kwargs)
+        return await self._hedged_get(path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    async def _hedged_get(self, path: str, **kwargs) -> httpx.Response:
+        first = asyncio.ensure_future(self.request("GET", path, **kwargs))
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self._hedge_delay_seconds)
+            # Only a healthy service gets the extra load, a struggling one is left to the breaker
+            if done or self.breaker.state != CLOSED:
+                return await first
+
+            # GETs are idempotent, so a slow one is raced against a second copy and the first answer wins
+            self.hedges += 1
+            second = asyncio.ensure_future(self.request("GET", path, **kwargs))
+            pending = {first, second}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        self.hedge_wins += attempt is second
+                        return attempt.result()
+            return first.result()
+        finally:
+            for attempt in pending:
+                attempt.cancel()
+
+    def statistics(self) -> dict:
+        return {
+            "service": self.name,
+            "http2": self._http2,
+            "timeoutSeconds": self._timeout.read,
+            "maxConnections": self._limits.max_connections,
+            "requests": self.requests,
+            "failed": self.failed,
+            "inFlight": self.in_flight,
+            "peakInFlight": self.peak_in_flight,
+            "poolUsage": round(self.in_flight / self._limits.max_connections, 4),
+            "latencyAvgMs": round(self._latency_total / self.requests * 1000, 3) if self.requests else 0.0,
+            "latencyMaxMs": round(self._latency_max * 1000, 3),
+            "hedges": self.hedges,
+            "hedgeWins": self.hedge_wins,
+            "breaker": self.breaker.statistics(),
+        }
+
+
+class ServiceClients:
+    def __init__(self, payments: ServiceClient, orders: ServiceClient, customers: ServiceClient) -> None:
+        self.payments = payments
+        self.orders = orders
+        self.customers = customers
+
+    def _all(self):
+        return self.payments, self.orders, self.customers
+
+    def start(self) -> None:
+        for client in self._all():
+            client.start()
+
+    async def close(self) -> None:
+        for client in self._all():
+            await client.close()
+
+    def statistics(self) -> dict:
+        return {client.name: client.statistics() for client in self._all()}
+
+
+def create_service_client(app_settings: Settings, name: str, base_url: str, timeout_seconds: float,
+                          max_connections: int) -> ServiceClient:
+    return ServiceClient(
+        name,
+        base_url,
+        timeout_seconds,
+        app_settings.HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS,
+        max_connections,
+        app_settings.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS,
+        CircuitBreaker(
+            app_settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            app_settings.CIRCUIT_BREAKER_RESET_TIMEOUT_SECONDS,
+            app_settings.CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS
+        ),
+        app_settings.HTTP_CLIENT_HEDGE_DELAY_SECONDS,
+        app_settings.HTTP_CLIENT_HTTP2_ENABLED
+    )
+
+
+def create_service_clients(app_settings: Settings) -> ServiceClients:
+    return ServiceClients(
+        create_service_client(
+            app_settings, "payments", app_settings.PAYMENTS_SERVICE,
+            app_settings.PAYMENTS_SERVICE_TIMEOUT_SECONDS, app_settings.PAYMENTS_SERVICE_MAX_CONNECTIONS
+        ),
+        create_service_client(
+            app_settings, "orders", app_settings.ORDERS_SERVICE,
+            app_settings.ORDERS_SERVICE_TIMEOUT_SECONDS, app_settings.ORDERS_SERVICE_MAX_CONNECTIONS
+        ),
+        create_service_client(
+            app_settings, "customers", app_settings.CUSTOMERS_SERVICE,
+            app_settings.CUSTOMERS_SERVICE_TIMEOUT_SECONDS, app_settings.CUSTOMERS_SERVICE_MAX_CONNECTIONS
+        ),
+    )
+
+
+service_clients = create_service_clients(settings)
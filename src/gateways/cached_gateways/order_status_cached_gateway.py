@@ -0,0 +1,89 @@
+import datetime
+import uuid
+from typing import List, Optional, Tuple, Iterator
+
+from src.entities.models.order_status_entity import OrderStatus, OrderStatusProjection, Status
+from src.interfaces.gateways.cache_backend_interface import ICacheBackend
+from src.interfaces.gateways.order_status_gateway_interface import IOrderStatusGateway
+
+
+class CachedOrderStatusRepository(IOrderStatusGateway):
+    def __init__(self, order_status_repo: IOrderStatusGateway, cache: ICacheBackend) -> None:
+        self._order_status_repo = order_status_repo
+        self._cache = cache
+
+    def get_by_id(self, order_id: uuid.UUID) -> Optional[OrderStatus]:
+        order_status = self._cache.get(order_id)
+        if order_status is None:
+            order_status = self._order_status_repo.get_by_id(order_id)
+            if order_status:
+                self._cache.set(order_status)
+        return order_status
+
+    def get_order_status(self, order_id: uuid.UUID) -> Optional[OrderStatusProjection]:
+        # Served from a cached entity when there is one, misses take the projection query and are not cached
+        order_status = self._cache.get(order_id)
+        if order_status is None:
+            return self._order_status_repo.get_order_status(order_id)
+        return OrderStatusProjection(order_status.order_id, order_status.order_status)
+
+    def get_many(self, order_ids: List[uuid.UUID]) -> List[OrderStatus]:
+        return self._order_status_repo.get_many(order_ids)
+
+    def get_all(
+        self, limit: Optional[int] = None, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None
+    ) -> List[OrderStatus]:
+        return self._order_status_repo.get_all(limit, after)
+
+    def stream_orders(
+        self,
+        order_status: Optional[Status],
+        start_date: Optional[datetime.datetime],
+        end_date: Optional[datetime.datetime],
+        batch_size: int
+    ) -> Iterator[OrderStatus]:
+        return self._order_status_repo.stream_orders(order_status, start_date, end_date, batch_size)
+
+    def list_ongoing_orders(self) -> List[OrderStatus]:
+        return self._order_status_repo.list_ongoing_orders()
+
+    def create_order_status(self, order_in: OrderStatus) -> OrderStatus:
+        new_order = self._order_status_repo.create_order_status(order_in)
+        self._cache.set(new_order)
+        return new_order
+
+    def create_many(self, orders_in: List[OrderStatus]) -> List[OrderStatus]:
+        created_orders = self._order_status_repo.create_many(orders_in)
+        for order in created_orders:
+            self._cache.set(order)
+        return created_orders
+
+    def update(self, order_id: uuid.UUID, order_in: OrderStatus) -> OrderStatus:
+        self._cache.delete(order_id)
+        updated_order = self._order_status_repo.update(order_id, order_in)
+        self._cache.set(updated_order)
+        return updated_order
+
+    def transition(self, order_id: uuid.UUID, from_status: Status, to_status: Status) -> Optional[OrderStatus]:
+        updated_order = self._order_status_repo.transition(order_id, from_status, to_status)
+        if updated_order:
+            self._cache.set(updated_order)
+        else:
+            # A rejected transition may mean the cached row is stale, so the error path must read the database
+            self._cache.delete(order_id)
+        return updated_order
+
+    def transition_many(
+        self, order_ids: List[uuid.UUID], from_status: Status, to_status: Status
+    ) -> List[OrderStatus]:
+        updated_orders = self._order_status_repo.transition_many(order_ids, from_status, to_status)
+        for order in updated_orders:
+            self._cache.set(order)
+        return updated_orders
+
+    def archive_finalized(self, finalized_before: datetime.datetime, batch_size: int) -> int:
+        return self._order_status_repo.archive_finalized(finalized_before, batch_size)
+
+    def remove_order_status(self, order_id: uuid.UUID) -> None:
+        self._order_status_repo.remove_order_status(order_id)
+        self._cache.delete(order_id)
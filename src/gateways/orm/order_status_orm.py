@@ -1,9 +1,35 @@
-from sqlalchemy import Column, UUID, String, func, DateTime
+from sqlalchemy import Column, UUID, func, DateTime, Index, SmallInteger, Integer
 
+from src.entities.models.order_status_entity import Status
 from src.external.postgresql_database import Base
 
 
 class Orders_Status(Base):
     order_id = Column(UUID, primary_key=True, index=True)
     creation_date = Column(DateTime(timezone=True), server_default=func.now())
-    order_status = Column(String(30), nullable=False)
+    order_status = Column(SmallInteger, nullable=False)
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __table_args__ = (
+        Index("ix_orders_status_creation_date_order_id", "creation_date", "order_id"),
+        Index("ix_orders_status_order_id_status", "order_id", postgresql_include=["order_status"]),
+        # Only ongoing orders are indexed, so the kitchen board index stays proportional to active orders
+        Index(
+            "ix_orders_status_ongoing_board",
+            order_status.desc(), creation_date,
+            postgresql_include=["order_id", "version"],
+            postgresql_where=order_status.between(int(Status.CONFIRMED), int(Status.READY)),
+        ),
+    )
+
+
+class Orders_Status_Archive(Base):
+    order_id = Column(UUID, primary_key=True, index=True)
+    creation_date = Column(DateTime(timezone=True), nullable=False)
+    order_status = Column(SmallInteger, nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __table_args__ = (
+        Index("ix_orders_status_archive_creation_date_order_id", "creation_date", "order_id"),
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, DateTime, Index, Boolean
+
+from src.external.postgresql_database import Base
+
+
+class Processed_Messages(Base):
+    dedupe_key = Column(String(200), primary_key=True)
+    processed = Column(Boolean, nullable=False, server_default="false")
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_processed_messages_expires_at", "expires_at"),
+    )
@@ -0,0 +1,90 @@
+import datetime
+import threading
+from typing import List
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from src.external.postgresql_database import SessionLocal
+from src.gateways.orm.processed_message_orm import Processed_Messages as ProcessedMessageORM
+from src.interfaces.gateways.message_dedupe_interface import IMessageDedupeStore, CLAIMED, IN_PROGRESS, PROCESSED
+
+
+class PostgresDBMessageDedupeRepository(IMessageDedupeStore):
+    def __init__(self, ttl_seconds: float) -> None:
+        self._ttl = datetime.timedelta(seconds=ttl_seconds)
+        self._lock = threading.Lock()
+        self._claims = 0
+        self._duplicates = 0
+        self._in_progress = 0
+
+    def claim(self, keys: List[str], lease_seconds: float) -> str:
+        # Lapsed leases and processed keys past the ttl are taken over, so the table never has to be purged for
+        # claims to work
+        expires_at = func.now() + datetime.timedelta(seconds=lease_seconds)
+        statement = insert(ProcessedMessageORM)\
+            .values([{"dedupe_key": key, "processed": False, "expires_at": expires_at} for key in keys])
+        statement = statement\
+            .on_conflict_do_update(
+                index_elements=[ProcessedMessageORM.dedupe_key],
+                set_={"processed": False, "expires_at": statement.excluded.expires_at},
+                where=ProcessedMessageORM.expires_at < func.now()
+            )\
+            .returning(ProcessedMessageORM.dedupe_key)
+
+        with SessionLocal() as db:
+            if len(db.execute(statement).all()) == len(keys):
+                db.commit()
+                outcome = CLAIMED
+            else:
+                db.rollback()
+                processed = db.execute(
+                    select(func.bool_or(ProcessedMessageORM.processed)).where(
+                        ProcessedMessageORM.dedupe_key.in_(keys), ProcessedMessageORM.expires_at >= func.now()
+                    )
+                ).scalar_one()
+                outcome = PROCESSED if processed else IN_PROGRESS
+
+        with self._lock:
+            self._claims += 1
+            self._duplicates += outcome == PROCESSED
+            self._in_progress += outcome == IN_PROGRESS
+        return outcome
+
+    def extend(self, keys: List[str], lease_seconds: float) -> None:
+        with SessionLocal() as db:
+            db.execute(
+                update(ProcessedMessageORM)
+                .where(ProcessedMessageORM.dedupe_key.in_(keys), ProcessedMessageORM.processed.is_(False))
+                .values(expires_at=func.now() + datetime.timedelta(seconds=lease_seconds))
+            )
+            db.commit()
+
+    def complete(self, keys: List[str]) -> None:
+        statement = insert(ProcessedMessageORM)\
+            .values([{"dedupe_key": key, "processed": True, "expires_at": func.now() + self._ttl} for key in keys])
+        statement = statement.on_conflict_do_update(
+            index_elements=[ProcessedMessageORM.dedupe_key],
+            set_={"processed": True, "expires_at": statement.excluded.expires_at}
+        )
+        with SessionLocal() as db:
+            db.execute(statement)
+            db.commit()
+
+    def release(self, keys: List[str]) -> None:
+        with SessionLocal() as db:
+            db.execute(
+                delete(ProcessedMessageORM)
+                .where(ProcessedMessageORM.dedupe_key.in_(keys), ProcessedMessageORM.processed.is_(False))
+            )
+            db.commit()
+
+    def statistics(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "database",
+                "ttlSeconds": self._ttl.total_seconds(),
+                "claims": self._claims,
+                "duplicates": self._duplicates,
+                "inProgress": self._in_progress,
+            }
@@ -0,0 +1,145 @@
+import dataclasses
+import datetime
+import uuid
+from typing import List, Optional, Tuple, AsyncIterator
+from sqlalchemy import delete
+
+from src.config.errors import ConcurrencyError
+from src.entities.models.order_status_entity import order_status_factory, OrderStatus, OrderStatusProjection, \
+    Status
+from src.external.postgresql_database import AsyncSessionLocal, async_read_session, read_router
+from src.gateways.orm.order_status_orm import Orders_Status as OrderStatusORM
+from src.gateways.postgres_gateways.order_status_statements import bulk_insert_statement, export_statement, \
+    ongoing_statement, page_statement, select_many_statement, transition_statement, transition_many_statement, \
+    lookup_statement, archive_statement, remove_archived_statement, update_statement, \
+    status_statement
+from src.interfaces.gateways.order_status_async_gateway_interface import IAsyncOrderStatusGateway
+
+
+class PostgresDBAsyncOrderStatusRepository(IAsyncOrderStatusGateway):
+    @staticmethod
+    def to_entity(order_status: OrderStatusORM) -> OrderStatus:
+        order_status_entity = order_status_factory(
+            order_status.order_id,
+            order_status.creation_date,
+            order_status.order_status,
+            order_status.version,
+        )
+        return order_status_entity
+
+    async def get_by_id(self, order_id: uuid.UUID) -> Optional[OrderStatus]:
+        async with async_read_session(order_id) as db:
+            row = (await db.execute(lookup_statement(order_id))).first()
+        if row:
+            return order_status_factory(*row)
+        else:
+            return None
+
+    async def get_order_status(self, order_id: uuid.UUID) -> Optional[OrderStatusProjection]:
+        async with async_read_session(order_id) as db:
+            row = (await db.execute(status_statement(order_id))).first()
+        if row:
+            return OrderStatusProjection(*row)
+        else:
+            return None
+
+    async def get_many(self, order_ids: List[uuid.UUID]) -> List[OrderStatus]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select_many_statement(order_ids))
+            return [order_status_factory(*row) for row in result]
+
+    async def get_all(
+        self, limit: Optional[int] = None, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None
+    ) -> List[OrderStatus]:
+        async with async_read_session() as db:
+            result = await db.execute(page_statement(limit, after))
+            return [order_status_factory(*row) for row in result]
+
+    async def stream_orders(
+        self,
+        order_status: Optional[Status],
+        start_date: Optional[datetime.datetime],
+        end_date: Optional[datetime.datetime],
+        batch_size: int
+    ) -> AsyncIterator[OrderStatus]:
+        statement = export_statement(order_status, start_date, end_date).execution_options(yield_per=batch_size)
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(statement)
+            async for row in result:
+                yield order_status_factory(*row)
+
+    async def list_ongoing_orders(self) -> List[OrderStatus]:
+        async with async_read_session() as db:
+            result = await db.execute(ongoing_statement())
+            return [order_status_factory(*row) for row in result]
+
+    async def create_order_status(self, obj_in: OrderStatus) -> OrderStatus:
+        # asyncpg expects native datetime/uuid values, so skip the JSON encoding the sync gateway does
+        db_obj = OrderStatusORM(**dataclasses.asdict(obj_in))  # type: ignore
+
+        read_router.record_writes([obj_in.order_id])
+        async with AsyncSessionLocal() as db:
+            db.add(db_obj)
+            await db.commit()
+            await db.refresh(db_obj)
+
+        new_order = self.to_entity(db_obj)
+        return new_order
+
+    async def create_many(self, orders_in: List[OrderStatus]) -> List[OrderStatus]:
+        if not orders_in:
+            return []
+
+        read_router.record_writes([order.order_id for order in orders_in])
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(bulk_insert_statement(), [dataclasses.asdict(order) for order in orders_in])
+            rows = result.all()
+            await db.commit()
+
+        return [order_status_factory(*row) for row in rows]
+
+    async def update(self, order_id: uuid.UUID, obj_in: OrderStatus) -> OrderStatus:
+        read_router.record_writes([order_id])
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(update_statement(order_id, obj_in.order_status, obj_in.version))
+            row = result.first()
+            await db.commit()
+
+        if not row:
+            raise ConcurrencyError.version_conflict(order_id)
+        return order_status_factory(*row)
+
+    async def transition(self, order_id: uuid.UUID, from_status: Status, to_status: Status) -> Optional[OrderStatus]:
+        read_router.record_writes([order_id])
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(transition_statement(order_id, from_status, to_status))
+            row = result.first()
+            await db.commit()
+
+        if row:
+            return order_status_factory(*row)
+        else:
+            return None
+
+    async def transition_many(
+        self, order_ids: List[uuid.UUID], from_status: Status, to_status: Status
+    ) -> List[OrderStatus]:
+        read_router.record_writes(order_ids)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(transition_many_statement(order_ids, from_status, to_status))
+            rows = result.all()
+            await db.commit()
+        return [order_status_factory(*row) for row in rows]
+
+    async def archive_finalized(self, finalized_before: datetime.datetime, batch_size: int) -> int:
+        async with AsyncSessionLocal() as db:
+            archived = (await db.execute(archive_statement(finalized_before, batch_size))).scalar_one()
+            await db.commit()
+        return archived
+
+    async def remove_order_status(self, order_id: uuid.UUID) -> None:
+        read_router.record_writes([order_id])
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(OrderStatusORM).where(OrderStatusORM.order_id == order_id))
+            await db.execute(remove_archived_statement(order_id))
+            await db.commit()
@@ -0,0 +1,31 @@
+import uuid
+from typing import List, Optional
+
+from src.entities.models.order_status_entity import order_status_factory, OrderStatus, OrderStatusProjection
+from src.external.postgresql_database import read_connection
+from src.gateways.postgres_gateways.order_status_gateway import PostgresDBOrderStatusRepository
+from src.gateways.postgres_gateways.order_status_statements import LOOKUP_BY_ID_STATEMENT, ONGOING_ORDERS_STATEMENT, \
+    STATUS_BY_ID_STATEMENT
+
+
+class PostgresDBCoreOrderStatusRepository(PostgresDBOrderStatusRepository):
+    def get_by_id(self, order_id: uuid.UUID) -> Optional[OrderStatus]:
+        with read_connection(order_id) as connection:
+            row = connection.execute(LOOKUP_BY_ID_STATEMENT, {"order_id": order_id}).first()
+        if row:
+            return order_status_factory(*row)
+        else:
+            return None
+
+    def get_order_status(self, order_id: uuid.UUID) -> Optional[OrderStatusProjection]:
+        with read_connection(order_id) as connection:
+            row = connection.execute(STATUS_BY_ID_STATEMENT, {"order_id": order_id}).first()
+        if row:
+            return OrderStatusProjection(*row)
+        else:
+            return None
+
+    def list_ongoing_orders(self) -> List[OrderStatus]:
+        with read_connection() as connection:
+            rows = connection.execute(ONGOING_ORDERS_STATEMENT).all()
+        return [order_status_factory(*row) for row in rows]
@@ -1,22 +1,20 @@
+import dataclasses
+import datetime
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Tuple, Iterator
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import create_engine, case
-from sqlalchemy.orm import sessionmaker
 
-from src.config.config import settings
-
-from src.entities.models.order_status_entity import order_status_factory, OrderStatus, Status
+from src.config.errors import ConcurrencyError
+from src.entities.models.order_status_entity import order_status_factory, OrderStatus, OrderStatusProjection, \
+    Status
+from src.external.postgresql_database import SessionLocal, read_session, read_router
 from src.gateways.orm.order_status_orm import Orders_Status as OrderStatusORM
+from src.gateways.postgres_gateways.order_status_statements import bulk_insert_statement, export_statement, \
+    ongoing_statement, page_statement, select_many_statement, transition_statement, transition_many_statement, \
+    lookup_statement, archive_statement, remove_archived_statement, update_statement, \
+    status_statement
 from src.interfaces.gateways.order_status_gateway_interface import IOrderStatusGateway
 
-connection_uri = settings.db.SQLALCHEMY_DATABASE_URI
-
-engine = create_engine(
-    connection_uri
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 
 class PostgresDBOrderStatusRepository(IOrderStatusGateway):
     @staticmethod
@@ -25,58 +23,60 @@ class PostgresDBOrderStatusRepository(IOrderStatusGateway):
             order_status.order_id,
             order_status.creation_date,
             order_status.order_status,
+            order_status.version,
         )
         return order_status_entity
 
     def get_by_id(self, order_id: uuid.UUID) -> Optional[OrderStatus]:
-        with SessionLocal() as db:
-            order_status_db = db.query(OrderStatusORM).filter(OrderStatusORM.order_id == order_id).first()
-        if order_status_db:
-            return self.to_entity(order_status_db)  # type: ignore
+        with read_session(order_id) as db:
+            row = db.execute(lookup_statement(order_id)).first()
+        if row:
+            return order_status_factory(*row)
         else:
             return None
 
-    def get_order_status(self, order_id: uuid.UUID) -> Optional[OrderStatus]:
-        with SessionLocal() as db:
-            order_status_db = db.query(OrderStatusORM.order_status).filter(OrderStatusORM.order_id == order_id).first()
-        if order_status_db:
-            return self.to_entity(order_status_db)  # type: ignore
+    def get_order_status(self, order_id: uuid.UUID) -> Optional[OrderStatusProjection]:
+        with read_session(order_id) as db:
+            row = db.execute(status_statement(order_id)).first()
+        if row:
+            return OrderStatusProjection(*row)
         else:
             return None
 
-    def get_all(self) -> List[OrderStatus]:
-        result = []
+    def get_many(self, order_ids: List[uuid.UUID]) -> List[OrderStatus]:
+        with SessionLocal() as db:
+            rows = db.execute(select_many_statement(order_ids)).all()
+        return [order_status_factory(*row) for row in rows]
+
+    def get_all(
+        self, limit: Optional[int] = None, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None
+    ) -> List[OrderStatus]:
+        with read_session() as db:
+            rows = db.execute(page_statement(limit, after)).all()
+        return [order_status_factory(*row) for row in rows]
+
+    def stream_orders(
+        self,
+        order_status: Optional[Status],
+        start_date: Optional[datetime.datetime],
+        end_date: Optional[datetime.datetime],
+        batch_size: int
+    ) -> Iterator[OrderStatus]:
+        statement = export_statement(order_status, start_date, end_date).execution_options(yield_per=batch_size)
         with SessionLocal() as db:
-            order_status_db = db.query(OrderStatusORM).order_by(OrderStatusORM.creation_date).all()
-            if order_status_db:
-                for order_status in order_status_db:
-                    order_status_entity = self.to_entity(order_status)  # type: ignore
-                    result.append(order_status_entity)
-        return result
+            for row in db.execute(statement):
+                yield order_status_factory(*row)
 
     def list_ongoing_orders(self) -> List[OrderStatus]:
-        result = []
-        with SessionLocal() as db:
-            orders = db.query(OrderStatusORM)\
-                .filter(OrderStatusORM.order_status.not_in(['Finalizado', 'Pendente']))\
-                .order_by(case(
-                        (OrderStatusORM.order_status == Status.READY, 1),  # type: ignore
-                        (OrderStatusORM.order_status == Status.IN_PROGRESS, 2),  # type: ignore
-                        (OrderStatusORM.order_status == Status.CONFIRMED, 3),  # type: ignore
-                        else_=4))\
-                .all()
-
-            if orders:
-                for order in orders:
-                    order_entity = self.to_entity(order)  # type: ignore
-                    result.append(order_entity)
-
-        return result
+        with read_session() as db:
+            rows = db.execute(ongoing_statement()).all()
+        return [order_status_factory(*row) for row in rows]
 
     def create_order_status(self, obj_in: OrderStatus) -> OrderStatus:
         obj_in_data = jsonable_encoder(obj_in, by_alias=False)
         db_obj = OrderStatusORM(**obj_in_data)  # type: ignore
 
+        read_router.record_writes([obj_in.order_id])
         with SessionLocal() as db:
             db.add(db_obj)
             db.commit()
@@ -85,23 +85,58 @@ class PostgresDBOrderStatusRepository(IOrderStatusGateway):
         new_order = self.to_entity(db_obj)
         return new_order
 
+    def create_many(self, orders_in: List[OrderStatus]) -> List[OrderStatus]:
+        if not orders_in:
+            return []
+
+        read_router.record_writes([order.order_id for order in orders_in])
+        with SessionLocal() as db:
+            rows = db.execute(bulk_insert_statement(), [dataclasses.asdict(order) for order in orders_in]).all()
+            db.commit()
+
+        return [order_status_factory(*row) for row in rows]
+
     def update(self, order_id: uuid.UUID, obj_in: OrderStatus) -> OrderStatus:
-        order_in = vars(obj_in)
+        read_router.record_writes([order_id])
         with SessionLocal() as db:
-            db_obj = db.query(OrderStatusORM).filter(OrderStatusORM.order_id == order_id).first()
-            obj_data = jsonable_encoder(db_obj, by_alias=False)
-            for field in obj_data:
-                if field in order_in:
-                    setattr(db_obj, field, order_in[field])
-            db.add(db_obj)
+            row = db.execute(update_statement(order_id, obj_in.order_status, obj_in.version)).first()
             db.commit()
-            db.refresh(db_obj)
 
-        updated_order = self.to_entity(db_obj)  # type: ignore
-        return updated_order
+        if not row:
+            raise ConcurrencyError.version_conflict(order_id)
+        return order_status_factory(*row)
+
+    def transition(self, order_id: uuid.UUID, from_status: Status, to_status: Status) -> Optional[OrderStatus]:
+        read_router.record_writes([order_id])
+        with SessionLocal() as db:
+            row = db.execute(transition_statement(order_id, from_status, to_status)).first()
+            db.commit()
+
+        if row:
+            return order_status_factory(*row)
+        else:
+            return None
+
+    def transition_many(
+        self, order_ids: List[uuid.UUID], from_status: Status, to_status: Status
+    ) -> List[OrderStatus]:
+        read_router.record_writes(order_ids)
+        with SessionLocal() as db:
+            rows = db.execute(transition_many_statement(order_ids, from_status, to_status)).all()
+            db.commit()
+        return [order_status_factory(*row) for row in rows]
+
+    def archive_finalized(self, finalized_before: datetime.datetime, batch_size: int) -> int:
+        with SessionLocal() as db:
+            archived = db.execute(archive_statement(finalized_before, batch_size)).scalar_one()
+            db.commit()
+        return archived
 
     def remove_order_status(self, order_id: uuid.UUID) -> None:
+        read_router.record_writes([order_id])
         with SessionLocal() as db:
             order = db.query(OrderStatusORM).filter(OrderStatusORM.order_id == order_id).first()
-            db.delete(order)
+            if order:
+                db.delete(order)
+            db.execute(remove_archived_statement(order_id))
             db.commit()
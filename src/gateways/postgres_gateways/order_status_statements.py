@@ -0,0 +1,189 @@
+import datetime
+import uuid
+from typing import List, Optional, Tuple
+
+from sqlalchemy import update, select, tuple_, delete, func, union_all, literal, bindparam, literal_column
+from sqlalchemy.dialects.postgresql import insert
+
+from src.entities.models.order_status_entity import Status
+from src.gateways.orm.order_status_orm import Orders_Status as OrderStatusORM, \
+    Orders_Status_Archive as OrderStatusArchiveORM
+
+ORDER_STATUS_COLUMNS = (
+    OrderStatusORM.order_id,
+    OrderStatusORM.creation_date,
+    OrderStatusORM.order_status,
+    OrderStatusORM.version,
+)
+
+ARCHIVE_COLUMNS = (
+    OrderStatusArchiveORM.order_id,
+    OrderStatusArchiveORM.creation_date,
+    OrderStatusArchiveORM.order_status,
+    OrderStatusArchiveORM.version,
+)
+
+orders_status_table = OrderStatusORM.__table__
+orders_status_archive_table = OrderStatusArchiveORM.__table__
+
+
+ENTITY_COLUMN_NAMES = ("order_id", "creation_date", "order_status", "version")
+PROJECTION_COLUMN_NAMES = ("order_id", "order_status")
+
+
+def _lookup_statement(order_id, column_names=ENTITY_COLUMN_NAMES):
+    # Hot rows win over archived ones, the archive is only read when the order has been moved
+    hot = select(
+        *(orders_status_table.c[name] for name in column_names), literal(0).label("source")
+    ).where(orders_status_table.c.order_id == order_id)
+    archived = select(
+        *(orders_status_archive_table.c[name] for name in column_names), literal(1).label("source")
+    ).where(orders_status_archive_table.c.order_id == order_id)
+    lookup = union_all(hot, archived).subquery()
+    return select(*(lookup.c[name] for name in column_names))\
+        .order_by(lookup.c.source)\
+        .limit(1)
+
+
+def lookup_statement(order_id: uuid.UUID):
+    return _lookup_statement(order_id)
+
+
+def status_statement(order_id: uuid.UUID):
+    # Only reads columns held by ix_orders_status_order_id_status, so the hot table is an index-only scan
+    return _lookup_statement(order_id, PROJECTION_COLUMN_NAMES)
+
+
+def _history_statement(
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None,
+    order_status: Optional[Status] = None,
+    start_date: Optional[datetime.datetime] = None,
+    end_date: Optional[datetime.datetime] = None
+):
+    # Archived orders are still part of the history. Each table is filtered and limited on its own
+    # (creation_date, order_id) index, the merge then only sorts what both branches returned
+    branches = []
+    for table in (orders_status_table, orders_status_archive_table):
+        branch = select(*(table.c[name] for name in ENTITY_COLUMN_NAMES))
+        if after:
+            branch = branch.where(tuple_(table.c.creation_date, table.c.order_id) > tuple_(*after))
+        if order_status:
+            branch = branch.where(table.c.order_status == order_status)
+        if start_date:
+            branch = branch.where(table.c.creation_date >= start_date)
+        if end_date:
+            branch = branch.where(table.c.creation_date < end_date)
+        if limit:
+            branch = branch.order_by(table.c.creation_date, table.c.order_id).limit(limit)
+        branches.append(branch)
+    history = union_all(*branches).subquery()
+    statement = select(*(history.c[name] for name in ENTITY_COLUMN_NAMES))\
+        .order_by(history.c.creation_date, history.c.order_id)
+    if limit:
+        statement = statement.limit(limit)
+    return statement
+
+
+def page_statement(limit: Optional[int], after: Optional[Tuple[datetime.datetime, uuid.UUID]]):
+    return _history_statement(limit, after)
+
+
+def _ongoing_condition(order_status_column):
+    # Rendered inline instead of bound, so the planner can match the partial ix_orders_status_ongoing_board index
+    return order_status_column.between(
+        literal_column(str(int(Status.CONFIRMED))), literal_column(str(int(Status.READY)))
+    )
+
+
+def ongoing_statement():
+    return select(*ORDER_STATUS_COLUMNS)\
+        .where(_ongoing_condition(OrderStatusORM.order_status))\
+        .order_by(OrderStatusORM.order_status.desc(), OrderStatusORM.creation_date)
+
+
+def export_statement(
+    order_status: Optional[Status],
+    start_date: Optional[datetime.datetime],
+    end_date: Optional[datetime.datetime]
+):
+    return _history_statement(order_status=order_status, start_date=start_date, end_date=end_date)
+
+
+def bulk_insert_statement():
+    # Executed with a list of parameter sets, SQLAlchemy batches them into multi-row
+    # INSERT ... VALUES statements while still collecting the RETURNING rows
+    return insert(OrderStatusORM.__table__)\
+        .on_conflict_do_nothing(index_elements=[OrderStatusORM.order_id])\
+        .returning(*ORDER_STATUS_COLUMNS)
+
+
+def select_many_statement(order_ids: List[uuid.UUID]):
+    return union_all(
+        select(*ORDER_STATUS_COLUMNS).where(OrderStatusORM.order_id.in_(order_ids)),
+        select(*ARCHIVE_COLUMNS).where(OrderStatusArchiveORM.order_id.in_(order_ids)),
+    )
+
+
+def transition_statement(order_id: uuid.UUID, from_status: Status, to_status: Status):
+    return update(OrderStatusORM)\
+        .where(OrderStatusORM.order_id == order_id, OrderStatusORM.order_status == from_status)\
+        .values(order_status=to_status, version=OrderStatusORM.version + 1)\
+        .returning(*ORDER_STATUS_COLUMNS)\
+        .execution_options(synchronize_session=False)
+
+
+def update_statement(order_id: uuid.UUID, order_status: Status, expected_version: int):
+    return update(OrderStatusORM)\
+        .where(OrderStatusORM.order_id == order_id, OrderStatusORM.version == expected_version)\
+        .values(order_status=order_status, version=OrderStatusORM.version + 1)\
+        .returning(*ORDER_STATUS_COLUMNS)\
+        .execution_options(synchronize_session=False)
+
+
+def transition_many_statement(order_ids: List[uuid.UUID], from_status: Status, to_status: Status):
+    return update(OrderStatusORM)\
+        .where(OrderStatusORM.order_id.in_(order_ids), OrderStatusORM.order_status == from_status)\
+        .values(order_status=to_status, version=OrderStatusORM.version + 1)\
+        .returning(*ORDER_STATUS_COLUMNS)\
+        .execution_options(synchronize_session=False)
+
+
+def archive_statement(finalized_before: datetime.datetime, batch_size: int):
+    # Moves one batch of old finalized orders in a single statement. SKIP LOCKED lets several
+    # workers run the job at once without waiting on each other's batches
+    batch = select(OrderStatusORM.order_id)\
+        .where(OrderStatusORM.order_status == Status.FINALIZED, OrderStatusORM.creation_date < finalized_before)\
+        .order_by(OrderStatusORM.creation_date)\
+        .limit(batch_size)\
+        .with_for_update(skip_locked=True)
+    moved = delete(OrderStatusORM)\
+        .where(OrderStatusORM.order_id.in_(batch.scalar_subquery()))\
+        .returning(*ORDER_STATUS_COLUMNS)\
+        .cte("moved")
+    archived = insert(OrderStatusArchiveORM.__table__)\
+        .from_select(["order_id", "creation_date", "order_status", "version"], select(moved))\
+        .on_conflict_do_nothing(index_elements=[OrderStatusArchiveORM.order_id])\
+        .cte("archived")
+    return select(func.count()).select_from(moved).add_cte(archived)
+
+
+def remove_archived_statement(order_id: uuid.UUID):
+    return delete(OrderStatusArchiveORM).where(OrderStatusArchiveORM.order_id == order_id)
+
+
+# Built once against the plain tables with bind parameters for the Core fast path. Executing them on a
+# Connection skips the ORM compile step and only pays for the compiled-cache lookup
+LOOKUP_BY_ID_STATEMENT = _lookup_statement(bindparam("order_id", type_=orders_status_table.c.order_id.type))
+
+STATUS_BY_ID_STATEMENT = _lookup_statement(
+    bindparam("order_id", type_=orders_status_table.c.order_id.type), PROJECTION_COLUMN_NAMES
+)
+
+ONGOING_ORDERS_STATEMENT = select(
+    orders_status_table.c.order_id,
+    orders_status_table.c.creation_date,
+    orders_status_table.c.order_status,
+    orders_status_table.c.version
+).where(_ongoing_condition(orders_status_table.c.order_status))\
+    .order_by(orders_status_table.c.order_status.desc(), orders_status_table.c.creation_date)
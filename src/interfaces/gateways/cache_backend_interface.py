@@ -0,0 +1,23 @@
+import uuid
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from src.entities.models.order_status_entity import OrderStatus
+
+
+class ICacheBackend(ABC):
+    @abstractmethod
+    def get(self, order_id: uuid.UUID) -> Optional[OrderStatus]:
+        pass
+
+    @abstractmethod
+    def set(self, order_status: OrderStatus) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, order_id: uuid.UUID) -> None:
+        pass
+
+    @abstractmethod
+    def statistics(self) -> dict:
+        pass
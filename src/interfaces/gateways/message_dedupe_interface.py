@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+# Outcomes of a claim: the caller now holds the keys, another copy is still being handled, or one already was
+CLAIMED = "claimed"
+IN_PROGRESS = "in-progress"
+PROCESSED = "processed"
+
+
+class IMessageDedupeStore(ABC):
+    @abstractmethod
+    def claim(self, keys: List[str], lease_seconds: float) -> str:
+        pass
+
+    @abstractmethod
+    def extend(self, keys: List[str], lease_seconds: float) -> None:
+        pass
+
+    @abstractmethod
+    def complete(self, keys: List[str]) -> None:
+        pass
+
+    @abstractmethod
+    def release(self, keys: List[str]) -> None:
+        pass
+
+    @abstractmethod
+    def statistics(self) -> dict:
+        pass
@@ -0,0 +1,70 @@
+import datetime
+import uuid
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple, AsyncIterator
+
+from src.entities.models.order_status_entity import OrderStatus, OrderStatusProjection, Status
+
+
+class IAsyncOrderStatusGateway(ABC):
+    @abstractmethod
+    async def get_by_id(self, order_id: uuid.UUID) -> OrderStatus:
+        pass
+
+    @abstractmethod
+    async def get_order_status(self, order_id: uuid.UUID) -> Optional[OrderStatusProjection]:
+        pass
+
+    @abstractmethod
+    async def get_many(self, order_ids: List[uuid.UUID]) -> List[OrderStatus]:
+        pass
+
+    @abstractmethod
+    async def get_all(
+        self, limit: Optional[int] = None, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None
+    ) -> List[OrderStatus]:
+        pass
+
+    @abstractmethod
+    def stream_orders(
+        self,
+        order_status: Optional[Status],
+        start_date: Optional[datetime.datetime],
+        end_date: Optional[datetime.datetime],
+        batch_size: int
+    ) -> AsyncIterator[OrderStatus]:
+        pass
+
+    @abstractmethod
+    async def list_ongoing_orders(self) -> List[OrderStatus]:
+        pass
+
+    @abstractmethod
+    async def create_order_status(self, order_in: OrderStatus) -> OrderStatus:
+        pass
+
+    @abstractmethod
+    async def create_many(self, orders_in: List[OrderStatus]) -> List[OrderStatus]:
+        pass
+
+    @abstractmethod
+    async def update(self, order_id: uuid.UUID, order_in: OrderStatus) -> OrderStatus:
+        pass
+
+    @abstractmethod
+    async def transition(self, order_id: uuid.UUID, from_status: Status, to_status: Status) -> Optional[OrderStatus]:
+        pass
+
+    @abstractmethod
+    async def transition_many(
+        self, order_ids: List[uuid.UUID], from_status: Status, to_status: Status
+    ) -> List[OrderStatus]:
+        pass
+
+    @abstractmethod
+    async def archive_finalized(self, finalized_before: datetime.datetime, batch_size: int) -> int:
+        pass
+
+    @abstractmethod
+    async def remove_order_status(self, order_id: uuid.UUID) -> None:
+        pass
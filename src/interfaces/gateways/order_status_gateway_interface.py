@@ -1,8 +1,9 @@
+import datetime
 import uuid
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional, Tuple, Iterator
 
-from src.entities.models.order_status_entity import OrderStatus
+from src.entities.models.order_status_entity import OrderStatus, OrderStatusProjection, Status
 
 
 class IOrderStatusGateway(ABC):
@@ -11,11 +12,27 @@ class IOrderStatusGateway(ABC):
         pass
 
     @abstractmethod
-    def get_order_status(self, order_id: uuid.UUID) -> OrderStatus:
+    def get_order_status(self, order_id: uuid.UUID) -> Optional[OrderStatusProjection]:
         pass
 
     @abstractmethod
-    def get_all(self) -> List[OrderStatus]:
+    def get_many(self, order_ids: List[uuid.UUID]) -> List[OrderStatus]:
+        pass
+
+    @abstractmethod
+    def get_all(
+        self, limit: Optional[int] = None, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None
+    ) -> List[OrderStatus]:
+        pass
+
+    @abstractmethod
+    def stream_orders(
+        self,
+        order_status: Optional[Status],
+        start_date: Optional[datetime.datetime],
+        end_date: Optional[datetime.datetime],
+        batch_size: int
+    ) -> Iterator[OrderStatus]:
         pass
 
     @abstractmethod
@@ -26,10 +43,28 @@ class IOrderStatusGateway(ABC):
     def create_order_status(self, order_in: OrderStatus) -> OrderStatus:
         pass
 
+    @abstractmethod
+    def create_many(self, orders_in: List[OrderStatus]) -> List[OrderStatus]:
+        pass
+
     @abstractmethod
     def update(self, order_id: uuid.UUID, order_in: OrderStatus) -> OrderStatus:
         pass
 
+    @abstractmethod
+    def transition(self, order_id: uuid.UUID, from_status: Status, to_status: Status) -> Optional[OrderStatus]:
+        pass
+
+    @abstractmethod
+    def transition_many(
+        self, order_ids: List[uuid.UUID], from_status: Status, to_status: Status
+    ) -> List[OrderStatus]:
+        pass
+
+    @abstractmethod
+    def archive_finalized(self, finalized_before: datetime.datetime, batch_size: int) -> int:
+        pass
+
     @abstractmethod
     def remove_order_status(self, order_id: uuid.UUID) -> None:
         pass
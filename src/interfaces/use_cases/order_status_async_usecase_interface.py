@@ -0,0 +1,75 @@
+import datetime
+import uuid
+from abc import ABC
+from typing import List, Optional, Tuple, AsyncIterator
+
+from src.entities.models.order_status_entity import OrderStatus, OrderStatusTransitionResult, Status, \
+    PaymentStatus
+from src.entities.schemas.order_status_dto import CreateOrderStatusDTO, CreateOrderStatusBatchDTO, \
+    ChangeOrderStatusBatchDTO
+from src.interfaces.gateways.order_status_async_gateway_interface import IAsyncOrderStatusGateway
+
+
+class AsyncOrderStatusUseCaseInterface(ABC):
+    def __init__(self, order_status_repo: IAsyncOrderStatusGateway) -> None:
+        raise NotImplementedError
+
+    async def get_by_id(self, order_id: uuid.UUID):
+        pass
+
+    async def get_order_status(self, order_id: uuid.UUID):
+        pass
+
+    async def get_all(self, limit: Optional[int] = None, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None):
+        pass
+
+    def stream_orders(
+        self,
+        order_status: Optional[Status],
+        start_date: Optional[datetime.datetime],
+        end_date: Optional[datetime.datetime],
+        batch_size: int
+    ) -> AsyncIterator[OrderStatus]:
+        pass
+
+    async def list_ongoing_orders(self):
+        pass
+
+    async def get_kitchen_board(self) -> Tuple[Optional[int], List[OrderStatus]]:
+        pass
+
+    async def rebuild_kitchen_board(self) -> None:
+        pass
+
+    async def create_order_status(self, input_dto: CreateOrderStatusDTO) -> OrderStatus:
+        pass
+
+    async def create_many_order_status(
+        self, input_dto: CreateOrderStatusBatchDTO
+    ) -> Tuple[List[OrderStatus], List[uuid.UUID]]:
+        pass
+
+    async def confirm_order(self, order_id: uuid.UUID) -> OrderStatus:
+        pass
+
+    async def change_order_status_in_progress(self, order_id: uuid.UUID, payment_status: PaymentStatus) -> OrderStatus:
+        pass
+
+    async def change_order_status_ready(self, order_id: uuid.UUID) -> OrderStatus:
+        pass
+
+    async def change_order_status_finalized(self, order_id: uuid.UUID) -> OrderStatus:
+        pass
+
+    async def change_many_orders_status(
+        self, input_dto: ChangeOrderStatusBatchDTO
+    ) -> List[OrderStatusTransitionResult]:
+        pass
+
+    async def archive_finalized_orders(
+        self, finalized_before: datetime.datetime, batch_size: int, max_batches: int
+    ) -> int:
+        pass
+
+    async def remove_order_status(self, order_id: uuid.UUID) -> None:
+        pass
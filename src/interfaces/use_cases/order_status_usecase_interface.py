@@ -1,8 +1,12 @@
+import datetime
 import uuid
 from abc import ABC
+from typing import List, Optional, Tuple, Iterator
 
-from src.entities.models.order_status_entity import OrderStatus
-from src.entities.schemas.order_status_dto import CreateOrderStatusDTO
+from src.entities.models.order_status_entity import OrderStatus, OrderStatusTransitionResult, Status, \
+    PaymentStatus
+from src.entities.schemas.order_status_dto import CreateOrderStatusDTO, CreateOrderStatusBatchDTO, \
+    ChangeOrderStatusBatchDTO
 from src.interfaces.gateways.order_status_gateway_interface import IOrderStatusGateway
 
 
@@ -16,19 +20,39 @@ class OrderStatusUseCaseInterface(ABC):
     def get_order_status(self, order_id: uuid.UUID):
         pass
 
-    def get_all(self):
+    def get_all(self, limit: Optional[int] = None, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None):
+        pass
+
+    def stream_orders(
+        self,
+        order_status: Optional[Status],
+        start_date: Optional[datetime.datetime],
+        end_date: Optional[datetime.datetime],
+        batch_size: int
+    ) -> Iterator[OrderStatus]:
         pass
 
     def list_ongoing_orders(self):
         pass
 
+    def get_kitchen_board(self) -> Tuple[Optional[int], List[OrderStatus]]:
+        pass
+
+    def rebuild_kitchen_board(self) -> None:
+        pass
+
     def create_order_status(self, input_dto: CreateOrderStatusDTO) -> OrderStatus:
         pass
 
+    def create_many_order_status(
+        self, input_dto: CreateOrderStatusBatchDTO
+    ) -> Tuple[List[OrderStatus], List[uuid.UUID]]:
+        pass
+
     def confirm_order(self, order_id: uuid.UUID) -> OrderStatus:
         pass
 
-    def change_order_status_in_progress(self, order_id: uuid.UUID, payment_status: str) -> OrderStatus:
+    def change_order_status_in_progress(self, order_id: uuid.UUID, payment_status: PaymentStatus) -> OrderStatus:
         pass
 
     def change_order_status_ready(self, order_id: uuid.UUID) -> OrderStatus:
@@ -37,5 +61,15 @@ class OrderStatusUseCaseInterface(ABC):
     def change_order_status_finalized(self, order_id: uuid.UUID) -> OrderStatus:
         pass
 
+    def change_many_orders_status(
+        self, input_dto: ChangeOrderStatusBatchDTO
+    ) -> List[OrderStatusTransitionResult]:
+        pass
+
+    def archive_finalized_orders(
+        self, finalized_before: datetime.datetime, batch_size: int, max_batches: int
+    ) -> int:
+        pass
+
     def remove_order_status(self, order_id: uuid.UUID) -> None:
         pass
@@ -0,0 +1,136 @@
+import dataclasses
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from src.config.config import settings
+from src.entities.models.order_status_entity import OrderStatus, ONGOING_STATUSES
+
+# Deleted rows never notify again, so nothing delivered or read from a lagging replica after a removal may bring
+# the order back, order ids are never reused
+REMOVED_VERSION = sys.maxsize
+
+
+class KitchenBoard:
+    def __init__(self, max_age_seconds: float, max_tombstones: int = 10000) -> None:
+        self.board_id = uuid.uuid4().hex[:12]
+        self._lock = threading.RLock()
+        self._max_age_seconds = max_age_seconds
+        self._max_tombstones = max_tombstones
+        self._orders: Dict[uuid.UUID, OrderStatus] = {}
+        # Last row version seen for orders that left the board, so late deliveries cannot put them back
+        self._tombstones: "OrderedDict[uuid.UUID, int]" = OrderedDict()
+        self._sorted_orders: Optional[List[OrderStatus]] = None
+        self._version = 0
+        self._loaded_at: Optional[float] = None
+        # Changes applied while a rebuild is loading from the database, replayed on top of its snapshot
+        self._journal: List[Tuple[int, uuid.UUID, Optional[OrderStatus]]] = []
+        self._rebuilds_in_flight = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def needs_rebuild(self) -> bool:
+        # Versions are per process, so a version sent by a client is never a reason to rebuild, at most an ETag miss
+        with self._lock:
+            if self._loaded_at is None:
+                return True
+            return time.monotonic() - self._loaded_at > self._max_age_seconds
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def start_rebuild(self) -> int:
+        with self._lock:
+            self._rebuilds_in_flight += 1
+            return self._version
+
+    def cancel_rebuild(self) -> None:
+        with self._lock:
+            self._end_rebuild()
+
+    def finish_rebuild(self, orders: List[OrderStatus], started_at_version: int) -> None:
+        with self._lock:
+            board = {}
+            for order in orders:
+                if order.version > self._tombstones.get(order.order_id, 0):
+                    self._place(board, order.order_id, order)
+            for version, order_id, order in self._journal:
+                if version <= started_at_version:
+                    continue
+                current = board.get(order_id)
+                # The snapshot may have been read after a journaled change, the newer row version wins
+                if order is None or current is None or order.version > current.version:
+                    self._place(board, order_id, order)
+            self._end_rebuild()
+
+            self._orders = board
+            self._sorted_orders = None
+            self._version += 1
+            self._loaded_at = time.monotonic()
+
+    def apply(self, order: OrderStatus) -> None:
+        with self._lock:
+            # Notifications and this worker's own writes race each other, only a newer row version is applied.
+            # That also drops the echo of this worker's own writes, which must not bump the version again
+            if order.version <= self._known_version(order.order_id):
+                return
+            self._change(order.order_id, dataclasses.replace(order), order.version)
+
+    def remove(self, order_id: uuid.UUID) -> None:
+        with self._lock:
+            self._change(order_id, None, REMOVED_VERSION)
+
+    def snapshot(self) -> Tuple[int, List[OrderStatus]]:
+        with self._lock:
+            if self._sorted_orders is None:
+                self._sorted_orders = sorted(
+                    self._orders.values(),
+                    key=lambda order: (-order.order_status, order.creation_date)
+                )
+            return self._version, list(self._sorted_orders)
+
+    def _known_version(self, order_id: uuid.UUID) -> int:
+        order = self._orders.get(order_id)
+        if order is not None:
+            return order.version
+        return self._tombstones.get(order_id, 0)
+
+    def _change(self, order_id: uuid.UUID, order: Optional[OrderStatus], row_version: int) -> None:
+        changed = self._place(self._orders, order_id, order)
+        if order_id in self._orders:
+            self._tombstones.pop(order_id, None)
+        else:
+            self._tombstones[order_id] = row_version
+            self._tombstones.move_to_end(order_id)
+            while len(self._tombstones) > self._max_tombstones:
+                self._tombstones.popitem(last=False)
+        if not changed:
+            return
+        self._sorted_orders = None
+        self._version += 1
+        if self._rebuilds_in_flight:
+            self._journal.append((self._version, order_id, order))
+
+    def _end_rebuild(self) -> None:
+        self._rebuilds_in_flight -= 1
+        if not self._rebuilds_in_flight:
+            self._journal.clear()
+
+    @staticmethod
+    def _place(board: Dict[uuid.UUID, OrderStatus], order_id: uuid.UUID, order: Optional[OrderStatus]) -> bool:
+        if order is not None and order.order_status in ONGOING_STATUSES:
+            board[order_id] = order
+            return True
+        return board.pop(order_id, None) is not None
+
+
+# Writes made on other replicas only reach this board through LISTEN/NOTIFY, so without push it could lag up to
+# KITCHEN_BOARD_MAX_AGE_SECONDS behind them; every request reads the database instead in that case
+kitchen_board = KitchenBoard(settings.KITCHEN_BOARD_MAX_AGE_SECONDS) \
+    if settings.KITCHEN_BOARD_ENABLED and settings.PUSH_ENABLED else None
@@ -1,16 +1,68 @@
+import datetime
 import uuid
+from typing import Callable, List, Optional, Tuple, Iterator
 
-from src.config.errors import ResourceNotFound
+from src.config.config import settings
+from src.config.errors import ResourceNotFound, ConcurrencyError
 
-from src.entities.schemas.order_status_dto import CreateOrderStatusDTO
-from src.entities.models.order_status_entity import OrderStatus
+from src.entities.errors.order_status_error import OrderStatusError
+from src.entities.schemas.order_status_dto import CreateOrderStatusDTO, CreateOrderStatusBatchDTO, \
+    ChangeOrderStatusBatchDTO
+from src.entities.models.order_status_entity import OrderStatus, Status, STATUS_TRANSITIONS, \
+    OrderStatusTransitionResult, PaymentStatus
 from src.interfaces.gateways.order_status_gateway_interface import IOrderStatusGateway
 from src.interfaces.use_cases.order_status_usecase_interface import OrderStatusUseCaseInterface
+from src.usecases.kitchen_board import KitchenBoard
+
+
+# Target statuses kitchen staff may apply to several orders at once
+BATCH_TRANSITIONS = {
+    Status.READY: OrderStatus.order_ready,
+    Status.FINALIZED: OrderStatus.order_finalized,
+}
+
+
+def transition_error_message(
+    order_id: uuid.UUID, order_status: Optional[OrderStatus], apply_transition: Callable[[OrderStatus], None]
+) -> str:
+    if not order_status:
+        return f"No order with id: {order_id}"
+    try:
+        apply_transition(order_status)
+    except OrderStatusError as e:
+        return str(e)
+    return str(ConcurrencyError.transition_conflict(order_id))
+
+
+def transition_results(
+    order_ids: List[uuid.UUID],
+    updated_orders: List[OrderStatus],
+    current_orders: List[OrderStatus],
+    apply_transition: Callable[[OrderStatus], None]
+) -> List[OrderStatusTransitionResult]:
+    updated = {order.order_id: order for order in updated_orders}
+    current = {order.order_id: order for order in current_orders}
+
+    results = []
+    for order_id in order_ids:
+        if order_id in updated:
+            results.append(OrderStatusTransitionResult(order_id, order_status=updated[order_id]))
+        else:
+            error = transition_error_message(order_id, current.get(order_id), apply_transition)
+            results.append(OrderStatusTransitionResult(order_id, error=error))
+    return results
 
 
 class OrderStatusUseCase(OrderStatusUseCaseInterface):
-    def __init__(self, order_status_repo: IOrderStatusGateway) -> None:
+    def __init__(
+        self,
+        order_status_repo: IOrderStatusGateway,
+        kitchen_board: Optional[KitchenBoard] = None,
+        conflict_retries: int = settings.ORDER_STATUS_CONFLICT_RETRIES
+    ) -> None:
         self._order_status_repo = order_status_repo
+        self._kitchen_board = kitchen_board
+        self._conflict_retries = conflict_retries
 
     def get_by_id(self, order_id: uuid.UUID):
         result = self._order_status_repo.get_by_id(order_id)
@@ -27,40 +79,144 @@ class OrderStatusUseCase(OrderStatusUseCaseInterface):
         else:
             return result
 
-    def get_all(self):
-        return self._order_status_repo.get_all()
+    def get_all(self, limit: Optional[int] = None, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None):
+        return self._order_status_repo.get_all(limit, after)
+
+    def stream_orders(
+        self,
+        order_status: Optional[Status],
+        start_date: Optional[datetime.datetime],
+        end_date: Optional[datetime.datetime],
+        batch_size: int
+    ) -> Iterator[OrderStatus]:
+        if order_status:
+            OrderStatus.check_valid_status(order_status)
+        return self._order_status_repo.stream_orders(order_status, start_date, end_date, batch_size)
 
     def list_ongoing_orders(self):
-        return self._order_status_repo.list_ongoing_orders()
+        _, ongoing_orders = self.get_kitchen_board()
+        return ongoing_orders
+
+    def get_kitchen_board(self) -> Tuple[Optional[int], List[OrderStatus]]:
+        if not self._kitchen_board:
+            return None, self._order_status_repo.list_ongoing_orders()
+        if self._kitchen_board.needs_rebuild():
+            self.rebuild_kitchen_board()
+        return self._kitchen_board.snapshot()
+
+    def rebuild_kitchen_board(self) -> None:
+        if not self._kitchen_board:
+            return
+        started_at_version = self._kitchen_board.start_rebuild()
+        try:
+            ongoing_orders = self._order_status_repo.list_ongoing_orders()
+        except Exception:
+            self._kitchen_board.cancel_rebuild()
+            raise
+        self._kitchen_board.finish_rebuild(ongoing_orders, started_at_version)
 
     def create_order_status(self, input_dto: CreateOrderStatusDTO) -> OrderStatus:
         order_status = OrderStatus.create_new_order_status(input_dto.order_id)
         self._order_status_repo.create_order_status(order_status)
+        self._track(order_status)
         return order_status
 
+    def create_many_order_status(
+        self, input_dto: CreateOrderStatusBatchDTO
+    ) -> Tuple[List[OrderStatus], List[uuid.UUID]]:
+        order_ids = list(dict.fromkeys(input_dto.order_ids))
+        orders_status = [OrderStatus.create_new_order_status(order_id) for order_id in order_ids]
+
+        created_orders = self._order_status_repo.create_many(orders_status)
+
+        for order in created_orders:
+            self._track(order)
+
+        created_ids = {order.order_id for order in created_orders}
+        existing_ids = [order_id for order_id in order_ids if order_id not in created_ids]
+        return created_orders, existing_ids
+
     def confirm_order(self, order_id: uuid.UUID) -> OrderStatus:
-        order_status = self._order_status_repo.get_by_id(order_id)
-        order_status.confirm_order()
-        updated_order_status = self._order_status_repo.update(order_id, order_status)
-        return updated_order_status
+        return self._transition(order_id, Status.CONFIRMED, OrderStatus.confirm_order)
 
-    def change_order_status_in_progress(self, order_id: uuid.UUID, payment_status: str) -> OrderStatus:
-        order_status = self._order_status_repo.get_by_id(order_id)
-        order_status.order_in_progress(payment_status)
-        updated_order_status = self._order_status_repo.update(order_id, order_status)
-        return updated_order_status
+    def change_order_status_in_progress(self, order_id: uuid.UUID, payment_status: PaymentStatus) -> OrderStatus:
+        def order_in_progress(order_status: OrderStatus) -> None:
+            order_status.order_in_progress(payment_status)
+
+        try:
+            OrderStatus.check_payment_status(payment_status)
+        except OrderStatusError:
+            self._raise_transition_error(order_id, order_in_progress)
+        return self._transition(order_id, Status.IN_PROGRESS, order_in_progress)
 
     def change_order_status_ready(self, order_id: uuid.UUID) -> OrderStatus:
-        order_status = self._order_status_repo.get_by_id(order_id)
-        order_status.order_ready()
-        updated_order_status = self._order_status_repo.update(order_id, order_status)
-        return updated_order_status
+        return self._transition(order_id, Status.READY, OrderStatus.order_ready)
 
     def change_order_status_finalized(self, order_id: uuid.UUID) -> OrderStatus:
+        return self._transition(order_id, Status.FINALIZED, OrderStatus.order_finalized)
+
+    def change_many_orders_status(
+        self, input_dto: ChangeOrderStatusBatchDTO
+    ) -> List[OrderStatusTransitionResult]:
+        to_status = input_dto.order_status
+        if to_status not in BATCH_TRANSITIONS:
+            raise OrderStatusError.invalid_status()
+
+        order_ids = list(dict.fromkeys(input_dto.order_ids))
+        updated_orders = self._order_status_repo.transition_many(order_ids, STATUS_TRANSITIONS[to_status], to_status)
+
+        for order in updated_orders:
+            self._track(order)
+
+        updated_ids = {order.order_id for order in updated_orders}
+        failed_ids = [order_id for order_id in order_ids if order_id not in updated_ids]
+        current_orders = self._order_status_repo.get_many(failed_ids) if failed_ids else []
+
+        return transition_results(order_ids, updated_orders, current_orders, BATCH_TRANSITIONS[to_status])
+
+    def _transition(
+        self, order_id: uuid.UUID, to_status: Status, apply_transition: Callable[[OrderStatus], None]
+    ) -> OrderStatus:
+        attempts = self._conflict_retries + 1
+        for attempt in range(attempts):
+            updated_order_status = self._order_status_repo.transition(
+                order_id, STATUS_TRANSITIONS[to_status], to_status
+            )
+            if updated_order_status:
+                self._track(updated_order_status)
+                return updated_order_status
+            try:
+                self._raise_transition_error(order_id, apply_transition)
+            except ConcurrencyError:
+                if attempt + 1 == attempts:
+                    raise
+
+    def _track(self, order_status: OrderStatus) -> None:
+        if self._kitchen_board:
+            self._kitchen_board.apply(order_status)
+
+    def _raise_transition_error(self, order_id: uuid.UUID, apply_transition: Callable[[OrderStatus], None]) -> None:
+        # The conditional update matched nothing, replay the state machine on the current row to
+        # surface the same domain error the entity would have raised
         order_status = self._order_status_repo.get_by_id(order_id)
-        order_status.order_finalized()
-        updated_order_status = self._order_status_repo.update(order_id, order_status)
-        return updated_order_status
+        if not order_status:
+            raise ResourceNotFound
+        apply_transition(order_status)
+        # The row is now in a state the transition accepts, so a concurrent write moved it after the update missed
+        raise ConcurrencyError.transition_conflict(order_id)
+
+    def archive_finalized_orders(
+        self, finalized_before: datetime.datetime, batch_size: int, max_batches: int
+    ) -> int:
+        archived = 0
+        for _ in range(max_batches):
+            moved = self._order_status_repo.archive_finalized(finalized_before, batch_size)
+            archived += moved
+            if moved < batch_size:
+                break
+        return archived
 
-    def remove_order(self, order_id: uuid.UUID) -> None:
+    def remove_order_status(self, order_id: uuid.UUID) -> None:
         self._order_status_repo.remove_order_status(order_id)
+        if self._kitchen_board:
+            self._kitchen_board.remove(order_id)
@@ -0,0 +1,27 @@
+import contextlib
+import contextvars
+import time
+from typing import Iterator, Optional
+
+_deadline: contextvars.ContextVar = contextvars.ContextVar("request_deadline", default=None)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    # Nested deadlines can only tighten the one already running
+    current = _deadline.get()
+    expires_at = time.monotonic() + seconds
+    token = _deadline.set(expires_at if current is None else min(current, expires_at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def clear_deadline() -> None:
+    _deadline.set(None)
+
+
+def remaining_seconds() -> Optional[float]:
+    expires_at = _deadline.get()
+    return None if expires_at is None else expires_at - time.monotonic()
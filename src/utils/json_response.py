@@ -0,0 +1,33 @@
+import datetime
+import json
+import uuid
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_value(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+def json_dumps(content: Any) -> bytes:
+    # UUIDs and datetimes are written directly, so payloads built from entities skip jsonable_encoder
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, default=encode_value, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
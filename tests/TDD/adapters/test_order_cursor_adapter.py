@@ -0,0 +1,19 @@
+import pytest
+
+from src.adapters.order_cursor_adapter import order_status_to_cursor, cursor_to_keyset
+from src.config.errors import PaginationError
+from tests.utils.order_status_helper import OrderStatusHelper
+
+
+def test_should_round_trip_cursor():
+    order_status = OrderStatusHelper.generate_order_status_entity()
+
+    cursor = order_status_to_cursor(order_status)
+
+    assert cursor_to_keyset(cursor) == (order_status.creation_date, order_status.order_id)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "bm90LWEtY3Vyc29y", ""])
+def test_should_reject_invalid_cursor(cursor):
+    with pytest.raises(PaginationError):
+        cursor_to_keyset(cursor)
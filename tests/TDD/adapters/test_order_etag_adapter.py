@@ -0,0 +1,26 @@
+import uuid
+
+from src.adapters.order_etag_adapter import etag_matches, order_status_etag, order_status_list_etag, \
+    kitchen_board_etag
+from src.entities.models.order_status_entity import OrderStatus
+
+
+def test_should_change_etag_when_order_status_changes():
+    order_status = OrderStatus.create_new_order_status(uuid.uuid4())
+    etag = order_status_etag(order_status)
+
+    assert etag == order_status_etag(order_status)
+
+    order_status.confirm_order()
+    assert etag != order_status_etag(order_status)
+    assert order_status_list_etag([order_status]) != order_status_list_etag([])
+
+
+def test_should_match_if_none_match_lists_and_weak_tags():
+    etag = kitchen_board_etag("board", 3)
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches(kitchen_board_etag("board", 4), etag)
@@ -0,0 +1,41 @@
+import csv
+import io
+import json
+
+from src.adapters import order_export_adapter
+from src.adapters.order_export_adapter import orders_to_export_chunks
+from src.entities.models.order_status_entity import STATUS_LABELS
+from tests.utils.order_status_helper import OrderStatusHelper
+
+
+def test_should_export_orders_as_ndjson():
+    orders = OrderStatusHelper.generate_multiple_order_status_entities()
+
+    lines = "".join(orders_to_export_chunks(iter(orders), "ndjson")).splitlines()
+
+    assert len(lines) == len(orders)
+    for line, order in zip(lines, orders):
+        row = json.loads(line)
+        assert row == {
+            "orderId": str(order.order_id),
+            "creationDate": order.creation_date.isoformat(),
+            "orderStatus": STATUS_LABELS[order.order_status],
+        }
+
+
+def test_should_export_orders_as_csv_with_single_header():
+    orders = OrderStatusHelper.generate_multiple_order_status_entities()
+
+    rows = list(csv.reader(io.StringIO("".join(orders_to_export_chunks(iter(orders), "csv")))))
+
+    assert rows[0] == ["orderId", "creationDate", "orderStatus"]
+    assert [row[0] for row in rows[1:]] == [str(order.order_id) for order in orders]
+
+
+def test_should_split_export_into_bounded_chunks(monkeypatch):
+    monkeypatch.setattr(order_export_adapter, "EXPORT_CHUNK_SIZE", 1)
+    orders = OrderStatusHelper.generate_multiple_order_status_entities()
+
+    chunks = list(orders_to_export_chunks(iter(orders), "ndjson"))
+
+    assert len(chunks) == len(orders)
@@ -0,0 +1,34 @@
+import json
+
+from src.adapters.order_json_adapter import order_status_list_to_json
+from src.entities.models.order_status_entity import STATUS_LABELS
+from src.entities.schemas.order_status_dto import OrderStatusDTOListResponse
+from src.utils import json_response
+from src.utils.json_response import json_dumps
+from tests.utils.order_status_helper import OrderStatusHelper
+
+
+def test_should_serialize_orders_with_camel_case_labels():
+    orders = OrderStatusHelper.generate_multiple_order_status_entities()
+
+    rows = json.loads(json_dumps({"result": order_status_list_to_json(orders)}))["result"]
+
+    assert rows == [
+        {
+            "orderId": str(order.order_id),
+            "creationDate": order.creation_date.isoformat(),
+            "orderStatus": STATUS_LABELS[order.order_status],
+        }
+        for order in orders
+    ]
+
+
+def test_should_match_validated_response_body(monkeypatch):
+    orders = OrderStatusHelper.generate_multiple_order_status_entities()
+    payload = {"result": order_status_list_to_json(orders)}
+    validated = OrderStatusDTOListResponse(**payload).dict(by_alias=True)
+
+    fast_body = json_dumps(payload)
+    monkeypatch.setattr(json_response, "orjson", None)
+
+    assert json.loads(fast_body) == json.loads(json_dumps(payload)) == json.loads(json_dumps(validated))
@@ -0,0 +1,26 @@
+import asyncio
+
+from src import app as app_module
+from src.config.config import settings
+from src.external.service_clients import service_clients
+
+
+def test_should_start_when_kitchen_board_rebuild_fails(monkeypatch):
+    rebuilds = []
+
+    async def start_consumer():
+        pass
+
+    async def rebuild_kitchen_board():
+        rebuilds.append(True)
+        raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(settings, "ARCHIVAL_ENABLED", False)
+    monkeypatch.setattr(settings, "PUSH_ENABLED", False)
+    monkeypatch.setattr(service_clients, "start", lambda: None)
+    monkeypatch.setattr(app_module.message_consumer, "start", start_consumer)
+    monkeypatch.setattr(app_module.order_status_controller, "rebuild_kitchen_board", rebuild_kitchen_board)
+
+    asyncio.run(app_module.app.router.startup())
+
+    assert rebuilds == [True]
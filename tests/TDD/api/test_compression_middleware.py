@@ -0,0 +1,70 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.adapters.order_sse_adapter import SSE_MEDIA_TYPE
+from src.api.middlewares.compression_middleware import CompressionMiddleware, accepts_gzip
+
+LARGE_BODY = "order-status " * 200
+
+
+async def large(request):
+    return PlainTextResponse(LARGE_BODY)
+
+
+async def tiny(request):
+    return PlainTextResponse("ok")
+
+
+async def events(request):
+    async def stream():
+        yield "data: " + LARGE_BODY + "\n\n"
+    return StreamingResponse(stream(), media_type=SSE_MEDIA_TYPE)
+
+
+@pytest.fixture
+def client():
+    app = Starlette(routes=[Route("/large", large), Route("/tiny", tiny), Route("/events", events)])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, compresslevel=1)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip", True),
+    ("br, gzip;q=0.5", True),
+    ("gzip;q=0", False),
+    ("*", True),
+    ("*, gzip;q=0", False),
+    ("identity", False),
+    ("", False),
+])
+def test_should_negotiate_gzip(accept_encoding, expected):
+    assert accepts_gzip(accept_encoding) is expected
+
+
+def test_should_compress_large_responses(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == LARGE_BODY
+
+
+def test_should_not_compress_when_client_opts_out(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip;q=0"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_should_not_compress_tiny_responses(client):
+    response = client.get("/tiny", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_should_not_compress_event_streams(client):
+    response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.text.startswith("data: order-status")
@@ -0,0 +1,32 @@
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.api.middlewares.deadline_middleware import DeadlineMiddleware
+from src.utils.deadline import remaining_seconds
+
+
+async def remaining(request):
+    return JSONResponse({"remaining": remaining_seconds()})
+
+
+async def stream(request):
+    async def chunks():
+        yield "head\n"
+        yield f"{remaining_seconds()}\n"
+    return StreamingResponse(chunks())
+
+
+def client() -> TestClient:
+    app = Starlette(routes=[Route("/remaining", remaining), Route("/stream", stream)])
+    app.add_middleware(DeadlineMiddleware, seconds=5)
+    return TestClient(app)
+
+
+def test_should_give_each_request_a_deadline():
+    assert 0 < client().get("/remaining").json()["remaining"] <= 5
+
+
+def test_should_lift_deadline_once_response_starts():
+    assert client().get("/stream").text == "head\nNone\n"
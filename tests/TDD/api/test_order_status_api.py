@@ -0,0 +1,79 @@
+import datetime
+import uuid
+
+import httpx
+import pytest
+from mockito import when, verify
+from starlette import status
+from starlette.testclient import TestClient
+
+from src.api.endpoints import order_status_api
+from src.app import app
+from src.controllers import order_status_controller
+from src.controllers.order_status_controller import OrderStatusController
+from src.entities.models.order_status_entity import OrderStatus, Status
+from src.external.circuit_breaker import CircuitBreaker, OPEN
+from src.external.service_clients import ServiceClient, service_clients
+from src.usecases.order_status_usecase import OrderStatusUseCase
+from tests.TDD.usecases.test_order_status_usecase import MockRepository
+
+
+@pytest.fixture
+def unstub():
+    from mockito import unstub
+    yield
+    unstub()
+
+
+@pytest.fixture
+def order_status_repo(monkeypatch):
+    # Runs the endpoints against the sync controller whatever POSTGRES_ASYNC_ENABLED says
+    monkeypatch.setattr(order_status_api, "controller", OrderStatusController)
+    order_status_repo = MockRepository()
+    when(order_status_controller).order_status_usecase().thenReturn(OrderStatusUseCase(order_status_repo))
+    return order_status_repo
+
+
+def payments_client(handler, failure_threshold: int = 5) -> ServiceClient:
+    return ServiceClient(
+        "payments", "http://payments.local/api", 5, 1, 2, 30, CircuitBreaker(failure_threshold, 30),
+        transport=httpx.MockTransport(handler)
+    )
+
+
+def test_should_change_order_status_in_progress_in_sync_mode(unstub, order_status_repo, monkeypatch):
+    order = OrderStatus(uuid.uuid4(), datetime.datetime(2024, 1, 2, 3, 4, 5), Status.IN_PROGRESS, 2)
+    monkeypatch.setattr(service_clients, "payments", payments_client(
+        lambda request: httpx.Response(200, json={"result": {"paymentStatus": "Confirmado"}})
+    ))
+    when(order_status_repo).transition(order.order_id, Status.CONFIRMED, Status.IN_PROGRESS).thenReturn(order)
+
+    response = TestClient(app).put(f"/order-status/{order.order_id}/in-progress")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["result"] == {
+        "orderId": str(order.order_id),
+        "creationDate": "2024-01-02T03:04:05",
+        "orderStatus": "Em preparo",
+    }
+
+
+def test_should_answer_503_while_payments_breaker_is_open(unstub, order_status_repo, monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    payments = payments_client(handler, failure_threshold=1)
+    monkeypatch.setattr(service_clients, "payments", payments)
+    order_id = uuid.uuid4()
+    client = TestClient(app)
+
+    assert client.put(f"/order-status/{order_id}/in-progress").status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    response = client.put(f"/order-status/{order_id}/in-progress")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert len(calls) == 1
+    assert payments.breaker.state == OPEN
+    verify(order_status_controller, times=0).order_status_usecase()
@@ -0,0 +1,75 @@
+from src.external.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def open_breaker(clock: FakeClock) -> CircuitBreaker:
+    breaker = CircuitBreaker(2, 30, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    return breaker
+
+
+def test_should_open_after_consecutive_failures():
+    breaker = CircuitBreaker(2, 30)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_should_let_a_single_probe_through_after_reset_timeout():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+
+    clock.now = 30
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_should_close_when_probe_succeeds():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+
+    clock.now = 30
+    breaker.allow()
+    breaker.record_success()
+
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_should_reopen_when_probe_fails():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+
+    clock.now = 30
+    breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.statistics()["opened"] == 2
+    assert not breaker.allow()
+
+
+def test_should_free_probe_slot_of_cancelled_calls():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+
+    clock.now = 30
+    breaker.allow()
+    breaker.record_cancelled()
+
+    assert breaker.allow()
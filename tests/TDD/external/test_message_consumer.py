@@ -0,0 +1,241 @@
+import asyncio
+import json
+import threading
+import time
+from typing import List
+
+from src.external.message_consumer import MessageConsumer, notification_content, dedupe_keys
+from src.external.message_dedupe import InMemoryDedupeStore
+from src.interfaces.gateways.message_dedupe_interface import CLAIMED
+
+QUEUE = "https://sqs.us-east-1.amazonaws.com/000000000000/payment-confirmation"
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def sns_message(message_id: str, content: dict, receive_count: int = 1) -> dict:
+    return {
+        "MessageId": message_id,
+        "ReceiptHandle": f"receipt-{message_id}",
+        "Body": json.dumps({"Message": json.dumps(content)}),
+        "Attributes": {"ApproximateReceiveCount": str(receive_count)},
+    }
+
+
+class FakeQueueClient:
+    def __init__(self, messages: List[dict]) -> None:
+        self._lock = threading.Lock()
+        self.messages = list(messages)
+        self.batch_sizes: List[int] = []
+        self.delete_batches: List[List[str]] = []
+        self.deleted: List[str] = []
+        self.visibility_changes: List[str] = []
+
+    def receive(self, queue: str, max_messages: int, wait_time_seconds: int, visibility_timeout: int) -> List[dict]:
+        with self._lock:
+            batch, self.messages = self.messages[:max_messages], self.messages[max_messages:]
+            self.batch_sizes.append(max_messages)
+        if not batch:
+            # Stands in for the long poll wait on an empty queue
+            time.sleep(0.01)
+        return batch
+
+    def delete_batch(self, queue: str, receipt_handles: List[str]) -> List[str]:
+        with self._lock:
+            self.delete_batches.append(receipt_handles)
+            self.deleted.extend(receipt_handles)
+        return []
+
+    def change_visibility(self, queue: str, receipt_handle: str, visibility_timeout: int) -> None:
+        with self._lock:
+            self.visibility_changes.append(receipt_handle)
+
+
+def message_consumer(
+    client: FakeQueueClient, max_concurrency: int = 10, visibility_timeout: int = 60, dedupe=None
+) -> MessageConsumer:
+    return MessageConsumer(max_concurrency, 20, visibility_timeout, 0.01, 0.05, 900, dedupe, client=client)
+
+
+def consume(consumer: MessageConsumer, until) -> None:
+    async def scenario():
+        await consumer.start()
+        for _ in range(500):
+            if until():
+                break
+            await asyncio.sleep(0.01)
+        await consumer.stop()
+
+    run(scenario())
+
+
+def test_should_decode_sns_notification():
+    assert notification_content(sns_message("1", {"order_id": "42"})) == {"order_id": "42"}
+
+
+def test_should_receive_in_batches_and_acknowledge_handled_messages():
+    client = FakeQueueClient([sns_message(str(n), {"n": n}) for n in range(25)])
+    handled = []
+    consumer = message_consumer(client)
+    consumer.register(QUEUE, lambda message: handled.append(notification_content(message)["n"]), "test")
+
+    consume(consumer, lambda: len(client.deleted) == 25)
+
+    assert sorted(handled) == list(range(25))
+    assert len(client.deleted) == 25
+    assert client.batch_sizes[0] == 10
+    assert all(len(batch) <= 10 for batch in client.delete_batches)
+    assert len(client.delete_batches) < 25
+    assert consumer.statistics()["queues"][0]["processed"] == 25
+    assert consumer.statistics()["queues"][0]["acked"] == 25
+
+
+def test_should_not_acknowledge_failed_messages():
+    client = FakeQueueClient([sns_message("ok", {"fail": False}), sns_message("bad", {"fail": True})])
+
+    def handler(message):
+        if notification_content(message)["fail"]:
+            raise ValueError("handler failed")
+
+    consumer = message_consumer(client)
+    consumer.register(QUEUE, handler, "test")
+
+    consume(consumer, lambda: consumer.statistics()["queues"][0]["failed"] == 1)
+
+    assert client.deleted == ["receipt-ok"]
+
+
+def test_should_cap_concurrent_handlers():
+    client = FakeQueueClient([sns_message(str(n), {"n": n}) for n in range(12)])
+    running = []
+    peak = []
+
+    async def handler(message):
+        running.append(message)
+        peak.append(len(running))
+        await asyncio.sleep(0.02)
+        running.remove(message)
+
+    consumer = message_consumer(client, max_concurrency=3)
+    consumer.register(QUEUE, handler, "test")
+
+    consume(consumer, lambda: len(client.deleted) == 12)
+
+    assert max(peak) == 3
+    assert max(client.batch_sizes) == 3
+
+
+def test_should_count_redelivered_messages():
+    client = FakeQueueClient([sns_message("first", {}), sns_message("again", {}, receive_count=3)])
+    consumer = message_consumer(client)
+    consumer.register(QUEUE, lambda message: None, "test")
+
+    consume(consumer, lambda: len(client.deleted) == 2)
+
+    assert consumer.statistics()["queues"][0]["redelivered"] == 1
+
+
+def test_should_extend_visibility_of_slow_handlers():
+    client = FakeQueueClient([sns_message("slow", {})])
+
+    async def handler(message):
+        await asyncio.sleep(0.05)
+
+    # A visibility timeout of 0.02s puts the heartbeat every 0.01s
+    consumer = message_consumer(client, visibility_timeout=0.02)
+    consumer.register(QUEUE, handler, "test")
+
+    consume(consumer, lambda: client.deleted == ["receipt-slow"])
+
+    assert len(client.visibility_changes) >= 2
+    assert consumer.statistics()["queues"][0]["heartbeats"] == len(client.visibility_changes)
+
+
+def test_should_skip_duplicate_events_before_handling():
+    client = FakeQueueClient([
+        sns_message("first", {"order_id": "1"}),
+        sns_message("first", {"order_id": "1"}, receive_count=2),
+        sns_message("republished", {"order_id": "1"}),
+        sns_message("other", {"order_id": "2"}),
+    ])
+    handled = []
+    consumer = message_consumer(client, max_concurrency=1, dedupe=InMemoryDedupeStore(100, 60))
+    consumer.register(
+        QUEUE, lambda message: handled.append(message["MessageId"]), "test", lambda content: content["order_id"]
+    )
+
+    consume(consumer, lambda: len(client.deleted) == 4)
+
+    assert handled == ["first", "other"]
+    statistics = consumer.statistics()["queues"][0]
+    assert statistics["duplicates"] == 2
+    assert statistics["duplicateRate"] == 0.5
+
+
+def test_should_only_skip_repeated_message_ids_without_event_key():
+    client = FakeQueueClient([
+        sns_message("first", {"order_id": "1"}),
+        sns_message("first", {"order_id": "1"}, receive_count=2),
+        sns_message("retried", {"order_id": "1"}),
+    ])
+    handled = []
+    consumer = message_consumer(client, max_concurrency=1, dedupe=InMemoryDedupeStore(100, 60))
+    consumer.register(QUEUE, lambda message: handled.append(message["MessageId"]), "test")
+
+    consume(consumer, lambda: len(client.deleted) == 3)
+
+    assert handled == ["first", "retried"]
+    assert consumer.statistics()["queues"][0]["duplicates"] == 1
+
+
+def test_should_release_dedupe_keys_of_failed_messages():
+    client = FakeQueueClient([sns_message("flaky", {"order_id": "1"}), sns_message("flaky", {"order_id": "1"})])
+    attempts = []
+
+    def handler(message):
+        attempts.append(message["MessageId"])
+        if len(attempts) == 1:
+            raise ValueError("handler failed")
+
+    consumer = message_consumer(client, max_concurrency=1, dedupe=InMemoryDedupeStore(100, 60))
+    consumer.register(QUEUE, handler, "test")
+
+    consume(consumer, lambda: len(client.deleted) == 1)
+
+    assert attempts == ["flaky", "flaky"]
+
+
+def test_should_handle_redelivery_once_lease_of_crashed_worker_lapses():
+    clock = FakeClock()
+    dedupe = InMemoryDedupeStore(100, 86400, clock=clock)
+    message = sns_message("crashed", {"order_id": "1"})
+    # The worker that received the message first died after claiming it, before its handler finished
+    assert dedupe.claim(dedupe_keys("test", message), 60) == CLAIMED
+    handled = []
+
+    client = FakeQueueClient([sns_message("crashed", {"order_id": "1"}, receive_count=2)])
+    consumer = message_consumer(client, max_concurrency=1, dedupe=dedupe)
+    consumer.register(QUEUE, lambda message: handled.append(message["MessageId"]), "test")
+    consume(consumer, lambda: consumer.statistics()["queues"][0]["deferred"] == 1)
+
+    assert handled == []
+    assert client.deleted == []
+
+    clock.now = 61
+    client = FakeQueueClient([sns_message("crashed", {"order_id": "1"}, receive_count=3)])
+    consumer = message_consumer(client, max_concurrency=1, dedupe=dedupe)
+    consumer.register(QUEUE, lambda message: handled.append(message["MessageId"]), "test")
+    consume(consumer, lambda: client.deleted == ["receipt-crashed"])
+
+    assert handled == ["crashed"]
+    assert consumer.statistics()["queues"][0]["duplicates"] == 0
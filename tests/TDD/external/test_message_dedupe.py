@@ -0,0 +1,96 @@
+import pytest
+from mockito import when, verify
+
+from src.external.message_dedupe import InMemoryDedupeStore, TieredDedupeStore
+from src.interfaces.gateways.message_dedupe_interface import CLAIMED, IN_PROGRESS, PROCESSED
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def unstub():
+    from mockito import unstub
+    yield
+    unstub()
+
+
+def test_should_tell_processed_keys_from_leased_ones():
+    store = InMemoryDedupeStore(100, 60)
+
+    assert store.claim(["message:1", "payment-confirmation:42"], 30) == CLAIMED
+    assert store.claim(["message:2", "payment-confirmation:42"], 30) == IN_PROGRESS
+
+    store.complete(["message:1", "payment-confirmation:42"])
+    assert store.claim(["message:2", "payment-confirmation:42"], 30) == PROCESSED
+    assert store.claim(["message:2"], 30) == CLAIMED
+
+
+def test_should_allow_claims_again_after_release_or_expiry():
+    clock = FakeClock()
+    store = InMemoryDedupeStore(100, 60, clock=clock)
+
+    store.claim(["message:1"], 30)
+    store.release(["message:1"])
+    assert store.claim(["message:1"], 30) == CLAIMED
+
+    store.complete(["message:1"])
+    store.release(["message:1"])
+    assert store.claim(["message:1"], 30) == PROCESSED
+
+    clock.now = 61
+    assert store.claim(["message:1"], 30) == CLAIMED
+
+
+def test_should_let_leases_lapse_unless_extended():
+    clock = FakeClock()
+    store = InMemoryDedupeStore(100, 60, clock=clock)
+
+    store.claim(["message:1"], 30)
+    clock.now = 20
+    store.extend(["message:1"], 30)
+    clock.now = 40
+    assert store.claim(["message:1"], 30) == IN_PROGRESS
+
+    clock.now = 51
+    assert store.claim(["message:1"], 30) == CLAIMED
+
+
+def test_should_stay_bounded():
+    store = InMemoryDedupeStore(2, 60)
+
+    for n in range(3):
+        store.complete([f"message:{n}"])
+
+    assert store.statistics()["size"] == 2
+    assert store.statistics()["evictions"] == 1
+    assert store.claim(["message:0"], 30) == CLAIMED
+
+
+def test_should_not_reach_shared_store_for_local_duplicates(unstub):
+    local = InMemoryDedupeStore(100, 60)
+    shared = InMemoryDedupeStore(100, 60)
+    store = TieredDedupeStore(local, shared)
+
+    when(shared).claim(["message:1"], 30).thenReturn(PROCESSED)
+
+    assert store.claim(["message:1"], 30) == PROCESSED
+    assert store.claim(["message:1"], 30) == PROCESSED
+    verify(shared, times=1).claim(["message:1"], 30)
+
+
+def test_should_release_local_claim_when_shared_store_fails(unstub):
+    local = InMemoryDedupeStore(100, 60)
+    shared = InMemoryDedupeStore(100, 60)
+    store = TieredDedupeStore(local, shared)
+
+    when(shared).claim(["message:1"], 30).thenRaise(RuntimeError("database unavailable"))
+
+    with pytest.raises(RuntimeError):
+        store.claim(["message:1"], 30)
+    assert local.claim(["message:1"], 30) == CLAIMED
@@ -0,0 +1,69 @@
+import asyncio
+import json
+import threading
+import uuid
+
+import pytest
+from mockito import when
+
+from src.config.config import settings
+from src.controllers.order_status_controller import OrderStatusController
+from src.external import messaging_listeners
+from src.external.messaging_listeners import handle_payment_confirmation, payment_confirmation_key
+
+
+@pytest.fixture
+def unstub():
+    from mockito import unstub
+    yield
+    unstub()
+
+
+def payment_confirmation(order_id: uuid.UUID) -> dict:
+    content = {"order_id": str(order_id), "payment_status": "Confirmado"}
+    return {"MessageId": "1", "Body": json.dumps({"Message": json.dumps(content)})}
+
+
+def test_should_change_status_off_the_loop_in_sync_mode(unstub, monkeypatch):
+    monkeypatch.setattr(settings.db, "POSTGRES_ASYNC_ENABLED", False)
+    threads = []
+
+    async def change_order_status_in_progress(order_id, payment_status):
+        threads.append(threading.get_ident())
+        return {}
+
+    when(OrderStatusController).change_order_status_in_progress(...).thenAnswer(change_order_status_in_progress)
+    when(messaging_listeners).customer_phone(...).thenRaise(RuntimeError("orders service unavailable"))
+
+    async def scenario():
+        await handle_payment_confirmation(payment_confirmation(uuid.uuid4()))
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+
+    assert len(threads) == 1
+    assert threads[0] != loop_thread
+
+
+def test_should_pass_the_order_id_as_uuid(unstub, monkeypatch):
+    monkeypatch.setattr(settings.db, "POSTGRES_ASYNC_ENABLED", False)
+    order_id = uuid.uuid4()
+    order_ids = []
+
+    async def change_order_status_in_progress(order_id, payment_status):
+        order_ids.append(order_id)
+        return {}
+
+    when(OrderStatusController).change_order_status_in_progress(...).thenAnswer(change_order_status_in_progress)
+    when(messaging_listeners).customer_phone(...).thenRaise(RuntimeError("orders service unavailable"))
+
+    asyncio.run(handle_payment_confirmation(payment_confirmation(order_id)))
+
+    # Writes are pinned for read-your-writes under this key, and the API looks them up by uuid.UUID
+    assert order_ids == [order_id]
+    assert isinstance(order_ids[0], uuid.UUID)
+
+
+def test_should_key_payment_confirmations_by_order_and_status():
+    assert payment_confirmation_key({"order_id": "42", "payment_status": "Confirmado"}) == "42:Confirmado"
+    assert payment_confirmation_key({"order_id": "42", "payment_status": "Negado"}) == "42:Negado"
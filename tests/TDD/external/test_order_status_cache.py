@@ -0,0 +1,125 @@
+import json
+import uuid
+from typing import Dict, List, Optional
+
+from src.entities.models.order_status_entity import OrderStatus, Status
+from src.external.order_status_cache import InMemoryCacheBackend, RedisCacheBackend
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.values: Dict[str, str] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        return self.values.get(key)
+
+    def register_script(self, script: str):
+        # Stands in for the version guarded SET_IF_NOT_OLDER script
+        def set_if_not_older(keys: List[str], args: list) -> int:
+            cached = self.values.get(keys[0])
+            if cached is not None and json.loads(cached)[3] > int(args[1]):
+                return 0
+            self.values[keys[0]] = args[0]
+            return 1
+        return set_if_not_older
+
+    def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+
+def test_should_expire_entries_after_ttl():
+    clock = FakeClock()
+    cache = InMemoryCacheBackend(max_entries=10, ttl_seconds=5, clock=clock)
+    order = OrderStatus.create_new_order_status(uuid.uuid4())
+
+    cache.set(order)
+    assert cache.get(order.order_id) == order
+
+    clock.now = 6
+    assert cache.get(order.order_id) is None
+
+    statistics = cache.statistics()
+    assert statistics["hits"] == 1
+    assert statistics["misses"] == 1
+    assert statistics["expirations"] == 1
+
+
+def test_should_evict_least_recently_used_entry():
+    cache = InMemoryCacheBackend(max_entries=2, ttl_seconds=60)
+    first, second, third = [OrderStatus.create_new_order_status(uuid.uuid4()) for _ in range(3)]
+
+    cache.set(first)
+    cache.set(second)
+    cache.get(first.order_id)
+    cache.set(third)
+
+    assert cache.get(second.order_id) is None
+    assert cache.get(first.order_id) == first
+    assert cache.statistics()["evictions"] == 1
+
+
+def test_should_not_share_cached_entities_with_callers():
+    cache = InMemoryCacheBackend(max_entries=2, ttl_seconds=60)
+    order = OrderStatus.create_new_order_status(uuid.uuid4())
+    cache.set(order)
+
+    cache.get(order.order_id).confirm_order()
+
+    assert cache.get(order.order_id).order_status == Status.PENDING
+
+
+def test_should_round_trip_entities_through_redis_backend():
+    cache = RedisCacheBackend("redis://localhost", ttl_seconds=5, client=FakeRedis())
+    order = OrderStatus.create_new_order_status(uuid.uuid4())
+
+    cache.set(order)
+    assert cache.get(order.order_id) == order
+
+    cache.delete(order.order_id)
+    assert cache.get(order.order_id) is None
+    assert cache.statistics()["hitRatio"] == 0.5
+
+
+def test_should_keep_newer_version_in_redis_backend():
+    cache = RedisCacheBackend("redis://localhost", ttl_seconds=5, client=FakeRedis())
+    order = OrderStatus.create_new_order_status(uuid.uuid4())
+    confirmed = OrderStatus(order.order_id, order.creation_date, Status.CONFIRMED, order.version + 1)
+
+    cache.set(confirmed)
+    cache.set(order)
+
+    assert cache.get(order.order_id) == confirmed
+
+
+def test_should_keep_newer_cached_version():
+    cache = InMemoryCacheBackend(max_entries=2, ttl_seconds=60)
+    order = OrderStatus.create_new_order_status(uuid.uuid4())
+    confirmed = OrderStatus(order.order_id, order.creation_date, Status.CONFIRMED, order.version + 1)
+
+    cache.set(confirmed)
+    cache.set(order)
+    assert cache.get(order.order_id) == confirmed
+
+    cache.refresh(order)
+    assert cache.get(order.order_id) == confirmed
+
+    in_progress = OrderStatus(order.order_id, order.creation_date, Status.IN_PROGRESS, order.version + 2)
+    cache.refresh(in_progress)
+    assert cache.get(order.order_id) == in_progress
+
+
+def test_should_not_cache_refreshed_orders_that_were_not_cached():
+    cache = InMemoryCacheBackend(max_entries=2, ttl_seconds=60)
+    order = OrderStatus.create_new_order_status(uuid.uuid4())
+
+    cache.refresh(order)
+
+    assert cache.get(order.order_id) is None
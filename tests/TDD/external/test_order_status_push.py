@@ -0,0 +1,142 @@
+import asyncio
+import datetime
+import json
+import uuid
+
+from src.adapters.order_sse_adapter import order_status_events, order_status_event
+from src.entities.models.order_status_entity import OrderStatus, Status
+from src.external import order_status_push
+from src.external.order_status_cache import InMemoryCacheBackend
+from src.external.order_status_push import OrderStatusHub, OrderStatusNotificationListener, parse_notification
+from src.usecases.kitchen_board import KitchenBoard
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def drain():
+    # publish hands events over with call_soon_threadsafe, so they land on the next loop iteration
+    await asyncio.sleep(0)
+
+
+def test_should_deliver_updates_to_order_and_board_subscribers():
+    async def scenario():
+        hub = OrderStatusHub(max_queue_size=10)
+        order = OrderStatus.create_new_order_status(uuid.uuid4())
+        order_subscription = hub.subscribe(order.order_id)
+        other_subscription = hub.subscribe(uuid.uuid4())
+        board_subscription = hub.subscribe()
+
+        hub.publish(order)
+        await drain()
+
+        assert order_subscription.queue.get_nowait() == order
+        assert board_subscription.queue.get_nowait() == order
+        assert other_subscription.queue.empty()
+        assert hub.statistics() == {"orderSubscribers": 2, "boardSubscribers": 1, "published": 1}
+
+    run(scenario())
+
+
+def test_should_drop_oldest_update_for_slow_subscribers():
+    async def scenario():
+        hub = OrderStatusHub(max_queue_size=2)
+        order = OrderStatus.create_new_order_status(uuid.uuid4())
+        subscription = hub.subscribe(order.order_id)
+
+        for order_status in (Status.PENDING, Status.CONFIRMED, Status.IN_PROGRESS):
+            hub.publish(OrderStatus(order.order_id, order.creation_date, order_status, order.version))
+        await drain()
+
+        assert subscription.dropped == 1
+        assert subscription.queue.get_nowait().order_status == Status.CONFIRMED
+        assert subscription.queue.get_nowait().order_status == Status.IN_PROGRESS
+
+    run(scenario())
+
+
+def test_should_stop_delivering_after_unsubscribe():
+    async def scenario():
+        hub = OrderStatusHub(max_queue_size=10)
+        order = OrderStatus.create_new_order_status(uuid.uuid4())
+        subscription = hub.subscribe(order.order_id)
+
+        hub.unsubscribe(subscription)
+        hub.publish(order)
+        await drain()
+
+        assert subscription.queue.empty()
+        assert hub.statistics()["orderSubscribers"] == 0
+
+    run(scenario())
+
+
+def test_should_parse_trigger_notification_payload():
+    order_id = uuid.uuid4()
+    payload = json.dumps({
+        "order_id": str(order_id),
+        "creation_date": "2024-01-02T03:04:05.000006",
+        "order_status": Status.CONFIRMED,
+        "version": 2,
+    })
+
+    assert parse_notification(payload) == (
+        order_id, OrderStatus(order_id, datetime.datetime(2024, 1, 2, 3, 4, 5, 6), Status.CONFIRMED, 2)
+    )
+
+
+def test_should_parse_deleted_row_notification():
+    order_id = uuid.uuid4()
+    payload = json.dumps({"order_id": str(order_id), "version": 3, "deleted": True})
+
+    assert parse_notification(payload) == (order_id, None)
+
+
+def test_should_drop_deleted_orders_from_board_and_cache(monkeypatch):
+    board = KitchenBoard(max_age_seconds=60)
+    cache = InMemoryCacheBackend(max_entries=10, ttl_seconds=60)
+    monkeypatch.setattr(order_status_push, "kitchen_board", board)
+    monkeypatch.setattr(order_status_push, "order_status_cache", cache)
+    listener = OrderStatusNotificationListener(OrderStatusHub(max_queue_size=10))
+    order = OrderStatus(uuid.uuid4(), datetime.datetime(2024, 1, 2), Status.CONFIRMED, 1)
+    board.apply(order)
+    cache.set(order)
+
+    listener.dispatch_removal(order.order_id)
+    listener.dispatch(OrderStatus(order.order_id, order.creation_date, Status.IN_PROGRESS, 2))
+
+    assert board.snapshot()[1] == []
+    assert cache.get(order.order_id) is None
+
+
+def test_should_stream_initial_state_updates_and_heartbeats():
+    async def scenario():
+        order = OrderStatus.create_new_order_status(uuid.uuid4())
+        queue: asyncio.Queue = asyncio.Queue()
+        disconnected = iter([False, False, True])
+
+        async def is_disconnected():
+            return next(disconnected)
+
+        queue.put_nowait(order)
+        return [event async for event in order_status_events("initial\n\n", queue, is_disconnected, 0.01)]
+
+    events = run(scenario())
+
+    assert events[0] == "initial\n\n"
+    assert events[1].startswith("event: order-status\ndata: {")
+    assert events[2] == ": heartbeat\n\n"
+
+
+def test_should_format_order_status_event():
+    order = OrderStatus(uuid.uuid4(), datetime.datetime(2024, 1, 2, 3, 4, 5), Status.CONFIRMED, 1)
+
+    event = order_status_event(order)
+
+    assert event.endswith("\n\n")
+    assert json.loads(event.split("data: ", 1)[1]) == {
+        "orderId": str(order.order_id),
+        "creationDate": "2024-01-02T03:04:05",
+        "orderStatus": "Confirmado",
+    }
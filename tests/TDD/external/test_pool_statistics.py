@@ -0,0 +1,44 @@
+import sqlite3
+
+from src.external.postgresql_database import InstrumentedQueuePool
+
+
+def create_pool(**kwargs) -> InstrumentedQueuePool:
+    return InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), **kwargs)
+
+
+def test_should_report_checked_out_and_idle_connections():
+    pool = create_pool(pool_size=2, max_overflow=1)
+
+    first = pool.connect()
+    second = pool.connect()
+    third = pool.connect()
+
+    statistics = pool.statistics()
+    assert statistics["checkedOut"] == 3
+    assert statistics["overflow"] == 1
+    assert statistics["checkouts"] == 3
+
+    third.close()
+    second.close()
+
+    statistics = pool.statistics()
+    assert statistics["checkedOut"] == 1
+    assert statistics["idle"] == 2
+    first.close()
+
+
+def test_should_count_checkout_timeouts():
+    pool = create_pool(pool_size=1, max_overflow=0, timeout=0.01)
+    connection = pool.connect()
+
+    try:
+        pool.connect()
+        assert False
+    except Exception:
+        assert True
+
+    statistics = pool.statistics()
+    assert statistics["checkoutTimeouts"] == 1
+    assert statistics["waitTimeMaxMs"] >= 10
+    connection.close()
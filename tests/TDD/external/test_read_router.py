@@ -0,0 +1,47 @@
+import uuid
+
+from src.external.postgresql_database import ReadRouter, read_from_primary
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_should_read_from_primary_without_replica():
+    router = ReadRouter(has_replica=False, read_your_writes_seconds=5)
+
+    assert not router.use_replica(uuid.uuid4())
+    assert router.statistics()["primaryReads"] == 1
+
+
+def test_should_pin_recently_written_orders_to_primary():
+    clock = FakeClock()
+    router = ReadRouter(has_replica=True, read_your_writes_seconds=5, clock=clock)
+    order_id = uuid.uuid4()
+
+    router.record_writes([order_id])
+
+    assert not router.use_replica(order_id)
+    assert router.use_replica(uuid.uuid4())
+    assert router.use_replica()
+
+    clock.now = 6
+    assert router.use_replica(order_id)
+
+    statistics = router.statistics()
+    assert statistics["pinnedReads"] == 1
+    assert statistics["replicaReads"] == 3
+    assert statistics["pinnedOrders"] == 0
+
+
+def test_should_force_primary_reads_inside_context():
+    router = ReadRouter(has_replica=True, read_your_writes_seconds=5)
+
+    with read_from_primary():
+        assert not router.use_replica()
+    assert router.use_replica()
+    assert router.statistics()["forcedPrimaryReads"] == 1
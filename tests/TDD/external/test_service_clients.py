@@ -0,0 +1,136 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.config.errors import ServiceUnavailable
+from src.external.circuit_breaker import CircuitBreaker, OPEN
+from src.external.service_clients import ServiceClient
+from src.utils.deadline import deadline
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def service_client(handler, failure_threshold: int = 5, hedge_delay_seconds: float = 0) -> ServiceClient:
+    return ServiceClient(
+        "payments", "http://payments.local/api", 5, 1, 2, 30, CircuitBreaker(failure_threshold, 30),
+        hedge_delay_seconds, transport=httpx.MockTransport(handler)
+    )
+
+
+def test_should_resolve_paths_against_service_url():
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        return httpx.Response(200, json={"result": {"paymentStatus": "Pago"}})
+
+    client = service_client(handler)
+
+    async def scenario():
+        response = await client.get("/payments/id/42")
+        await client.close()
+        return response
+
+    assert run(scenario()).json() == {"result": {"paymentStatus": "Pago"}}
+    assert requested == ["http://payments.local/api/payments/id/42"]
+
+
+def test_should_reuse_client_until_closed():
+    client = service_client(lambda request: httpx.Response(200))
+
+    async def scenario():
+        client.start()
+        first = client._client
+        await client.get("/payments/id/1")
+        await client.post("/payments/mercado-pago", json={"order_id": "1"})
+        reused = client._client is first
+        await client.close()
+        return reused, client._client
+
+    assert run(scenario()) == (True, None)
+
+
+def test_should_record_latency_and_failures():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/down"):
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200)
+
+    client = service_client(handler)
+
+    async def scenario():
+        await client.get("/payments/id/1")
+        with pytest.raises(ServiceUnavailable):
+            await client.get("/down")
+        await client.close()
+
+    run(scenario())
+
+    statistics = client.statistics()
+    assert statistics["requests"] == 2
+    assert statistics["failed"] == 1
+    assert statistics["inFlight"] == 0
+    assert statistics["peakInFlight"] == 1
+    assert statistics["maxConnections"] == 2
+    assert statistics["latencyMaxMs"] >= statistics["latencyAvgMs"] >= 0
+
+
+def test_should_fail_fast_once_breaker_opens():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503)
+
+    client = service_client(handler, failure_threshold=2)
+
+    async def scenario():
+        await client.get("/payments/id/1")
+        await client.get("/payments/id/1")
+        with pytest.raises(ServiceUnavailable):
+            await client.get("/payments/id/1")
+        await client.close()
+
+    run(scenario())
+
+    assert len(calls) == 2
+    assert client.statistics()["breaker"]["state"] == OPEN
+    assert client.statistics()["breaker"]["rejected"] == 1
+
+
+def test_should_not_call_once_deadline_has_passed():
+    calls = []
+    client = service_client(lambda request: calls.append(request) or httpx.Response(200))
+
+    async def scenario():
+        with deadline(0):
+            with pytest.raises(ServiceUnavailable):
+                await client.get("/payments/id/1")
+
+    run(scenario())
+
+    assert calls == []
+
+
+def test_should_hedge_slow_gets():
+    attempts = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) == 1:
+            await asyncio.sleep(1)
+        return httpx.Response(200, json={"attempt": len(attempts)})
+
+    client = service_client(handler, hedge_delay_seconds=0.01)
+
+    async def scenario():
+        response = await client.get("/payments/id/1")
+        await client.close()
+        return response
+
+    assert run(scenario()).json() == {"attempt": 2}
+    assert client.statistics()["hedges"] == 1
+    assert client.statistics()["hedgeWins"] == 1
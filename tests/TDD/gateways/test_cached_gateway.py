@@ -0,0 +1,77 @@
+import uuid
+
+import pytest
+from mockito import when, verify
+
+from src.entities.models.order_status_entity import OrderStatus, Status, OrderStatusProjection
+from src.external.order_status_cache import InMemoryCacheBackend
+from src.gateways.cached_gateways.order_status_cached_gateway import CachedOrderStatusRepository
+from tests.TDD.gateways.test_postgres_gateway import MockRepository
+
+
+@pytest.fixture
+def unstub():
+    from mockito import unstub
+    yield
+    unstub()
+
+
+@pytest.fixture
+def cached_repository():
+    order_status_repo = MockRepository()
+    return order_status_repo, CachedOrderStatusRepository(order_status_repo, InMemoryCacheBackend(100, 60))
+
+
+def test_should_read_through_cache_on_repeated_lookups(cached_repository, unstub):
+    order_status_repo, repository = cached_repository
+    order = OrderStatus.create_new_order_status(uuid.uuid4())
+
+    when(order_status_repo).get_by_id(order.order_id).thenReturn(order)
+
+    assert repository.get_by_id(order.order_id) == order
+    assert repository.get_order_status(order.order_id) == OrderStatusProjection(order.order_id, order.order_status)
+
+    verify(order_status_repo, times=1).get_by_id(order.order_id)
+    verify(order_status_repo, times=0).get_order_status(order.order_id)
+
+
+def test_should_not_cache_status_projection_misses(cached_repository, unstub):
+    order_status_repo, repository = cached_repository
+    projection = OrderStatusProjection(uuid.uuid4(), Status.PENDING)
+
+    when(order_status_repo).get_order_status(projection.order_id).thenReturn(projection)
+
+    assert repository.get_order_status(projection.order_id) == projection
+    assert repository.get_order_status(projection.order_id) == projection
+
+    verify(order_status_repo, times=2).get_order_status(projection.order_id)
+
+
+def test_should_refresh_entry_after_transition(cached_repository, unstub):
+    order_status_repo, repository = cached_repository
+    order = OrderStatus.create_new_order_status(uuid.uuid4())
+    confirmed = OrderStatus(order.order_id, order.creation_date, Status.CONFIRMED, 2)
+
+    when(order_status_repo).create_order_status(order).thenReturn(order)
+    when(order_status_repo).transition(order.order_id, Status.PENDING, Status.CONFIRMED).thenReturn(confirmed)
+    when(order_status_repo).get_by_id(order.order_id).thenReturn(order)
+
+    repository.create_order_status(order)
+    repository.transition(order.order_id, Status.PENDING, Status.CONFIRMED)
+
+    assert repository.get_by_id(order.order_id).order_status == Status.CONFIRMED
+    verify(order_status_repo, times=0).get_by_id(order.order_id)
+
+
+def test_should_invalidate_entry_on_remove(cached_repository, unstub):
+    order_status_repo, repository = cached_repository
+    order = OrderStatus.create_new_order_status(uuid.uuid4())
+
+    when(order_status_repo).create_order_status(order).thenReturn(order)
+    when(order_status_repo).remove_order_status(order.order_id).thenReturn(None)
+    when(order_status_repo).get_by_id(order.order_id).thenReturn(None)
+
+    repository.create_order_status(order)
+    repository.remove_order_status(order.order_id)
+
+    assert repository.get_by_id(order.order_id) is None
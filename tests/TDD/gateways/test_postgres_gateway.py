@@ -1,10 +1,11 @@
+import datetime
 import uuid
-from typing import List
+from typing import List, Optional, Tuple, Iterator
 
 import pytest
 from mockito import when, verify, ANY
 
-from src.entities.models.order_status_entity import OrderStatus, Status
+from src.entities.models.order_status_entity import OrderStatus, Status, OrderStatusProjection
 from src.interfaces.gateways.order_status_gateway_interface import IOrderStatusGateway
 from tests.utils.order_status_helper import OrderStatusHelper
 
@@ -14,10 +15,24 @@ class MockRepository(IOrderStatusGateway):
     def get_by_id(self, order_id: uuid.UUID) -> OrderStatus:
         pass
 
-    def get_order_status(self, order_id: uuid.UUID) -> OrderStatus:
+    def get_order_status(self, order_id: uuid.UUID) -> Optional[OrderStatusProjection]:
         pass
 
-    def get_all(self) -> List[OrderStatus]:
+    def get_many(self, order_ids: List[uuid.UUID]) -> List[OrderStatus]:
+        pass
+
+    def get_all(
+        self, limit: Optional[int] = None, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None
+    ) -> List[OrderStatus]:
+        pass
+
+    def stream_orders(
+        self,
+        order_status: Optional[str],
+        start_date: Optional[datetime.datetime],
+        end_date: Optional[datetime.datetime],
+        batch_size: int
+    ) -> Iterator[OrderStatus]:
         pass
 
     def list_ongoing_orders(self) -> List[OrderStatus]:
@@ -26,9 +41,23 @@ class MockRepository(IOrderStatusGateway):
     def create_order_status(self, order_in: OrderStatus) -> OrderStatus:
         pass
 
+    def create_many(self, orders_in: List[OrderStatus]) -> List[OrderStatus]:
+        pass
+
     def update(self, order_id: uuid.UUID, order_in: OrderStatus) -> OrderStatus:
         pass
 
+    def transition(self, order_id: uuid.UUID, from_status: str, to_status: str) -> Optional[OrderStatus]:
+        pass
+
+    def transition_many(
+        self, order_ids: List[uuid.UUID], from_status: str, to_status: str
+    ) -> List[OrderStatus]:
+        pass
+
+    def archive_finalized(self, finalized_before: datetime.datetime, batch_size: int) -> int:
+        pass
+
     def remove_order_status(self, order_id: uuid.UUID) -> None:
         pass
 
@@ -0,0 +1,143 @@
+import dataclasses
+import datetime
+import uuid
+
+import pytest
+from mockito import when, verify
+
+from src.entities.models.order_status_entity import OrderStatus, Status, PaymentStatus
+from src.usecases.kitchen_board import KitchenBoard
+from src.usecases.order_status_usecase import OrderStatusUseCase
+from tests.TDD.usecases.test_order_status_usecase import MockRepository
+
+
+@pytest.fixture
+def unstub():
+    from mockito import unstub
+    yield
+    unstub()
+
+
+def order_with_status(order_status: str, minutes_ago: int = 0) -> OrderStatus:
+    creation_date = datetime.datetime.now() - datetime.timedelta(minutes=minutes_ago)
+    return OrderStatus(uuid.uuid4(), creation_date, order_status, 1)
+
+
+def test_should_order_board_by_status_priority_and_creation_date():
+    board = KitchenBoard(max_age_seconds=60)
+    confirmed = order_with_status(Status.CONFIRMED, minutes_ago=10)
+    older_in_progress = order_with_status(Status.IN_PROGRESS, minutes_ago=5)
+    newer_in_progress = order_with_status(Status.IN_PROGRESS, minutes_ago=1)
+    ready = order_with_status(Status.READY)
+
+    board.finish_rebuild([confirmed, newer_in_progress, ready, older_in_progress], board.start_rebuild())
+    _, orders = board.snapshot()
+
+    assert orders == [ready, older_in_progress, newer_in_progress, confirmed]
+
+
+def test_should_bump_version_only_when_board_changes():
+    board = KitchenBoard(max_age_seconds=60)
+    order = order_with_status(Status.CONFIRMED)
+
+    board.apply(order_with_status(Status.PENDING))
+    assert board.version == 0
+
+    board.apply(order)
+    in_progress = dataclasses.replace(order, order_status=Status.IN_PROGRESS, version=2)
+    board.apply(in_progress)
+    assert board.version == 2
+
+    board.apply(dataclasses.replace(in_progress))
+    assert board.version == 2
+
+    board.apply(dataclasses.replace(in_progress, order_status=Status.FINALIZED, version=3))
+    assert board.version == 3
+    assert board.snapshot()[1] == []
+
+
+def test_should_ignore_updates_delivered_out_of_order():
+    board = KitchenBoard(max_age_seconds=60)
+    confirmed = order_with_status(Status.CONFIRMED)
+    in_progress = dataclasses.replace(confirmed, order_status=Status.IN_PROGRESS, version=2)
+    finalized = dataclasses.replace(confirmed, order_status=Status.FINALIZED, version=3)
+
+    board.apply(in_progress)
+    board.apply(confirmed)
+    assert board.snapshot() == (1, [in_progress])
+
+    board.apply(finalized)
+    board.apply(in_progress)
+    board.apply(confirmed)
+    assert board.snapshot() == (2, [])
+
+
+def test_should_keep_removed_orders_off_the_board():
+    board = KitchenBoard(max_age_seconds=60)
+    order = order_with_status(Status.CONFIRMED)
+
+    board.apply(order)
+    board.remove(order.order_id)
+    board.apply(dataclasses.replace(order, order_status=Status.IN_PROGRESS, version=2))
+    assert board.snapshot()[1] == []
+
+    board.finish_rebuild([order], board.start_rebuild())
+    assert board.snapshot()[1] == []
+
+
+def test_should_replay_changes_applied_while_rebuilding():
+    board = KitchenBoard(max_age_seconds=60)
+    order = order_with_status(Status.IN_PROGRESS)
+
+    started_at_version = board.start_rebuild()
+    board.apply(order_with_status(Status.READY, minutes_ago=1))
+    ready_order = OrderStatus(order.order_id, order.creation_date, Status.READY, order.version + 1)
+    board.apply(ready_order)
+    board.finish_rebuild([order], started_at_version)
+
+    _, orders = board.snapshot()
+    assert len(orders) == 2
+    assert ready_order in orders
+
+
+def test_should_keep_snapshot_rows_newer_than_replayed_changes():
+    board = KitchenBoard(max_age_seconds=60)
+    order = order_with_status(Status.CONFIRMED)
+    ready_order = OrderStatus(order.order_id, order.creation_date, Status.READY, order.version + 2)
+
+    started_at_version = board.start_rebuild()
+    board.apply(OrderStatus(order.order_id, order.creation_date, Status.IN_PROGRESS, order.version + 1))
+    board.finish_rebuild([ready_order], started_at_version)
+
+    assert board.snapshot()[1] == [ready_order]
+
+
+def test_should_need_rebuild_only_when_unloaded_or_stale():
+    board = KitchenBoard(max_age_seconds=60)
+    assert board.needs_rebuild()
+
+    board.finish_rebuild([], board.start_rebuild())
+    assert not board.needs_rebuild()
+
+    board.invalidate()
+    assert board.needs_rebuild()
+
+
+def test_should_serve_ongoing_orders_from_board_after_first_load(unstub):
+    order_status_repo = MockRepository()
+    board = KitchenBoard(max_age_seconds=60)
+    order_status_usecase = OrderStatusUseCase(order_status_repo, board)
+    confirmed = order_with_status(Status.CONFIRMED)
+
+    when(order_status_repo).list_ongoing_orders().thenReturn([confirmed])
+    when(order_status_repo).transition(confirmed.order_id, Status.CONFIRMED, Status.IN_PROGRESS).thenReturn(
+        OrderStatus(confirmed.order_id, confirmed.creation_date, Status.IN_PROGRESS, confirmed.version + 1)
+    )
+
+    first_version, _ = order_status_usecase.get_kitchen_board()
+    order_status_usecase.change_order_status_in_progress(confirmed.order_id, PaymentStatus.CONFIRMED)
+    version, orders = order_status_usecase.get_kitchen_board()
+
+    verify(order_status_repo, times=1).list_ongoing_orders()
+    assert version > first_version
+    assert [order.order_status for order in orders] == [Status.IN_PROGRESS]
@@ -0,0 +1,214 @@
+import asyncio
+import datetime
+import uuid
+from typing import List, Dict, Optional, Tuple, AsyncIterator
+
+import pytest
+
+from src.config.errors import ResourceNotFound
+from src.entities.errors.order_status_error import OrderStatusError
+from src.entities.models.order_status_entity import OrderStatus, Status, PaymentStatus, OrderStatusProjection
+from src.entities.schemas.order_status_dto import ChangeOrderStatusBatchDTO
+from src.interfaces.gateways.order_status_async_gateway_interface import IAsyncOrderStatusGateway
+from src.usecases.order_status_async_usecase import AsyncOrderStatusUseCase
+from tests.utils.order_status_helper import OrderStatusHelper
+
+
+class InMemoryAsyncRepository(IAsyncOrderStatusGateway):
+    def __init__(self) -> None:
+        self.orders: Dict[uuid.UUID, OrderStatus] = {}
+        self.archived_orders: Dict[uuid.UUID, OrderStatus] = {}
+
+    async def get_by_id(self, order_id: uuid.UUID) -> OrderStatus:
+        return self.orders.get(order_id) or self.archived_orders.get(order_id)
+
+    async def get_order_status(self, order_id: uuid.UUID) -> Optional[OrderStatusProjection]:
+        order_status = self.orders.get(order_id)
+        return OrderStatusProjection(order_id, order_status.order_status) if order_status else None
+
+    async def get_many(self, order_ids: List[uuid.UUID]) -> List[OrderStatus]:
+        return [self.orders[order_id] for order_id in order_ids if order_id in self.orders]
+
+    async def get_all(
+        self, limit: Optional[int] = None, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None
+    ) -> List[OrderStatus]:
+        orders = sorted(self.orders.values(), key=lambda order: (order.creation_date, order.order_id))
+        if after:
+            orders = [order for order in orders if (order.creation_date, order.order_id) > after]
+        return orders[:limit] if limit else orders
+
+    async def stream_orders(
+        self,
+        order_status: Optional[str],
+        start_date: Optional[datetime.datetime],
+        end_date: Optional[datetime.datetime],
+        batch_size: int
+    ) -> AsyncIterator[OrderStatus]:
+        for order in await self.get_all():
+            if not order_status or order.order_status == order_status:
+                yield order
+
+    async def list_ongoing_orders(self) -> List[OrderStatus]:
+        return [
+            order for order in self.orders.values()
+            if order.order_status not in (Status.PENDING, Status.FINALIZED)
+        ]
+
+    async def create_order_status(self, order_in: OrderStatus) -> OrderStatus:
+        self.orders[order_in.order_id] = order_in
+        return order_in
+
+    async def create_many(self, orders_in: List[OrderStatus]) -> List[OrderStatus]:
+        created = [order for order in orders_in if order.order_id not in self.orders]
+        for order in created:
+            self.orders[order.order_id] = order
+        return created
+
+    async def update(self, order_id: uuid.UUID, order_in: OrderStatus) -> OrderStatus:
+        self.orders[order_id] = order_in
+        return order_in
+
+    async def transition(self, order_id: uuid.UUID, from_status: str, to_status: str) -> Optional[OrderStatus]:
+        order = self.orders.get(order_id)
+        if order is None or order.order_status != from_status:
+            return None
+        order.order_status = to_status
+        return order
+
+    async def transition_many(
+        self, order_ids: List[uuid.UUID], from_status: str, to_status: str
+    ) -> List[OrderStatus]:
+        updated = []
+        for order_id in order_ids:
+            order = await self.transition(order_id, from_status, to_status)
+            if order:
+                updated.append(order)
+        return updated
+
+    async def archive_finalized(self, finalized_before: datetime.datetime, batch_size: int) -> int:
+        batch = [
+            order for order in await self.get_all()
+            if order.order_status == Status.FINALIZED and order.creation_date < finalized_before
+        ][:batch_size]
+        for order in batch:
+            self.archived_orders[self.orders.pop(order.order_id).order_id] = order
+        return len(batch)
+
+    async def remove_order_status(self, order_id: uuid.UUID) -> None:
+        self.orders.pop(order_id, None)
+        self.archived_orders.pop(order_id, None)
+
+
+@pytest.fixture
+def order_status_repo():
+    return InMemoryAsyncRepository()
+
+
+@pytest.fixture
+def order_status_usecase(order_status_repo):
+    return AsyncOrderStatusUseCase(order_status_repo)
+
+
+def test_should_allow_register_order_status(order_status_usecase, order_status_repo):
+    order_status_dto = OrderStatusHelper.generate_order_status_request()
+
+    created_order_status = asyncio.run(order_status_usecase.create_order_status(order_status_dto))
+
+    assert created_order_status.order_id == order_status_dto.order_id
+    assert created_order_status.order_status == Status.PENDING
+    assert order_status_dto.order_id in order_status_repo.orders
+
+
+def test_should_raise_exception_invalid_id(order_status_usecase):
+    with pytest.raises(ResourceNotFound):
+        asyncio.run(order_status_usecase.get_by_id(uuid.uuid4()))
+
+
+def test_should_allow_full_order_lifecycle(order_status_usecase, order_status_repo):
+    order_status = OrderStatusHelper.generate_order_status_entity()
+    order_id = order_status.order_id
+    order_status_repo.orders[order_id] = order_status
+
+    async def lifecycle():
+        await order_status_usecase.confirm_order(order_id)
+        await order_status_usecase.change_order_status_in_progress(order_id, PaymentStatus.CONFIRMED)
+        ongoing = await order_status_usecase.list_ongoing_orders()
+        await order_status_usecase.change_order_status_ready(order_id)
+        finalized = await order_status_usecase.change_order_status_finalized(order_id)
+        return ongoing, finalized
+
+    ongoing, finalized = asyncio.run(lifecycle())
+
+    assert [order.order_id for order in ongoing] == [order_id]
+    assert finalized.order_status == Status.FINALIZED
+
+
+def test_should_not_allow_skipping_states(order_status_usecase, order_status_repo):
+    order_status = OrderStatusHelper.generate_order_status_entity()
+    order_status_repo.orders[order_status.order_id] = order_status
+
+    with pytest.raises(OrderStatusError, match="Order not yet in progress!"):
+        asyncio.run(order_status_usecase.change_order_status_ready(order_status.order_id))
+
+
+def test_should_stream_orders_filtered_by_status(order_status_usecase, order_status_repo):
+    pending_order = OrderStatusHelper.generate_order_status_entity()
+    ready_order = OrderStatusHelper.generate_order_status_entity()
+    ready_order.order_status = Status.READY
+    order_status_repo.orders[pending_order.order_id] = pending_order
+    order_status_repo.orders[ready_order.order_id] = ready_order
+
+    async def collect():
+        return [order async for order in order_status_usecase.stream_orders(Status.READY, None, None, 100)]
+
+    assert asyncio.run(collect()) == [ready_order]
+
+
+def test_should_report_per_order_results_on_batch_transition(order_status_usecase, order_status_repo):
+    in_progress_order = OrderStatusHelper.generate_order_status_entity()
+    in_progress_order.order_status = Status.IN_PROGRESS
+    pending_order = OrderStatusHelper.generate_order_status_entity()
+    missing_id = uuid.uuid4()
+    order_status_repo.orders[in_progress_order.order_id] = in_progress_order
+    order_status_repo.orders[pending_order.order_id] = pending_order
+
+    request = ChangeOrderStatusBatchDTO(
+        order_ids=[in_progress_order.order_id, pending_order.order_id, missing_id],
+        order_status=Status.READY
+    )
+    results = asyncio.run(order_status_usecase.change_many_orders_status(request))
+
+    assert [result.order_id for result in results] == [in_progress_order.order_id, pending_order.order_id, missing_id]
+    assert results[0].error is None and results[0].order_status.order_status == Status.READY
+    assert results[1].error == "Order not yet in progress!"
+    assert results[2].error == f"No order with id: {missing_id}"
+
+
+def test_should_reject_unsupported_batch_target(order_status_usecase):
+    request = ChangeOrderStatusBatchDTO(order_ids=[uuid.uuid4()], order_status=Status.CONFIRMED)
+
+    with pytest.raises(OrderStatusError):
+        asyncio.run(order_status_usecase.change_many_orders_status(request))
+
+
+def test_should_allow_remove_order_status(order_status_usecase, order_status_repo):
+    order_status = OrderStatusHelper.generate_order_status_entity()
+    order_status_repo.orders[order_status.order_id] = order_status
+
+    asyncio.run(order_status_usecase.remove_order_status(order_status.order_id))
+
+    assert order_status.order_id not in order_status_repo.orders
+
+
+def test_should_find_archived_orders_by_id(order_status_usecase, order_status_repo):
+    order_status = OrderStatusHelper.generate_order_status_entity()
+    order_status.order_status = Status.FINALIZED
+    order_status_repo.orders[order_status.order_id] = order_status
+
+    archived = asyncio.run(order_status_usecase.archive_finalized_orders(
+        datetime.datetime.utcnow() + datetime.timedelta(seconds=1), batch_size=10, max_batches=1
+    ))
+
+    assert archived == 1
+    assert order_status.order_id not in order_status_repo.orders
+    assert asyncio.run(order_status_usecase.get_by_id(order_status.order_id)) == order_status
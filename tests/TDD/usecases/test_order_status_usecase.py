@@ -1,13 +1,17 @@
+import datetime
 import uuid
-from typing import List
+from typing import List, Optional, Tuple, Iterator
 
 import pytest
 from mockito import when, verify, ANY
 
-from src.config.errors import ResourceNotFound
-from src.entities.models.order_status_entity import OrderStatus, Status, PaymentStatus
+from src.config.errors import ResourceNotFound, ConcurrencyError
+from src.entities.errors.order_status_error import OrderStatusError
+from src.entities.models.order_status_entity import OrderStatus, Status, PaymentStatus, OrderStatusProjection
+from src.entities.schemas.order_status_dto import CreateOrderStatusBatchDTO
 from src.interfaces.gateways.order_status_gateway_interface import IOrderStatusGateway
 from src.interfaces.use_cases.order_status_usecase_interface import OrderStatusUseCaseInterface
+from src.usecases.kitchen_board import KitchenBoard
 from src.usecases.order_status_usecase import OrderStatusUseCase
 from tests.utils.order_status_helper import OrderStatusHelper
 
@@ -17,10 +21,24 @@ class MockRepository(IOrderStatusGateway):
     def get_by_id(self, order_id: uuid.UUID) -> OrderStatus:
         pass
 
-    def get_order_status(self, order_id: uuid.UUID) -> OrderStatus:
+    def get_order_status(self, order_id: uuid.UUID) -> Optional[OrderStatusProjection]:
         pass
 
-    def get_all(self) -> List[OrderStatus]:
+    def get_many(self, order_ids: List[uuid.UUID]) -> List[OrderStatus]:
+        pass
+
+    def get_all(
+        self, limit: Optional[int] = None, after: Optional[Tuple[datetime.datetime, uuid.UUID]] = None
+    ) -> List[OrderStatus]:
+        pass
+
+    def stream_orders(
+        self,
+        order_status: Optional[str],
+        start_date: Optional[datetime.datetime],
+        end_date: Optional[datetime.datetime],
+        batch_size: int
+    ) -> Iterator[OrderStatus]:
         pass
 
     def list_ongoing_orders(self) -> List[OrderStatus]:
@@ -29,9 +47,23 @@ class MockRepository(IOrderStatusGateway):
     def create_order_status(self, order_in: OrderStatus) -> OrderStatus:
         pass
 
+    def create_many(self, orders_in: List[OrderStatus]) -> List[OrderStatus]:
+        pass
+
     def update(self, order_id: uuid.UUID, order_in: OrderStatus) -> OrderStatus:
         pass
 
+    def transition(self, order_id: uuid.UUID, from_status: str, to_status: str) -> Optional[OrderStatus]:
+        pass
+
+    def transition_many(
+        self, order_ids: List[uuid.UUID], from_status: str, to_status: str
+    ) -> List[OrderStatus]:
+        pass
+
+    def archive_finalized(self, finalized_before: datetime.datetime, batch_size: int) -> int:
+        pass
+
     def remove_order_status(self, order_id: uuid.UUID) -> None:
         pass
 
@@ -80,6 +112,19 @@ def test_should_allow_register_order_status(generate_new_order_status_dto, unstu
     assert order_status_dto.order_id == created_order_status.order_id
 
 
+def test_should_allow_register_orders_status_in_batch(unstub):
+    existing_id = uuid.uuid4()
+    new_id = uuid.uuid4()
+    request = CreateOrderStatusBatchDTO(order_ids=[new_id, existing_id, new_id])
+
+    when(order_status_repo).create_many(ANY(list)).thenReturn([OrderStatus.create_new_order_status(new_id)])
+
+    created_orders, existing_ids = order_status_usecase.create_many_order_status(request)
+
+    assert [order.order_id for order in created_orders] == [new_id]
+    assert existing_ids == [existing_id]
+
+
 def test_should_allow_retrieve_order_status_by_id(generate_new_order_status_dto, unstub):
     order_status = generate_new_order_status_dto
     order_status_id = order_status.order_id
@@ -97,7 +142,9 @@ def test_should_allow_retrieve_order_status(generate_new_order_status_dto, unstu
     order_status = generate_new_order_status_dto
     order_status_id = order_status.order_id
 
-    when(order_status_repo).get_order_status(ANY(uuid.UUID)).thenReturn(order_status)
+    when(order_status_repo).get_order_status(ANY(uuid.UUID)).thenReturn(
+        OrderStatusProjection(order_status_id, Status.PENDING)
+    )
 
     retrieved_order_status = order_status_usecase.get_order_status(order_status_id)
 
@@ -140,75 +187,126 @@ def test_should_allow_list_ongoing_orders(generate_multiple_orders_status, unstu
 
 
 def test_should_allow_confirm_order(generate_new_order_status, unstub):
-    old_order_status = generate_new_order_status
-    old_order_id = old_order_status.order_id
+    order_status = generate_new_order_status
+    order_id = order_status.order_id
+    order_status.order_status = Status.CONFIRMED
 
-    when(order_status_repo).get_by_id(ANY(uuid.UUID)).thenReturn(old_order_status)
-    when(order_status_repo).update(ANY(uuid.UUID), ANY(OrderStatus)).thenReturn(old_order_status)
+    when(order_status_repo).transition(order_id, Status.PENDING, Status.CONFIRMED).thenReturn(order_status)
 
-    updated_order_status = order_status_usecase.confirm_order(old_order_id)
+    updated_order_status = order_status_usecase.confirm_order(order_id)
+
+    verify(order_status_repo, times=1).transition(order_id, Status.PENDING, Status.CONFIRMED)
+    verify(order_status_repo, times=0).get_by_id(ANY(uuid.UUID))
 
     assert updated_order_status is not None
-    assert updated_order_status.order_id == old_order_status.order_id
+    assert updated_order_status.order_id == order_id
     assert updated_order_status.order_status == Status.CONFIRMED
 
 
 def test_should_allow_update_order_status_in_progress(generate_new_order_status, unstub):
-    old_order_status = generate_new_order_status
-    old_order_id = old_order_status.order_id
-
-    old_order_status.order_status = Status.CONFIRMED
+    order_status = generate_new_order_status
+    order_id = order_status.order_id
+    order_status.order_status = Status.IN_PROGRESS
 
-    when(order_status_repo).get_by_id(ANY(uuid.UUID)).thenReturn(old_order_status)
-    when(order_status_repo).update(ANY(uuid.UUID), ANY(OrderStatus)).thenReturn(old_order_status)
+    when(order_status_repo).transition(order_id, Status.CONFIRMED, Status.IN_PROGRESS).thenReturn(order_status)
 
-    updated_order_status = order_status_usecase.change_order_status_in_progress(old_order_id, PaymentStatus.CONFIRMED)
+    updated_order_status = order_status_usecase.change_order_status_in_progress(order_id, PaymentStatus.CONFIRMED)
 
     assert updated_order_status is not None
-    assert updated_order_status.order_id == old_order_status.order_id
+    assert updated_order_status.order_id == order_id
     assert updated_order_status.order_status == Status.IN_PROGRESS
 
 
 def test_should_allow_update_order_status_ready(generate_new_order_status, unstub):
-    old_order_status = generate_new_order_status
-    old_order_id = old_order_status.order_id
+    order_status = generate_new_order_status
+    order_id = order_status.order_id
+    order_status.order_status = Status.READY
 
-    old_order_status.order_status = Status.IN_PROGRESS
+    when(order_status_repo).transition(order_id, Status.IN_PROGRESS, Status.READY).thenReturn(order_status)
 
-    when(order_status_repo).get_by_id(ANY(uuid.UUID)).thenReturn(old_order_status)
-    when(order_status_repo).update(ANY(uuid.UUID), ANY(OrderStatus)).thenReturn(old_order_status)
-
-    updated_order_status = order_status_usecase.change_order_status_ready(old_order_id)
+    updated_order_status = order_status_usecase.change_order_status_ready(order_id)
 
     assert updated_order_status is not None
-    assert updated_order_status.order_id == old_order_status.order_id
+    assert updated_order_status.order_id == order_id
     assert updated_order_status.order_status == Status.READY
 
 
 def test_should_allow_update_order_status_finalized(generate_new_order_status, unstub):
-    old_order_status = generate_new_order_status
-    old_order_id = old_order_status.order_id
-
-    old_order_status.order_status = Status.READY
+    order_status = generate_new_order_status
+    order_id = order_status.order_id
+    order_status.order_status = Status.FINALIZED
 
-    when(order_status_repo).get_by_id(ANY(uuid.UUID)).thenReturn(old_order_status)
-    when(order_status_repo).update(ANY(uuid.UUID), ANY(OrderStatus)).thenReturn(old_order_status)
+    when(order_status_repo).transition(order_id, Status.READY, Status.FINALIZED).thenReturn(order_status)
 
-    updated_order_status = order_status_usecase.change_order_status_finalized(old_order_id)
+    updated_order_status = order_status_usecase.change_order_status_finalized(order_id)
 
     assert updated_order_status is not None
-    assert updated_order_status.order_id == old_order_status.order_id
+    assert updated_order_status.order_id == order_id
     assert updated_order_status.order_status == Status.FINALIZED
 
 
+def test_should_raise_domain_error_when_transition_precondition_fails(generate_new_order_status, unstub):
+    order_status = generate_new_order_status
+    order_id = order_status.order_id
+
+    when(order_status_repo).transition(order_id, Status.IN_PROGRESS, Status.READY).thenReturn(None)
+    when(order_status_repo).get_by_id(order_id).thenReturn(order_status)
+
+    with pytest.raises(OrderStatusError, match="Order not yet in progress!"):
+        order_status_usecase.change_order_status_ready(order_id)
+
+
+def test_should_retry_transition_that_lost_a_race(generate_new_order_status, unstub):
+    order_status = generate_new_order_status
+    order_id = order_status.order_id
+    confirmed = OrderStatus(order_id, order_status.creation_date, Status.CONFIRMED, version=2)
+
+    when(order_status_repo).transition(order_id, Status.PENDING, Status.CONFIRMED)\
+        .thenReturn(None)\
+        .thenReturn(confirmed)
+    when(order_status_repo).get_by_id(order_id).thenReturn(order_status)
+
+    assert order_status_usecase.confirm_order(order_id) == confirmed
+    verify(order_status_repo, times=2).transition(order_id, Status.PENDING, Status.CONFIRMED)
+
+
+def test_should_raise_conflict_after_bounded_retries(generate_new_order_status, unstub):
+    order_status = generate_new_order_status
+    order_id = order_status.order_id
+    usecase = OrderStatusUseCase(order_status_repo, conflict_retries=2)
+
+    when(order_status_repo).transition(order_id, Status.PENDING, Status.CONFIRMED).thenReturn(None)
+    when(order_status_repo).get_by_id(order_id).thenAnswer(
+        lambda order_id: OrderStatus(order_id, order_status.creation_date, Status.PENDING, 1)
+    )
+
+    with pytest.raises(ConcurrencyError):
+        usecase.confirm_order(order_id)
+
+    verify(order_status_repo, times=3).transition(order_id, Status.PENDING, Status.CONFIRMED)
+
+
+def test_should_raise_payment_error_before_transition(generate_new_order_status, unstub):
+    order_status = generate_new_order_status
+    order_id = order_status.order_id
+    order_status.order_status = Status.CONFIRMED
+
+    when(order_status_repo).get_by_id(order_id).thenReturn(order_status)
+
+    with pytest.raises(OrderStatusError, match="refused"):
+        order_status_usecase.change_order_status_in_progress(order_id, PaymentStatus.REFUSED)
+
+    verify(order_status_repo, times=0).transition(ANY, ANY, ANY)
+
+
 def test_should_allow_list_orders_status(generate_multiple_orders_status, unstub):
     orders_status_list = generate_multiple_orders_status
 
-    when(order_status_repo).get_all().thenReturn(orders_status_list)
+    when(order_status_repo).get_all(None, None).thenReturn(orders_status_list)
 
     result = order_status_usecase.get_all()
 
-    verify(order_status_repo, times=1).get_all()
+    verify(order_status_repo, times=1).get_all(None, None)
 
     assert type(result) == list
     assert len(result) == len(orders_status_list)
@@ -217,19 +315,66 @@ def test_should_allow_list_orders_status(generate_multiple_orders_status, unstub
 
 
 def test_should_allow_list_empty_orders_status(unstub):
-    when(order_status_repo).get_all().thenReturn(list())
+    when(order_status_repo).get_all(None, None).thenReturn(list())
 
     result = order_status_usecase.get_all()
 
     assert result == list()
-    verify(order_status_repo, times=1).get_all()
+    verify(order_status_repo, times=1).get_all(None, None)
+
+
+def test_should_allow_paginate_orders_status(generate_multiple_orders_status, unstub):
+    orders_status_list = generate_multiple_orders_status
+    last_order = orders_status_list[-1]
+    keyset = (last_order.creation_date, last_order.order_id)
+
+    when(order_status_repo).get_all(10, keyset).thenReturn(orders_status_list)
+
+    result = order_status_usecase.get_all(10, keyset)
+
+    verify(order_status_repo, times=1).get_all(10, keyset)
+    assert result == orders_status_list
+
+
+def test_should_reject_invalid_status_filter_on_stream(unstub):
+    when(order_status_repo).stream_orders(ANY, ANY, ANY, ANY).thenReturn(iter([]))
+
+    with pytest.raises(OrderStatusError):
+        order_status_usecase.stream_orders("Unknown", None, None, 100)
+
+    verify(order_status_repo, times=0).stream_orders(ANY, ANY, ANY, ANY)
 
 
 def test_should_allow_remove_order_status(unstub):
-    order_id = uuid.uuid4()
+    board = KitchenBoard(max_age_seconds=60)
+    order_status = OrderStatus(uuid.uuid4(), datetime.datetime.now(), Status.CONFIRMED, 1)
+    board.apply(order_status)
 
     when(order_status_repo).remove_order_status(ANY(uuid.UUID)).thenReturn()
 
-    order_status_usecase.remove_order_status(order_id)
+    OrderStatusUseCase(order_status_repo, board).remove_order_status(order_status.order_id)
+
+    verify(order_status_repo, times=1).remove_order_status(order_status.order_id)
+    assert board.snapshot()[1] == []
+
+
+def test_should_archive_finalized_orders_in_bounded_batches(unstub):
+    finalized_before = datetime.datetime.utcnow()
+
+    when(order_status_repo).archive_finalized(finalized_before, 2).thenReturn(2).thenReturn(2).thenReturn(1)
+
+    archived = order_status_usecase.archive_finalized_orders(finalized_before, batch_size=2, max_batches=5)
+
+    assert archived == 5
+    verify(order_status_repo, times=3).archive_finalized(finalized_before, 2)
+
+
+def test_should_stop_archiving_after_max_batches(unstub):
+    finalized_before = datetime.datetime.utcnow()
+
+    when(order_status_repo).archive_finalized(finalized_before, 2).thenReturn(2)
+
+    archived = order_status_usecase.archive_finalized_orders(finalized_before, batch_size=2, max_batches=3)
 
-    verify(order_status_repo, times=0).remove_order_status(order_id)
+    assert archived == 6
+    verify(order_status_repo, times=3).archive_finalized(finalized_before, 2)
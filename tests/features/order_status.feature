@@ -25,11 +25,16 @@ Feature: Order Status Management
     Then I should receive a list of orders status
 
   Scenario: Update order status
-    Given there is an order status without status
+    Given there is a confirmed order status
     When I request to update the order status to in progress
     Then the order status is successfully updated
 
   Scenario: Remove an order status
     Given there is an order status on database with specific id
     When I request to remove an order
-    Then the order data is successfully removed
\ No newline at end of file
+    Then the order data is successfully removed
+
+  Scenario: Export archived order status
+    Given there is an archived order status
+    When I request to export the orders status history
+    Then the archived order status should be in the export
@@ -1,16 +1,37 @@
+import datetime
 import json
+import uuid
 
+import httpx
 import pytest
+from mockito import when as stub
 from pytest_bdd import scenario, given, then, when
 from starlette import status
 from starlette.testclient import TestClient
 
 from src.app import app
+from src.entities.models.order_status_entity import Status
+from src.external.postgresql_database import SessionLocal
+from src.external.service_clients import service_clients
+from src.gateways.orm.order_status_orm import Orders_Status_Archive
 from tests.utils.order_status_helper import OrderStatusHelper
 
 client = TestClient(app)
 
 
+@pytest.fixture
+def unstub():
+    from mockito import unstub
+    yield
+    unstub()
+
+
+def payments_response(result: dict):
+    async def respond(*args, **kwargs):
+        return httpx.Response(200, json={"result": result})
+    return respond
+
+
 @pytest.fixture
 def generate_order_status_dto():
     return OrderStatusHelper.generate_order_status_request()
@@ -74,6 +95,24 @@ def create_order_status_without_teardown(generate_order_status_dto):
     yield response.content
 
 
+@pytest.fixture
+def archived_order_status_creation():
+    order_id = uuid.uuid4()
+    with SessionLocal() as db:
+        db.add(Orders_Status_Archive(
+            order_id=order_id,
+            creation_date=datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=60),
+            order_status=int(Status.FINALIZED)
+        ))
+        db.commit()
+
+    yield str(order_id)
+    # Teardown - Removes the order from the archive
+    with SessionLocal() as db:
+        db.query(Orders_Status_Archive).filter(Orders_Status_Archive.order_id == order_id).delete()
+        db.commit()
+
+
 # Scenario: Get all orders status
 
 @scenario('../order_status.feature', 'Get all orders status')
@@ -244,23 +283,30 @@ def test_update_order_status_to_in_progress():
     pass
 
 
-@given('there is an order status without status', target_fixture='existing_order_status_without')
-def existing_order_status_without(request_order_status_creation):
+@given('there is a confirmed order status', target_fixture='existing_confirmed_order_status')
+def existing_confirmed_order_status(request_order_status_creation, unstub):
     response = request_order_status_creation
     resp_json = json.loads(response.content)
-    result = resp_json["result"]
-    return result
+    order_status_id = resp_json["result"]["orderId"]
+
+    stub(service_clients.payments).post(...).thenAnswer(payments_response({"qrCode": "qr-code"}))
+    response = client.put(f"/order-status/{order_status_id}/checkout", headers={})
+
+    assert response.status_code == status.HTTP_201_CREATED
+
+    return json.loads(response.content)["result"]["order"]
 
 
 @when('I request to update the order status to in progress', target_fixture='request_status_update')
-def request_status_update(existing_order_status_without):
-    order_status = existing_order_status_without
+def request_status_update(existing_confirmed_order_status):
+    order_status = existing_confirmed_order_status
     order_status_id = order_status["orderId"]
 
+    stub(service_clients.payments).get(...).thenAnswer(payments_response({"paymentStatus": "Confirmado"}))
     headers = {}
     response = client.put(f"/order-status/{order_status_id}/in-progress", headers=headers)
 
-    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert response.status_code == status.HTTP_201_CREATED
     assert response.content is not None
 
     return response.content
@@ -272,8 +318,10 @@ def receive_correct_order(request_status_update, generate_order_status_dto):
 
     response = request_status_update
     resp_json = json.loads(response)
+    result = resp_json["result"]
 
-    assert response is not None
+    assert result["orderId"] == str(updated_order.order_id)
+    assert result["orderStatus"] == "Em preparo"
 
 
 # Scenario: Remove an order status
@@ -317,4 +365,35 @@ def receive_correct_order_status(existing_order_status_to_remove):
     headers = {}
     response = client.get(f"/order-status/id/{order_id}", headers=headers)
     print(response)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+# Scenario: Export archived order status
+
+@scenario('../order_status.feature', 'Export archived order status')
+def test_export_archived_order():
+    pass
+
+
+@given('there is an archived order status', target_fixture='archived_order_status')
+def archived_order_status(archived_order_status_creation):
+    return archived_order_status_creation
+
+
+@when('I request to export the orders status history', target_fixture='request_orders_status_export')
+def request_orders_status_export():
+    headers = {}
+    response = client.get("/order-status/export?format=ndjson", headers=headers)
+
     assert response.status_code == status.HTTP_200_OK
+
+    return response.content
+
+
+@then('the archived order status should be in the export')
+def receive_archived_order_in_export(archived_order_status, request_orders_status_export):
+    exported = [json.loads(line) for line in request_orders_status_export.decode().splitlines()]
+    archived = [item for item in exported if item["orderId"] == archived_order_status]
+
+    assert len(archived) == 1
+    assert archived[0]["orderStatus"] == "Finalizado"